@@ -2,37 +2,72 @@
 Reusable Input Form Components
 """
 import streamlit as st
-from typing import Dict, Any, List
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Callable, Iterator
 from config import config
+from utils.metrics import span
 
 
 class InputFormBuilder:
     """Builder for creating input forms"""
     
-    def __init__(self, prefix: str = ""):
+    def __init__(self, prefix: str = "", form_key: str = None):
         self.values = {}
         self.prefix = prefix
+        self.form_key = form_key or f"{prefix}_form"
+        self.submitted = False
+    
+    @contextmanager
+    def form(self, submit_label: str = "Submit", enabled: bool = True, **button_kwargs) -> Iterator["InputFormBuilder"]:
+        """
+        Batch all widgets created inside the block into a single submission
+        
+        Widgets inside an ``st.form`` do not rerun the script when edited; only
+        the submit button does. With ``enabled=False`` the widgets are rendered
+        live and a regular button is used instead, so callers can switch modes
+        without changing their layout code. ``self.submitted`` is set after
+        the block. Building the widgets is timed as the ``input_form`` stage.
+        """
+        with span("input_form", form=self.form_key):
+            if enabled:
+                with st.form(key=self.form_key, border=False):
+                    yield self
+                    self.submitted = st.form_submit_button(submit_label, **button_kwargs)
+            else:
+                yield self
+                self.submitted = st.button(submit_label, key=f"{self.form_key}_submit", **button_kwargs)
+    
+    @staticmethod
+    def _numeric_args(feature_key: str, defaults: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Widget bounds, default and step from ``config.FEATURE_RANGES``
+
+        ``overrides`` (values that are not None) win over the config, which
+        wins over ``defaults``. Streamlit needs all four of one type, so any
+        float makes them all floats.
+        """
+        feat_config = config.FEATURE_RANGES.get(feature_key, {})
+        args = {
+            arg: overrides[arg] if overrides.get(arg) is not None else feat_config.get(name, defaults[arg])
+            for arg, name in (('min_value', 'min'), ('max_value', 'max'), ('value', 'default'), ('step', 'step'))
+        }
+        if any(isinstance(v, float) for v in args.values()):
+            args = {arg: float(v) for arg, v in args.items()}
+        return args
     
     def add_slider(
         self, 
         key: str, 
         label: str, 
         help_text: str = None,
-        feature_key: str = None
+        feature_key: str = None,
+        **overrides: Any
     ):
-        """Add a slider input based on config"""
-        feature_key = feature_key or key
-        feat_config = config.FEATURE_RANGES.get(feature_key, {})
-        
-        self.values[key] = st.slider(
-            label=label,
-            min_value=feat_config.get('min', 0),
-            max_value=feat_config.get('max', 100),
-            value=feat_config.get('default', 50),
-            step=feat_config.get('step', 1),
-            help=help_text,
-            key=f"{self.prefix}_{key}"
-        )
+        """Add a slider input based on config (``min_value``, ``max_value``, ``value``, ``step`` override it)"""
+        args = self._numeric_args(feature_key or key, {'min_value': 0, 'max_value': 100, 'value': 50, 'step': 1},
+                                  overrides)
+        self.values[key] = st.slider(label=label, help=help_text, key=f"{self.prefix}_{key}", **args)
         return self
     
     def add_number_input(
@@ -40,18 +75,30 @@ class InputFormBuilder:
         key: str, 
         label: str, 
         help_text: str = None,
-        feature_key: str = None
+        feature_key: str = None,
+        **overrides: Any
     ):
-        """Add a number input based on config"""
-        feature_key = feature_key or key
-        feat_config = config.FEATURE_RANGES.get(feature_key, {})
-        
-        self.values[key] = st.number_input(
+        """Add a number input based on config (``min_value``, ``max_value``, ``value``, ``step`` override it)"""
+        args = self._numeric_args(feature_key or key, {'min_value': 0, 'max_value': 100000, 'value': 0, 'step': 1},
+                                  overrides)
+        self.values[key] = st.number_input(label=label, help=help_text, key=f"{self.prefix}_{key}", **args)
+        return self
+    
+    def add_selectbox(
+        self,
+        key: str,
+        label: str,
+        options: List[Any],
+        index: int = 0,
+        format_func: Callable[[Any], str] = str,
+        help_text: str = None
+    ):
+        """Add a selectbox input"""
+        self.values[key] = st.selectbox(
             label=label,
-            min_value=float(feat_config.get('min', 0)),
-            max_value=float(feat_config.get('max', 100000)),
-            value=float(feat_config.get('default', 0)),
-            step=float(feat_config.get('step', 1)),
+            options=options,
+            index=index,
+            format_func=format_func,
             help=help_text,
             key=f"{self.prefix}_{key}"
         )
@@ -62,6 +109,51 @@ class InputFormBuilder:
         return self.values
 
 
+def live_preview(
+    channel: str,
+    inputs: Dict[str, Any],
+    compute: Callable[[Dict[str, Any]], Any],
+    render: Callable[[Any, bool], None],
+    min_interval: float = None
+) -> Any:
+    """
+    Throttled preview for inputs rendered outside a form
+    
+    The preview is recomputed only when the inputs changed, and at most once
+    every ``min_interval`` seconds, so rapid slider drags do not trigger a
+    prediction on every rerun. An edit arriving sooner is shown as the last
+    result marked stale while the rest of the interval is waited out, then
+    recomputed in the same run (trailing edge), so the preview always
+    settles on the latest inputs. A newer edit during the wait starts a new
+    run instead.
+    
+    Args:
+        render: Draws one result; the flag says whether it is stale relative to ``inputs``
+    
+    Returns:
+        The result for ``inputs``
+    """
+    min_interval = config.LIVE_PREVIEW_MIN_INTERVAL_S if min_interval is None else min_interval
+    state = st.session_state.setdefault(
+        f"_live_preview_{channel}", {"inputs": None, "result": None, "computed_at": 0.0}
+    )
+    
+    placeholder = st.empty()
+    if state["inputs"] != inputs:
+        wait = state["computed_at"] + min_interval - time.monotonic()
+        if state["inputs"] is not None and wait > 0:
+            with placeholder:
+                render(state["result"], True)
+            time.sleep(wait)
+        with span("live_preview", channel=channel):
+            result = compute(inputs)
+        state.update(inputs=dict(inputs), result=result, computed_at=time.monotonic())
+    
+    with placeholder:
+        render(state["result"], False)
+    return state["result"]
+
+
 def create_hdi_input_form() -> Dict[str, Any]:
     """Create input form for HDI prediction with ALL required features"""
     st.subheader("📝 Enter Country Indicators")
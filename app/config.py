@@ -22,12 +22,77 @@ class AppConfig:
     MODELS_DIR: Path = BASE_DIR / "saved_models"
     DATA_DIR: Path = BASE_DIR / "data"
     ASSETS_DIR: Path = BASE_DIR / "app" / "assets"
+    REGRESSION_MODEL_FILE: str = "hdi_model_v51.joblib"
+    # Compressed forest (python -m training classification --compress), used while it matches model.joblib
+    CLASSIFICATION_COMPACT_MODEL_FILE: str = "model_compact.joblib"
+    COMPACT_FOREST_ENABLED: bool = os.getenv("COMPACT_FOREST_ENABLED", "1") == "1"
+    # Distilled live-preview models (python -m training all --distill), one per task directory
+    SURROGATE_MODEL_FILE: str = "surrogate.joblib"
+    # Response-surface tables for sweeps (python -m training all --response-surface), one per task directory
+    RESPONSE_SURFACE_FILE: str = "response_surface.joblib"
     
     # App Settings
     APP_TITLE: str = "🌍 Global Development Predictor"
     APP_ICON: str = "🌍"
     APP_LAYOUT: str = "wide"
-    
+
+    # Styles (concatenated in order, minified once, hashed)
+    STYLESHEETS: List[str] = field(default_factory=lambda: ["main.css"])
+    SERVE_CSS_STATIC: bool = os.getenv("SERVE_CSS_STATIC", "0") == "1"
+
+    # Caching
+    FIGURE_CACHE_MAX_ENTRIES: int = 128
+
+    # Large-data rendering (charts switch to server-side aggregates above this)
+    LARGE_DATA_ROW_THRESHOLD: int = 20000
+    LARGE_DATA_SCATTER_BINS: int = 60
+
+    # Uploads
+    UPLOAD_MEMORY_BUDGET_MB: int = 512
+    UPLOAD_CHUNK_ROWS: int = 50000
+    UPLOAD_CATEGORY_MAX_UNIQUE_RATIO: float = 0.5
+
+    # Exports (encoded once per dataset/format, spilled to disk above spool size)
+    EXPORT_CHUNK_ROWS: int = 50000
+    EXPORT_CACHE_MAX_MB: int = 256
+    EXPORT_SPOOL_MAX_MB: int = 16
+
+    # Prediction inputs
+    LIVE_PREVIEW_MIN_INTERVAL_S: float = 0.5
+    # Multiplier for the cosmetic spinner pauses (0 disables them, e.g. for load tests)
+    UX_DELAY_SCALE: float = float(os.getenv("UX_DELAY_SCALE", "1"))
+
+    # Diagnostics
+    SHOW_RERUN_REPORT: bool = os.getenv("SHOW_RERUN_REPORT", "0") == "1"
+    RERUN_REPORT_REFRESH_S: float = 2.0
+    SHOW_MEMORY_REPORT: bool = os.getenv("SHOW_MEMORY_REPORT", "0") == "1"
+    SESSION_MEMORY_PUBLISH_INTERVAL_S: float = 5.0
+
+    # Inference threads shared by concurrent sessions (0 = CPUs available to the process)
+    THREAD_BUDGET_ENABLED: bool = os.getenv("THREAD_BUDGET_ENABLED", "1") == "1"
+    THREAD_BUDGET: int = int(os.getenv("THREAD_BUDGET", "0"))
+
+    # Inference executor (bounded pool in front of the Predictor)
+    INFERENCE_WORKERS: int = int(os.getenv("INFERENCE_WORKERS", "2"))
+    INFERENCE_MAX_QUEUE: int = int(os.getenv("INFERENCE_MAX_QUEUE", "16"))
+    INFERENCE_MAX_PER_SESSION: int = 1
+    INFERENCE_DEADLINE_S: float = float(os.getenv("INFERENCE_DEADLINE_S", "5"))
+    INFERENCE_RESULT_CACHE_SIZE: int = 256
+
+    # Inference budgets a trained model must meet to be exported (single core, 0 = no limit)
+    MODEL_MAX_SINGLE_MS: float = float(os.getenv("MODEL_MAX_SINGLE_MS", "50"))
+    MODEL_MAX_BATCH_MS: float = float(os.getenv("MODEL_MAX_BATCH_MS", "1000"))
+    MODEL_BUDGET_BATCH_ROWS: int = 1000
+    MODEL_MAX_SIZE_MB: float = float(os.getenv("MODEL_MAX_SIZE_MB", "100"))
+    MODEL_MAX_LOAD_MS: float = float(os.getenv("MODEL_MAX_LOAD_MS", "2000"))
+    MODEL_MAX_MEMORY_MB: float = float(os.getenv("MODEL_MAX_MEMORY_MB", "256"))
+
+    # Stage timing metrics (Prometheus text endpoint on METRICS_PORT, 0 = off)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "0") == "1"
+    METRICS_PORT: int = int(os.getenv("METRICS_PORT", "0"))
+    METRICS_LOG_INTERVAL_S: float = float(os.getenv("METRICS_LOG_INTERVAL_S", "60"))
+    METRICS_WINDOW: int = 2048
+
    # Premium Color Scheme
     PRIMARY_COLOR: str = "#6366f1"  # Indigo
     SECONDARY_COLOR: str = "#8b5cf6"  # Violet
@@ -0,0 +1,164 @@
+"""
+Compact Forest Predictor (flattened float32 trees, optional depth cap)
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+def _index_dtype(n: int) -> np.dtype:
+    """Smallest signed integer type that holds indices below ``n``"""
+    return np.int16 if n <= np.iinfo(np.int16).max else np.int32
+
+
+class CompactForest:
+    """
+    Forest classifier flattened into a handful of numpy arrays
+
+    Every tree of a fitted RandomForest/ExtraTrees is packed into shared
+    node arrays: split feature, float32 threshold and child indices. A leaf
+    points to itself with an infinite threshold, so a batch walks all trees
+    at once for ``max_depth`` steps without branching. Class probabilities
+    are kept (as float32) for leaves only; impurity, sample counts and the
+    other node arrays sklearn keeps for training are dropped.
+
+    Thresholds are stored as float32. sklearn compares float32 feature
+    values against float64 midpoints, so rounding can only move a row whose
+    value lies within one float32 step of a split; otherwise the forest's
+    probabilities are reproduced up to float32 rounding of the leaf values.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        leaf: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        classes: np.ndarray,
+        n_features_in: int
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.leaf = leaf
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.classes_ = classes
+        self.n_features_in_ = n_features_in
+
+    @classmethod
+    def from_forest(
+        cls, forest: Any, n_trees: Optional[int] = None, max_depth: Optional[int] = None
+    ) -> "CompactForest":
+        """
+        Pack the first ``n_trees`` trees of ``forest``, cut at ``max_depth``
+
+        Nodes at the depth cap become leaves predicting the class
+        distribution of the training samples that reached them.
+        """
+        if getattr(forest, "n_outputs_", 1) != 1:
+            raise ValueError("CompactForest supports single-output classifiers only")
+        trees = [estimator.tree_ for estimator in forest.estimators_[:n_trees]]
+
+        kept = []
+        for tree in trees:
+            depth = np.zeros(tree.node_count, dtype=np.int64)
+            # sklearn stores parents before their children
+            for node in range(tree.node_count):
+                if tree.children_left[node] != -1:
+                    depth[tree.children_left[node]] = depth[tree.children_right[node]] = depth[node] + 1
+            keep = depth <= (max_depth if max_depth is not None else depth.max())
+            kept.append((tree, depth, keep))
+
+        n_nodes = sum(int(keep.sum()) for _, _, keep in kept)
+        index = _index_dtype(n_nodes)
+        feature, threshold, left, right, leaf, value, roots = [], [], [], [], [], [], []
+        offset, n_leaves, deepest = 0, 0, 0
+        for tree, depth, keep in kept:
+            old = np.flatnonzero(keep)
+            renumber = np.full(tree.node_count, -1, dtype=np.int64)
+            renumber[old] = offset + np.arange(len(old))
+            is_leaf = (tree.children_left[old] == -1) | ~keep[np.maximum(tree.children_left[old], 0)]
+            own = renumber[old]
+
+            feature.append(np.where(is_leaf, 0, tree.feature[old]))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold[old]))
+            left.append(np.where(is_leaf, own, renumber[tree.children_left[old]]))
+            right.append(np.where(is_leaf, own, renumber[tree.children_right[old]]))
+            slots = np.full(len(old), -1, dtype=np.int64)
+            slots[is_leaf] = n_leaves + np.arange(int(is_leaf.sum()))
+            leaf.append(slots)
+            proba = tree.value[old[is_leaf], 0, :]
+            value.append(proba / proba.sum(axis=1, keepdims=True))
+
+            roots.append(offset)
+            offset += len(old)
+            n_leaves += int(is_leaf.sum())
+            deepest = max(deepest, int(depth[old].max()))
+
+        n_features = forest.n_features_in_
+        return cls(
+            feature=np.concatenate(feature).astype(_index_dtype(n_features)),
+            threshold=np.concatenate(threshold).astype(np.float32),
+            left=np.concatenate(left).astype(index),
+            right=np.concatenate(right).astype(index),
+            leaf=np.concatenate(leaf).astype(_index_dtype(n_leaves)),
+            value=np.concatenate(value).astype(np.float32),
+            roots=np.array(roots, dtype=index),
+            max_depth=deepest,
+            classes=forest.classes_,
+            n_features_in=n_features,
+        )
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.feature, self.threshold, self.left, self.right, self.leaf, self.value, self.roots)
+        return sum(array.nbytes for array in arrays)
+
+    def leaves(self, X: Any) -> np.ndarray:
+        """Leaf slot reached in every tree (row × tree)"""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected {self.n_features_in_} features, got shape {X.shape}")
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), self.n_trees))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.leaf[node]
+
+    def tree_proba(self, X: Any) -> np.ndarray:
+        """Class probabilities of every tree (row × tree × class)"""
+        return self.value[self.leaves(X)]
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        return self.tree_proba(X).mean(axis=1, dtype=np.float64)
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'n_trees': self.n_trees,
+            'max_depth': self.max_depth,
+            'n_nodes': self.n_nodes,
+            'n_leaves': len(self.value),
+            'array_mb': round(self.nbytes / 1e6, 3),
+        }
+
+    def __repr__(self) -> str:
+        return f"CompactForest(n_trees={self.n_trees}, max_depth={self.max_depth}, n_nodes={self.n_nodes})"
@@ -0,0 +1,243 @@
+"""
+Bounded Inference Executor with Admission Control
+"""
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import streamlit as st
+
+from config import config
+from models.model_loader import ModelLoader
+from models.predictor import PredictionResult, Predictor
+from utils.metrics import observe, registry
+
+logger = logging.getLogger(__name__)
+
+# Outcome statuses
+OK = "ok"
+DEGRADED = "degraded"
+REJECTED = "rejected"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+
+@dataclass
+class InferenceOutcome:
+    """Result of one request and where its time went"""
+    status: str
+    result: Optional[PredictionResult] = None
+    queue_wait_s: float = 0.0
+    compute_s: float = 0.0
+    reason: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status == OK
+
+
+def _input_key(input_data: Dict[str, Any]) -> Hashable:
+    return tuple(sorted(input_data.items()))
+
+
+class InferenceExecutor:
+    """
+    Runs predictions on a bounded worker pool instead of the script thread
+
+    - Admission: at most ``workers + max_queue`` requests are in flight and
+      each session may have ``max_per_session`` of them; anything beyond is
+      rejected immediately rather than queued without bound.
+    - Deadlines: a request still queued when its deadline passes is dropped
+      before any compute is spent on it; callers stop waiting at the deadline.
+    - Degradation: rejected, late or failed requests are answered from the last
+      result for identical inputs, else from the caller's ``fallback``
+      (e.g. a cheap surrogate), and marked ``degraded``.
+    - Timing: queue wait and compute time are reported separately.
+    """
+
+    def __init__(
+        self,
+        predictor: Predictor,
+        workers: int = None,
+        max_queue: int = None,
+        max_per_session: int = None,
+        deadline_s: float = None
+    ):
+        self.predictor = predictor
+        self.workers = workers or config.INFERENCE_WORKERS
+        self.max_queue = config.INFERENCE_MAX_QUEUE if max_queue is None else max_queue
+        self.max_per_session = max_per_session or config.INFERENCE_MAX_PER_SESSION
+        self.deadline_s = deadline_s or config.INFERENCE_DEADLINE_S
+
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"inference-{predictor.model_type}")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._per_session: Counter = Counter()
+        self._recent: "OrderedDict[Hashable, PredictionResult]" = OrderedDict()
+        self.outcomes: Counter = Counter()
+
+    # ------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------
+    def _admit(self, session_id: Optional[str]) -> Optional[str]:
+        """Reserve a slot; return the rejection reason if there is none"""
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                return "queue full"
+            if session_id is not None and self._per_session[session_id] >= self.max_per_session:
+                return "session already has a request in flight"
+            self._in_flight += 1
+            if session_id is not None:
+                self._per_session[session_id] += 1
+            self._publish_depth()
+        return None
+
+    def _release(self, session_id: Optional[str]) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if session_id is not None:
+                self._per_session[session_id] -= 1
+                if self._per_session[session_id] <= 0:
+                    del self._per_session[session_id]
+            self._publish_depth()
+
+    def _publish_depth(self) -> None:
+        if config.METRICS_ENABLED:
+            registry.set_gauge("inference_in_flight", self._in_flight, model=self.predictor.model_type)
+
+    # ------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------
+    def _run(self, input_data: Dict[str, Any], enqueued: float, deadline: float) -> InferenceOutcome:
+        started = time.perf_counter()
+        queue_wait = started - enqueued
+        observe("inference_queue_wait", queue_wait, model=self.predictor.model_type)
+        if started >= deadline:
+            return InferenceOutcome(TIMEOUT, queue_wait_s=queue_wait, reason="deadline passed while queued")
+
+        try:
+            result = self.predictor.predict(input_data)
+        except Exception as e:
+            logger.exception(f"❌ {self.predictor.model_type} prediction failed")
+            return InferenceOutcome(ERROR, queue_wait_s=queue_wait, compute_s=time.perf_counter() - started,
+                                    reason=f"prediction failed: {type(e).__name__}: {e}")
+        compute = time.perf_counter() - started
+        observe("inference_compute", compute, model=self.predictor.model_type)
+
+        with self._lock:
+            key = _input_key(input_data)
+            self._recent[key] = result
+            self._recent.move_to_end(key)
+            while len(self._recent) > config.INFERENCE_RESULT_CACHE_SIZE:
+                self._recent.popitem(last=False)
+        return InferenceOutcome(OK, result, queue_wait, compute)
+
+    def _submit(
+        self,
+        input_data: Dict[str, Any],
+        session_id: Optional[str],
+        deadline_s: Optional[float]
+    ) -> Tuple[Optional[Future], str]:
+        reason = self._admit(session_id)
+        if reason is not None:
+            return None, reason
+        enqueued = time.perf_counter()
+        deadline = enqueued + (deadline_s or self.deadline_s)
+        try:
+            future = self._pool.submit(self._run, input_data, enqueued, deadline)
+        except RuntimeError:
+            # Pool shut down between admission and submit
+            self._release(session_id)
+            return None, "executor shut down"
+        future.add_done_callback(lambda _: self._release(session_id))
+        return future, ""
+
+    def submit(
+        self,
+        input_data: Dict[str, Any],
+        session_id: Optional[str] = None,
+        deadline_s: Optional[float] = None
+    ) -> Optional[Future]:
+        """
+        Queue a prediction without waiting for it
+
+        Returns:
+            Future resolving to an InferenceOutcome, or None if rejected
+        """
+        return self._submit(input_data, session_id, deadline_s)[0]
+
+    def predict(
+        self,
+        input_data: Dict[str, Any],
+        session_id: Optional[str] = None,
+        deadline_s: Optional[float] = None,
+        fallback: Optional[Callable[[Dict[str, Any]], PredictionResult]] = None
+    ) -> InferenceOutcome:
+        """Predict with admission control and a deadline, degrading to ``fallback`` if needed"""
+        deadline_s = deadline_s or self.deadline_s
+        began = time.perf_counter()
+        future, reason = self._submit(input_data, session_id, deadline_s)
+
+        if future is None:
+            outcome = self._degrade(input_data, REJECTED, reason, fallback)
+        else:
+            try:
+                outcome = future.result(timeout=max(0.0, deadline_s - (time.perf_counter() - began)))
+            except FutureTimeout:
+                outcome = InferenceOutcome(TIMEOUT, queue_wait_s=time.perf_counter() - began,
+                                           reason="deadline passed")
+            if outcome.status in (TIMEOUT, ERROR):
+                degraded = self._degrade(input_data, outcome.status, outcome.reason, fallback)
+                degraded.queue_wait_s, degraded.compute_s = outcome.queue_wait_s, outcome.compute_s
+                outcome = degraded
+
+        with self._lock:
+            self.outcomes[outcome.status] += 1
+        if outcome.status != OK:
+            logger.warning(f"⚠️ {self.predictor.model_type} inference {outcome.status}: {outcome.reason}")
+        return outcome
+
+    def _degrade(
+        self,
+        input_data: Dict[str, Any],
+        status: str,
+        reason: str,
+        fallback: Optional[Callable[[Dict[str, Any]], PredictionResult]]
+    ) -> InferenceOutcome:
+        """Answer from the recent-results cache or the fallback, if possible"""
+        with self._lock:
+            cached = self._recent.get(_input_key(input_data))
+        if cached is not None:
+            return InferenceOutcome(DEGRADED, cached, reason=f"{reason}; served cached result")
+        if fallback is not None:
+            return InferenceOutcome(DEGRADED, fallback(input_data), reason=f"{reason}; served fallback")
+        return InferenceOutcome(status, reason=reason)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "sessions_waiting": len(self._per_session),
+                **{f"outcome_{status}": count for status, count in self.outcomes.items()},
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+@st.cache_resource(show_spinner=False)
+def get_inference_executor(model_type: str) -> InferenceExecutor:
+    """Process-wide executor for ``model_type`` shared by all sessions (each call brings its own fallback)"""
+    loader = ModelLoader(config.MODELS_DIR)
+    if model_type == "classification":
+        model = loader.load_classification_model()
+    else:
+        model = loader.load_regression_model()
+    return InferenceExecutor(Predictor(model, model_type))
@@ -108,8 +108,29 @@ class FeatureEngineer:
         Returns:
             DataFrame ready for prediction
         """
-        df = pd.DataFrame([input_data])
+        return FeatureEngineer.prepare_batch(
+            pd.DataFrame([input_data]),
+            required_features,
+            model_type
+        )
+    
+    @staticmethod
+    def prepare_batch(
+        df: pd.DataFrame,
+        required_features: List[str],
+        model_type: str
+    ) -> pd.DataFrame:
+        """
+        Prepare many rows for prediction in one vectorized pass
         
+        Args:
+            df: DataFrame with one row per input
+            required_features: List of features required by model
+            model_type: 'classification' or 'regression'
+        
+        Returns:
+            DataFrame ready for prediction
+        """
         # Apply appropriate feature engineering
         if model_type == 'classification':
             df = FeatureEngineer.engineer_classification_features(df)
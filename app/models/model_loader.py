@@ -9,6 +9,12 @@ from typing import Dict, Any, Tuple, Optional
 from dataclasses import dataclass
 import logging
 
+from config import config
+from models.response_surface import ResponseSurface
+from models.surrogate import Surrogate, model_fingerprint
+from utils.metrics import timed
+from utils.thread_budget import unpin_n_jobs
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -30,24 +36,49 @@ class ModelLoader:
         self.models_dir = models_dir
         self._cache = {}
     
+    @staticmethod
+    def _classification_model_file(model_dir: Path, metadata: dict) -> str:
+        """The compressed forest if enabled and built from the current model, else model.joblib"""
+        compression = metadata.get("compression") or {}
+        compact = model_dir / config.CLASSIFICATION_COMPACT_MODEL_FILE
+        if (config.COMPACT_FOREST_ENABLED and compact.exists()
+                and compression.get("source_timestamp") == metadata.get("timestamp")):
+            logger.info(f"🗜️ Using compressed forest ({compression.get('n_trees')} trees, "
+                        f"depth ≤ {compression.get('max_depth')})")
+            return compact.name
+        return "model.joblib"
+    
     @st.cache_resource
+    @timed("model_load", model="classification")
     def load_classification_model(_self) -> LoadedModel:
         """Load classification model with all components"""
         try:
             model_dir = _self.models_dir / "classification"
             
-            model = joblib.load(model_dir / "model.joblib")
+            metadata = {}
+            metadata_path = model_dir / "model_info.json"
+            if metadata_path.exists():
+                with open(metadata_path, 'r') as f:
+                    metadata = json.load(f)
+            
+            model = joblib.load(model_dir / _self._classification_model_file(model_dir, metadata))
             scaler = joblib.load(model_dir / "scaler.joblib")
             label_encoder = joblib.load(model_dir / "label_encoder.joblib")
             
             with open(model_dir / "feature_names.json", 'r') as f:
                 feature_names = json.load(f)
             
-            metadata = {}
-            metadata_path = model_dir / "model_info.json"
-            if metadata_path.exists():
-                with open(metadata_path, 'r') as f:
-                    metadata = json.load(f)
+            # The scaler records the columns it was fitted on; trust it over the JSON list
+            fitted_names = getattr(scaler, "feature_names_in_", None)
+            if fitted_names is not None and list(fitted_names) != feature_names:
+                logger.warning(
+                    f"⚠️ feature_names.json lists {len(feature_names)} features but the scaler "
+                    f"was fitted on {len(fitted_names)}; using the scaler's feature names"
+                )
+                feature_names = list(fitted_names)
+            
+            if config.THREAD_BUDGET_ENABLED:
+                unpin_n_jobs(model)
             
             logger.info("✅ Classification model loaded successfully")
             
@@ -63,11 +94,14 @@ class ModelLoader:
             raise
     
     @st.cache_resource
+    @timed("model_load", model="regression")
     def load_regression_model(_self) -> LoadedModel:
         """Load regression model"""
         try:
-            model_path = _self.models_dir / "regression" / "hdi_model_v51.joblib"
+            model_path = _self.models_dir / "regression" / config.REGRESSION_MODEL_FILE
             package = joblib.load(model_path)
+            if config.THREAD_BUDGET_ENABLED:
+                unpin_n_jobs(package['model'])
             
             logger.info("✅ Regression model loaded successfully")
             
@@ -78,4 +112,40 @@ class ModelLoader:
             )
         except Exception as e:
             logger.error(f"❌ Error loading regression model: {e}")
-            raise
\ No newline at end of file
+            raise
+    
+    @st.cache_resource
+    def load_surrogate(_self, task: str) -> Optional[Surrogate]:
+        """Distilled live-preview model for ``task``, or None if missing or distilled from another model"""
+        model_dir = _self.models_dir / task
+        path = model_dir / config.SURROGATE_MODEL_FILE
+        if not path.exists():
+            return None
+        try:
+            package = joblib.load(path)
+            if package.get("source") != model_fingerprint(model_dir, task):
+                logger.warning(f"⚠️ The {task} surrogate was distilled from a different model; not using it")
+                return None
+            logger.info(f"✅ {task.capitalize()} surrogate loaded for the live preview")
+            return Surrogate(package)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load the {task} surrogate: {e}")
+            return None
+    
+    @st.cache_resource
+    def load_response_surface(_self, task: str) -> Optional[ResponseSurface]:
+        """Response-surface table of the ``task`` model, or None if missing or built from another model"""
+        model_dir = _self.models_dir / task
+        path = model_dir / config.RESPONSE_SURFACE_FILE
+        if not path.exists():
+            return None
+        try:
+            package = joblib.load(path)
+            if package.get("source") != model_fingerprint(model_dir, task):
+                logger.warning(f"⚠️ The {task} response surface was built from a different model; not using it")
+                return None
+            logger.info(f"✅ {task.capitalize()} response surface loaded ({' × '.join(package['dims'])})")
+            return ResponseSurface(package)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load the {task} response surface: {e}")
+            return None
@@ -3,12 +3,15 @@ Unified Prediction Interface
 """
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
 from dataclasses import dataclass
 
 from models.model_loader import LoadedModel
 from models.feature_engineering import FeatureEngineer
+from models.response_surface import ResponseSurface
 from config import config
+from utils.metrics import span
+from utils.thread_budget import thread_budget
 
 
 @dataclass
@@ -43,24 +46,120 @@ class Predictor:
         else:
             return self._predict_regression(input_data)
     
+    def predict_batch(self, inputs: Union[pd.DataFrame, List[Dict[str, Any]]]) -> List[PredictionResult]:
+        """
+        Make predictions for many inputs with one model call
+        
+        Args:
+            inputs: DataFrame with one row per input, or a list of input dictionaries
+            
+        Returns:
+            List of PredictionResult in input order
+        """
+        df = inputs if isinstance(inputs, pd.DataFrame) else pd.DataFrame(list(inputs))
+        if len(df) == 0:
+            return []
+        
+        if self.model_type == 'classification':
+            return self._predict_classification_batch(df)
+        else:
+            return self._predict_regression_batch(df)
+    
+    def predict_values(
+        self,
+        inputs: Union[pd.DataFrame, List[Dict[str, Any]]],
+        surface: Optional[ResponseSurface] = None
+    ) -> np.ndarray:
+        """
+        Bare predictions (HDI values or happiness levels) for sweeps and what-if grids
+        
+        Args:
+            inputs: DataFrame with one row per input, or a list of input dictionaries
+            surface: Response-surface table answering the rows it covers; the model answers the rest
+        
+        Returns:
+            Array of predictions in input order
+        """
+        df = inputs if isinstance(inputs, pd.DataFrame) else pd.DataFrame(list(inputs))
+        if len(df) == 0:
+            return np.array([])
+        
+        def model_values(rows: pd.DataFrame) -> np.ndarray:
+            return np.array([result.value for result in self.predict_batch(rows)])
+        
+        if surface is None:
+            return model_values(df)
+        return surface.predict(df, fallback=model_values)
+    
+    def _predict_classification_batch(self, df: pd.DataFrame) -> List[PredictionResult]:
+        """Predict happiness index classification for a batch"""
+        with span("feature_engineering", model="classification"):
+            X = FeatureEngineer.prepare_batch(df, self.model.feature_names, 'classification')
+        with span("scaling", model="classification"):
+            X_scaled = self.model.scaler.transform(X)
+        
+        # predict() is argmax of predict_proba for sklearn classifiers, so one call suffices
+        with span("prediction", model="classification"), thread_budget.limit():
+            proba = self.model.model.predict_proba(X_scaled)
+            preds = self.model.model.classes_[proba.argmax(axis=1)]
+        with span("decoding", model="classification"):
+            class_labels = self.model.label_encoder.inverse_transform(preds)
+        
+        classes = self.model.label_encoder.classes_
+        names = [f"Level {int(c)}" for c in classes]
+        
+        results = []
+        for label, row in zip(class_labels, proba):
+            level = int(label)
+            results.append(PredictionResult(
+                value=level,
+                category=config.HAPPINESS_LEVELS.get(level, "Unknown"),
+                confidence=float(row.max()),
+                probabilities=dict(zip(names, row.tolist())),
+                interpretation=self._get_happiness_interpretation(level)
+            ))
+        return results
+    
+    def _predict_regression_batch(self, df: pd.DataFrame) -> List[PredictionResult]:
+        """Predict HDI values for a batch"""
+        with span("feature_engineering", model="regression"):
+            X = FeatureEngineer.prepare_batch(df, self.model.feature_names, 'regression')
+        with span("prediction", model="regression"), thread_budget.limit():
+            preds = np.clip(self.model.model.predict(X), 0, 1)
+        
+        results = []
+        for pred in preds:
+            category = self._categorize_hdi(pred)
+            results.append(PredictionResult(
+                value=float(pred),
+                category=category,
+                confidence=None,
+                interpretation=self._get_hdi_interpretation(pred, category)
+            ))
+        return results
+    
     def _predict_classification(self, input_data: Dict[str, Any]) -> PredictionResult:
         """Predict happiness index classification"""
         # Prepare input
-        X = FeatureEngineer.prepare_input(
-            input_data, 
-            self.model.feature_names, 
-            'classification'
-        )
+        with span("feature_engineering", model="classification"):
+            X = FeatureEngineer.prepare_input(
+                input_data, 
+                self.model.feature_names, 
+                'classification'
+            )
         
         # Scale features
-        X_scaled = self.model.scaler.transform(X)
+        with span("scaling", model="classification"):
+            X_scaled = self.model.scaler.transform(X)
         
         # Predict
-        pred = self.model.model.predict(X_scaled)[0]
-        proba = self.model.model.predict_proba(X_scaled)[0]
+        with span("prediction", model="classification"), thread_budget.limit():
+            pred = self.model.model.predict(X_scaled)[0]
+            proba = self.model.model.predict_proba(X_scaled)[0]
         
         # Get class label
-        class_label = self.model.label_encoder.inverse_transform([pred])[0]
+        with span("decoding", model="classification"):
+            class_label = self.model.label_encoder.inverse_transform([pred])[0]
         confidence = float(max(proba))
         
         # Create probability dictionary
@@ -84,14 +183,16 @@ class Predictor:
     def _predict_regression(self, input_data: Dict[str, Any]) -> PredictionResult:
         """Predict HDI value"""
         # Prepare input
-        X = FeatureEngineer.prepare_input(
-            input_data, 
-            self.model.feature_names, 
-            'regression'
-        )
+        with span("feature_engineering", model="regression"):
+            X = FeatureEngineer.prepare_input(
+                input_data, 
+                self.model.feature_names, 
+                'regression'
+            )
         
         # Predict
-        pred = self.model.model.predict(X)[0]
+        with span("prediction", model="regression"), thread_budget.limit():
+            pred = self.model.model.predict(X)[0]
         pred = np.clip(pred, 0, 1)  # Ensure valid HDI range
         
         # Categorize
@@ -0,0 +1,89 @@
+"""
+Response-surface Lookup Tables (multilinear interpolation with model fallback)
+"""
+from itertools import product
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class ResponseSurface:
+    """
+    A model tabulated over a grid of its most influential inputs
+
+    The table covers the subspace where every other input is at its base
+    value. Rows inside it are answered by multilinear interpolation of the
+    grid (class probabilities for classification, then the best class);
+    rows outside it, a tabulated input beyond the grid or another input off
+    its base value, are sent to the fallback (the real model). Inputs a row
+    does not give take their base values; tabulated inputs without one
+    (packages built before base values were stored for them) or left
+    empty send the row to the fallback.
+    """
+
+    def __init__(self, package: Dict[str, Any]):
+        self.task = package["task"]
+        self.dims: List[str] = package["dims"]
+        self.grids: List[np.ndarray] = package["grids"]
+        self.values: np.ndarray = package["values"]
+        self.base: Dict[str, float] = package["base"]
+        self.fixed: List[str] = [name for name in self.base if name not in self.dims]
+        self.classes: Optional[np.ndarray] = package.get("classes")
+        self.report: Dict[str, Any] = package.get("report", {})
+
+    def complete(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """``frame`` with every input it lacks set to the base value"""
+        missing = {name: value for name, value in self.base.items() if name not in frame.columns}
+        return frame.assign(**missing) if missing else frame
+
+    def covers(self, frame: pd.DataFrame) -> np.ndarray:
+        """Rows of a completed ``frame`` inside the tabulated subspace"""
+        inside = np.ones(len(frame), dtype=bool)
+        for name, grid in zip(self.dims, self.grids):
+            if name not in frame.columns:
+                return np.zeros(len(frame), dtype=bool)
+            # NaN compares False, so empty cells fall outside
+            values = frame[name].to_numpy(dtype=np.float64)
+            inside &= (values >= grid[0]) & (values <= grid[-1])
+        fixed = [name for name in self.fixed if name in frame.columns]
+        if fixed:
+            values = frame[fixed].to_numpy(dtype=np.float64)
+            inside &= np.isclose(values, np.array([self.base[name] for name in fixed]), rtol=1e-9, atol=0).all(axis=1)
+        return inside
+
+    def interpolate(self, points: np.ndarray) -> np.ndarray:
+        """Table values at ``points`` (row × tabulated input), which must lie inside the grid"""
+        points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+        cells, weights = [], []
+        for j, grid in enumerate(self.grids):
+            cell = np.clip(np.searchsorted(grid, points[:, j], side="right") - 1, 0, len(grid) - 2)
+            cells.append(cell)
+            weights.append((points[:, j] - grid[cell]) / (grid[cell + 1] - grid[cell]))
+
+        result = np.zeros((len(points),) + self.values.shape[len(self.grids):])
+        for corner in product((0, 1), repeat=len(self.grids)):
+            weight = np.ones(len(points))
+            for bit, w in zip(corner, weights):
+                weight *= w if bit else 1 - w
+            index = tuple(cell + bit for cell, bit in zip(cells, corner))
+            result += self.values[index] * weight.reshape((-1,) + (1,) * (result.ndim - 1))
+        return result
+
+    def predict(self, frame: pd.DataFrame, fallback: Callable[[pd.DataFrame], np.ndarray]) -> np.ndarray:
+        """
+        Model outputs for every row: HDI values, or happiness levels
+
+        Args:
+            frame: One row per input
+            fallback: Real-model outputs for a DataFrame of (completed) rows
+        """
+        frame = self.complete(frame)
+        inside = self.covers(frame)
+        out = np.empty(len(frame), dtype=np.float64 if self.classes is None else self.classes.dtype)
+        if inside.any():
+            table = self.interpolate(frame.loc[inside, self.dims].to_numpy(dtype=np.float64))
+            out[inside] = table if self.classes is None else self.classes[table.argmax(axis=1)]
+        if not inside.all():
+            out[~inside] = fallback(frame.loc[~inside])
+        return out
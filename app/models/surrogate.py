@@ -0,0 +1,72 @@
+"""
+Distilled Surrogates for the Live Preview
+"""
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from config import config
+
+
+def model_fingerprint(model_dir: Path, task: str) -> str:
+    """Content hash of the production artifact a surrogate is distilled from"""
+    name = "model.joblib" if task == "classification" else config.REGRESSION_MODEL_FILE
+    return hashlib.sha256((Path(model_dir) / name).read_bytes()).hexdigest()[:16]
+
+
+class PiecewiseLinear:
+    """
+    Additive lookup-table interpolator
+
+    One table per input (values at its knots, one column per output),
+    linearly interpolated and clamped at the ends, summed with the
+    intercept. With ``classes`` the outputs are class scores and the
+    prediction is the best-scoring class.
+    """
+
+    def __init__(
+        self,
+        knots: List[np.ndarray],
+        values: List[np.ndarray],
+        intercept: np.ndarray,
+        classes: Optional[np.ndarray] = None
+    ):
+        self.knots = knots
+        self.values = values
+        self.intercept = intercept
+        self.classes_ = classes
+
+    def decision_function(self, X: Any) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        scores = np.tile(self.intercept, (len(X), 1))
+        for j, (knots, values) in enumerate(zip(self.knots, self.values)):
+            for output in range(values.shape[1]):
+                scores[:, output] += np.interp(X[:, j], knots, values[:, output])
+        return scores
+
+    def predict(self, X: Any) -> np.ndarray:
+        scores = self.decision_function(X)
+        if self.classes_ is None:
+            return scores[:, 0]
+        return self.classes_[scores.argmax(axis=1)]
+
+
+class Surrogate:
+    """Preview model: answers from the inputs collected so far, defaults for the rest"""
+
+    def __init__(self, package: Dict[str, Any]):
+        self.model = package["model"]
+        self.task = package["task"]
+        self.features = package["features"]
+        self.defaults = package["defaults"]
+        self.fidelity = package.get("fidelity", {})
+        self.levels = [int(c) for c in self.model.classes_] if self.task == "classification" else []
+
+    def predict(self, inputs: Dict[str, Any]) -> float:
+        row = np.array([[float(inputs.get(name, self.defaults[name])) for name in self.features]])
+        value = self.model.predict(row)[0]
+        if self.task == "classification":
+            return int(value)
+        return float(np.clip(value, 0, 1))
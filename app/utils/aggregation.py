@@ -0,0 +1,199 @@
+"""
+Server-side Aggregation for Large Datasets
+
+Builds compact Plotly traces (binned scatter, precomputed histogram counts and
+box-plot summary statistics) so that charts over very large uploads send a few
+hundred points to the browser instead of every raw row.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import config
+from utils.lazy import lazy_import
+
+go = lazy_import("plotly.graph_objects")
+
+
+def is_large_dataset(df: pd.DataFrame, threshold: Optional[int] = None) -> bool:
+    """Check whether a dataset should be rendered from aggregates"""
+    threshold = threshold if threshold is not None else config.LARGE_DATA_ROW_THRESHOLD
+    return len(df) > threshold
+
+
+def _finite(values) -> np.ndarray:
+    """Return values as a float array without NaN/inf"""
+    values = np.asarray(values, dtype=float)
+    return values[np.isfinite(values)]
+
+
+def _edges(values: np.ndarray, bins: int) -> np.ndarray:
+    """Evenly spaced bin edges covering the data range"""
+    low, high = (float(values.min()), float(values.max())) if len(values) else (0.0, 1.0)
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return np.linspace(low, high, bins + 1)
+
+
+def _bin_index(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Map values to bin indices (last bin is closed on the right)"""
+    return np.clip(np.searchsorted(edges, values, side="right") - 1, 0, len(edges) - 2)
+
+
+def histogram_counts(values, bins: int = 30) -> Tuple[np.ndarray, np.ndarray]:
+    """Precompute histogram bin edges and counts"""
+    values = _finite(values)
+    edges = _edges(values, bins)
+    counts, _ = np.histogram(values, bins=edges)
+    return edges, counts
+
+
+def histogram_bar_traces(
+    values: pd.Series,
+    groups: Optional[pd.Series] = None,
+    bins: int = 30,
+    color_map: Optional[Dict[str, str]] = None,
+    order: Optional[List[str]] = None,
+    opacity: float = 0.75
+) -> List[go.Bar]:
+    """
+    Histogram as precomputed bars, optionally stacked by group
+
+    All groups share the same bin edges so the bars line up when stacked.
+    """
+    color_map = color_map or {}
+    x = np.asarray(values, dtype=float)
+    mask = np.isfinite(x)
+    edges = _edges(x[mask], bins)
+    centers = (edges[:-1] + edges[1:]) / 2
+    width = edges[1] - edges[0]
+
+    if groups is None:
+        series = [(None, x[mask])]
+    else:
+        g = np.asarray(groups, dtype=object)
+        names = order or [n for n in pd.unique(g[mask]) if pd.notna(n)]
+        series = [(name, x[mask & (g == name)]) for name in names]
+
+    traces = []
+    for name, data in series:
+        if len(data) == 0:
+            continue
+        counts, _ = np.histogram(data, bins=edges)
+        traces.append(go.Bar(
+            x=centers,
+            y=counts,
+            width=width,
+            name=str(name) if name is not None else None,
+            marker_color=color_map.get(name, config.PRIMARY_COLOR),
+            opacity=opacity
+        ))
+    return traces
+
+
+def box_summary(values) -> Dict[str, float]:
+    """Tukey box-plot statistics (quartiles, 1.5*IQR fences, mean)"""
+    values = _finite(values)
+    if len(values) == 0:
+        return {}
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {
+        "q1": float(q1),
+        "median": float(median),
+        "q3": float(q3),
+        "lowerfence": float(inside.min()),
+        "upperfence": float(inside.max()),
+        "mean": float(values.mean()),
+        "n_outliers": int(len(values) - len(inside))
+    }
+
+
+def box_trace(values, name: str = "", color: str = None) -> go.Box:
+    """Box plot drawn from precomputed statistics instead of raw points"""
+    stats = box_summary(values)
+    if not stats:
+        return go.Box(name=name)
+    return go.Box(
+        q1=[stats["q1"]],
+        median=[stats["median"]],
+        q3=[stats["q3"]],
+        lowerfence=[stats["lowerfence"]],
+        upperfence=[stats["upperfence"]],
+        mean=[stats["mean"]],
+        x=[name],
+        name=name,
+        marker_color=color or config.PRIMARY_COLOR,
+        boxpoints=False
+    )
+
+
+def binned_scatter_traces(
+    x: pd.Series,
+    y: pd.Series,
+    groups: Optional[pd.Series] = None,
+    color_map: Optional[Dict[str, str]] = None,
+    order: Optional[List[str]] = None,
+    bins: Optional[int] = None,
+    min_size: float = 4,
+    max_size: float = 18
+) -> List[go.Scatter]:
+    """
+    Aggregate a scatter plot on a 2-D grid
+
+    Each occupied cell becomes one marker placed at the centroid of its points
+    and sized by the number of points, so the payload is bounded by
+    ``bins * bins`` markers per group regardless of the row count.
+    """
+    bins = bins or config.LARGE_DATA_SCATTER_BINS
+    color_map = color_map or {}
+
+    xv = np.asarray(x, dtype=float)
+    yv = np.asarray(y, dtype=float)
+    mask = np.isfinite(xv) & np.isfinite(yv)
+
+    cell = np.full(len(xv), -1, dtype=np.int64)
+    cell[mask] = (
+        _bin_index(xv[mask], _edges(xv[mask], bins)) * bins
+        + _bin_index(yv[mask], _edges(yv[mask], bins))
+    )
+
+    if groups is None:
+        series = [(None, mask)]
+    else:
+        g = np.asarray(groups, dtype=object)
+        names = order or [n for n in pd.unique(g[mask]) if pd.notna(n)]
+        series = [(name, mask & (g == name)) for name in names]
+
+    aggregated = []
+    for name, m in series:
+        if not m.any():
+            continue
+        counts = np.bincount(cell[m], minlength=bins * bins)
+        occupied = np.nonzero(counts)[0]
+        cx = np.bincount(cell[m], weights=xv[m], minlength=bins * bins)[occupied] / counts[occupied]
+        cy = np.bincount(cell[m], weights=yv[m], minlength=bins * bins)[occupied] / counts[occupied]
+        aggregated.append((name, cx, cy, counts[occupied]))
+
+    if not aggregated:
+        return []
+
+    peak = max(c.max() for _, _, _, c in aggregated)
+    traces = []
+    for name, cx, cy, counts in aggregated:
+        sizes = min_size + (max_size - min_size) * np.sqrt(counts / peak)
+        traces.append(go.Scatter(
+            x=cx,
+            y=cy,
+            mode="markers",
+            name=str(name) if name is not None else None,
+            legendgroup=str(name) if name is not None else None,
+            marker=dict(size=sizes, color=color_map.get(name, config.PRIMARY_COLOR), opacity=0.8),
+            customdata=counts,
+            hovertemplate="x=%{x:.4g}<br>y=%{y:.4g}<br>%{customdata:,} rows<extra></extra>"
+        ))
+    return traces
@@ -0,0 +1,87 @@
+"""
+Static Asset Pipeline (stylesheets)
+"""
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+import streamlit as st
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_WHITESPACE_RE = re.compile(r"\s+")
+_PUNCTUATION_RE = re.compile(r"\s*([{};,>])\s*")
+_COLON_RE = re.compile(r":\s+")
+_PAREN_RE = re.compile(r"\(\s+|\s+\)")
+
+
+@dataclass(frozen=True)
+class CompiledStylesheet:
+    """Minified stylesheet and its content hash"""
+    css: str
+    content_hash: str
+    source_bytes: int
+
+    @property
+    def filename(self) -> str:
+        return f"app.{self.content_hash}.css"
+
+
+def minify_css(css: str) -> str:
+    """
+    Strip comments and redundant whitespace from CSS
+
+    Whitespace before ':' is kept so descendant pseudo-class selectors
+    (e.g. ``div :hover``) keep their meaning.
+    """
+    css = _COMMENT_RE.sub("", css)
+    css = _WHITESPACE_RE.sub(" ", css)
+    css = _PUNCTUATION_RE.sub(r"\1", css)
+    css = _COLON_RE.sub(":", css)
+    css = _PAREN_RE.sub(lambda m: m.group().strip(), css)
+    return css.replace(";}", "}").strip()
+
+
+@lru_cache(maxsize=1)
+def compile_stylesheet() -> CompiledStylesheet:
+    """Concatenate and minify ``config.STYLESHEETS`` once per process"""
+    sources = [(config.ASSETS_DIR / name).read_text(encoding="utf-8") for name in config.STYLESHEETS]
+    source = "\n".join(sources)
+    css = minify_css(source)
+    compiled = CompiledStylesheet(
+        css=css,
+        content_hash=hashlib.sha256(css.encode()).hexdigest()[:12],
+        source_bytes=len(source.encode())
+    )
+    logger.info(f"🎨 Compiled stylesheet {compiled.filename}: {compiled.source_bytes:,} -> {len(css):,} bytes")
+    return compiled
+
+
+@lru_cache(maxsize=1)
+def _publish_static(compiled: CompiledStylesheet) -> str:
+    """Write the stylesheet under app/static and return its served URL"""
+    static_dir = config.BASE_DIR / "app" / "static"
+    static_dir.mkdir(exist_ok=True)
+    target = static_dir / compiled.filename
+    if not target.exists():
+        target.write_text(compiled.css, encoding="utf-8")
+    return f"app/static/{compiled.filename}"
+
+
+@lru_cache(maxsize=1)
+def _style_markup() -> str:
+    compiled = compile_stylesheet()
+    if config.SERVE_CSS_STATIC:
+        # Requires server.enableStaticServing; the browser caches the file by hash
+        return f'<link rel="stylesheet" href="{_publish_static(compiled)}">'
+    return f'<style data-hash="{compiled.content_hash}">{compiled.css}</style>'
+
+
+def inject_styles() -> None:
+    """Inject the compiled stylesheet into the page"""
+    st.markdown(_style_markup(), unsafe_allow_html=True)
@@ -0,0 +1,116 @@
+"""
+Figure Cache for Plotly Charts
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+import pandas as pd
+
+from config import config
+from utils.lazy import lazy_import
+
+go = lazy_import("plotly.graph_objects")
+
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Compute a stable content hash for a DataFrame
+
+    Two frames with the same columns, dtypes, index and values always
+    produce the same fingerprint, so it can be used as a cache key across
+    reruns and sessions.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps([str(c) for c in df.columns]).encode())
+    hasher.update(json.dumps([str(t) for t in df.dtypes]).encode())
+    hasher.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return hasher.hexdigest()[:16]
+
+
+class FigureCache:
+    """Size-bounded LRU cache of serialized Plotly figure specs"""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(chart_id: str, fingerprint: str, params: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Build the cache key for a chart"""
+        return chart_id, fingerprint, json.dumps(params, sort_keys=True, default=str)
+
+    def get_or_build(
+        self,
+        chart_id: str,
+        fingerprint: str,
+        builder: Callable[[], go.Figure],
+        **params
+    ) -> go.Figure:
+        """
+        Return the cached figure or build, store and return a new one
+
+        ``builder`` should do all of the chart's data preparation, so a hit
+        costs only the lookup and a figure rebuilt from the stored spec.
+
+        Args:
+            chart_id: Unique name of the chart
+            fingerprint: Fingerprint of the dataset the chart is drawn from
+            builder: Zero-argument callable constructing the figure
+            **params: Any extra inputs the figure depends on
+
+        Returns:
+            Plotly figure
+        """
+        key = self.make_key(chart_id, fingerprint, params)
+
+        with self._lock:
+            spec = self._entries.get(key)
+            if spec is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if spec is not None:
+            # The spec came from a validated figure, so skip plotly's (costly) re-validation
+            return go.Figure(spec, _validate=False)
+
+        fig = builder()
+
+        with self._lock:
+            self._entries[key] = fig.to_dict()
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return fig
+
+    def clear(self) -> None:
+        """Drop all cached figures"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache size and hit/miss counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide instance shared by all sessions
+figure_cache = FigureCache(max_entries=config.FIGURE_CACHE_MAX_ENTRIES)
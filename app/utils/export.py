@@ -0,0 +1,167 @@
+"""
+Dataset Export Service
+"""
+import gzip
+import importlib.util
+import io
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, IO, List, Optional, Tuple
+
+import pandas as pd
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    """File format offered for download"""
+    key: str
+    label: str
+    extension: str
+    mime: str
+
+
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    "csv": ExportFormat("csv", "CSV", "csv", "text/csv"),
+    "csv.gz": ExportFormat("csv.gz", "CSV (gzip)", "csv.gz", "application/gzip"),
+    "parquet": ExportFormat("parquet", "Parquet", "parquet", "application/vnd.apache.parquet"),
+}
+
+
+def available_formats() -> List[str]:
+    """Export formats supported by the installed packages"""
+    formats = ["csv", "csv.gz"]
+    if importlib.util.find_spec("pyarrow") is not None:
+        formats.append("parquet")
+    return formats
+
+
+# ============================================================
+# STREAMING WRITERS
+# ============================================================
+def _write_csv(df: pd.DataFrame, stream: IO[bytes], chunk_rows: int) -> None:
+    """Write CSV chunk by chunk so the full text never exists as one string"""
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="", write_through=True)
+    try:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            df.iloc[start:start + chunk_rows].to_csv(text, index=False, header=start == 0)
+        text.flush()
+    finally:
+        text.detach()
+
+
+def _write_parquet(df: pd.DataFrame, stream: IO[bytes], chunk_rows: int) -> None:
+    """Write Parquet one row group per chunk"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(stream, schema, compression="snappy") as writer:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def write_export(df: pd.DataFrame, fmt: str, stream: IO[bytes], chunk_rows: Optional[int] = None) -> None:
+    """
+    Serialize a DataFrame to a binary stream
+
+    Args:
+        df: Data to export
+        fmt: One of ``EXPORT_FORMATS``
+        stream: Writable binary file object
+        chunk_rows: Rows serialized per step
+    """
+    chunk_rows = chunk_rows or config.EXPORT_CHUNK_ROWS
+    if fmt == "csv":
+        _write_csv(df, stream, chunk_rows)
+    elif fmt == "csv.gz":
+        with gzip.GzipFile(fileobj=stream, mode="wb", compresslevel=1, mtime=0) as gz:
+            _write_csv(df, gz, chunk_rows)
+    elif fmt == "parquet":
+        _write_parquet(df, stream, chunk_rows)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+
+# ============================================================
+# EXPORT CACHE
+# ============================================================
+class ExportArtifact:
+    """Encoded export held in a spooled temp file (memory, then disk)"""
+
+    def __init__(self, fmt: ExportFormat, spool: IO[bytes], size: int):
+        self.format = fmt
+        self.size = size
+        self._spool = spool
+        self._lock = threading.Lock()
+
+    def read_bytes(self) -> bytes:
+        """Return the encoded file contents"""
+        with self._lock:
+            self._spool.seek(0)
+            return self._spool.read()
+
+    def close(self) -> None:
+        with self._lock:
+            self._spool.close()
+
+
+class ExportCache:
+    """LRU of encoded exports keyed by (dataset fingerprint, format)"""
+
+    def __init__(self, max_bytes: int, spool_bytes: int):
+        self.max_bytes = max_bytes
+        self.spool_bytes = spool_bytes
+        self._entries: "OrderedDict[Tuple[str, str], ExportArtifact]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: str, fmt: str) -> Optional[ExportArtifact]:
+        """Return an already encoded export, if any"""
+        with self._lock:
+            artifact = self._entries.get((fingerprint, fmt))
+            if artifact is not None:
+                self._entries.move_to_end((fingerprint, fmt))
+            return artifact
+
+    def get_or_create(self, df: pd.DataFrame, fingerprint: str, fmt: str) -> ExportArtifact:
+        """Return the cached export or encode, store and return it"""
+        artifact = self.get(fingerprint, fmt)
+        if artifact is not None:
+            return artifact
+
+        spool = tempfile.SpooledTemporaryFile(max_size=self.spool_bytes)
+        write_export(df, fmt, spool)
+        artifact = ExportArtifact(EXPORT_FORMATS[fmt], spool, spool.tell())
+        logger.info(f"📦 Encoded {fmt} export for {fingerprint}: {artifact.size / 1024 ** 2:.1f} MB")
+
+        with self._lock:
+            self._entries[(fingerprint, fmt)] = artifact
+            self._entries.move_to_end((fingerprint, fmt))
+            while len(self._entries) > 1 and self.total_bytes() > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                evicted.close()
+        return artifact
+
+    def total_bytes(self) -> int:
+        return sum(a.size for a in self._entries.values())
+
+    def clear(self) -> None:
+        """Drop all cached exports"""
+        with self._lock:
+            for artifact in self._entries.values():
+                artifact.close()
+            self._entries.clear()
+
+
+# Process-wide instance shared by all sessions
+export_cache = ExportCache(
+    max_bytes=config.EXPORT_CACHE_MAX_MB * 1024 ** 2,
+    spool_bytes=config.EXPORT_SPOOL_MAX_MB * 1024 ** 2
+)
@@ -0,0 +1,96 @@
+"""
+Fragment-scoped Reruns and Rerun-cost Reporting
+"""
+import functools
+import time
+from typing import Callable, Dict
+
+import pandas as pd
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+from config import config
+from utils.metrics import span
+
+_STATS_KEY = "_fragment_rerun_stats"
+_SCRIPT_RUNS_KEY = "_script_runs"
+
+
+def _stats() -> Dict[str, Dict[str, float]]:
+    return st.session_state.setdefault(_STATS_KEY, {})
+
+
+def timed_fragment(name: str) -> Callable:
+    """
+    Turn a render function into an independently rerunnable fragment
+
+    Widget interactions inside the fragment rerun only that function, not the
+    whole script. Every execution (full or fragment-only) is timed and counted
+    per fragment in session state for the rerun-cost report.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                with span("render", fragment=name):
+                    return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                entry = _stats().setdefault(name, {"runs": 0, "total_s": 0.0, "last_s": 0.0, "max_s": 0.0})
+                entry["runs"] += 1
+                entry["total_s"] += elapsed
+                entry["last_s"] = elapsed
+                entry["max_s"] = max(entry["max_s"], elapsed)
+
+        return st.fragment(timed)
+
+    return decorator
+
+
+def rerun_fragment() -> None:
+    """Rerun only the current fragment, or the whole app outside a fragment rerun"""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+
+def count_script_run() -> None:
+    """Record a full-script run for the rerun-cost report"""
+    st.session_state[_SCRIPT_RUNS_KEY] = st.session_state.get(_SCRIPT_RUNS_KEY, 0) + 1
+
+
+def render_rerun_report() -> None:
+    """
+    Show per-fragment rerun counts and timings in the sidebar
+
+    Fragment-only reruns never reach the code that renders the sidebar, so
+    the report is a fragment of its own that refreshes itself every
+    ``RERUN_REPORT_REFRESH_S`` seconds.
+    """
+    if not config.SHOW_RERUN_REPORT:
+        return
+    with st.sidebar:
+        _rerun_report()
+
+
+@st.fragment(run_every=config.RERUN_REPORT_REFRESH_S)
+def _rerun_report() -> None:
+    stats = _stats()
+    with st.expander("Rerun cost", expanded=False):
+        st.caption(f"Full script runs: {st.session_state.get(_SCRIPT_RUNS_KEY, 0)}")
+        if not stats:
+            st.caption("No fragment runs recorded yet.")
+            return
+        report = pd.DataFrame([
+            {
+                "Fragment": name,
+                "Runs": entry["runs"],
+                "Last (ms)": round(entry["last_s"] * 1000, 1),
+                "Mean (ms)": round(entry["total_s"] / entry["runs"] * 1000, 1),
+                "Max (ms)": round(entry["max_s"] * 1000, 1),
+            }
+            for name, entry in stats.items()
+        ])
+        st.dataframe(report, hide_index=True, use_container_width=True)
@@ -0,0 +1,237 @@
+"""
+Streaming Ingestion for Uploaded Datasets
+"""
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, IO, List, Optional, Tuple
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[float, str], None]
+
+SUPPORTED_UPLOAD_TYPES = ("csv", "parquet", "xlsx")
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured memory budget"""
+
+
+@dataclass
+class IngestionReport:
+    """Summary of an ingested upload"""
+    source_format: str
+    rows: int
+    columns: int
+    memory_bytes: int
+    file_bytes: Optional[int] = None
+    chunks: int = 0
+
+    @property
+    def memory_mb(self) -> float:
+        return self.memory_bytes / 1024 ** 2
+
+
+# ============================================================
+# DTYPE OPTIMIZATION
+# ============================================================
+def optimize_dtypes(df: pd.DataFrame, category_max_ratio: Optional[float] = None) -> pd.DataFrame:
+    """
+    Downcast columns to the smallest dtype that holds their values
+
+    - float64 -> float32
+    - int64 -> smallest signed/unsigned integer type
+    - object/string -> category when the share of unique values is at most
+      ``category_max_ratio`` (e.g. ``Country_Name``)
+    """
+    if category_max_ratio is None:
+        category_max_ratio = config.UPLOAD_CATEGORY_MAX_UNIQUE_RATIO
+
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_float_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="float")
+        elif pd.api.types.is_integer_dtype(series):
+            downcast = "unsigned" if len(series) and series.min() >= 0 else "integer"
+            df[col] = pd.to_numeric(series, downcast=downcast)
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            non_null = series.count()
+            if non_null and series.nunique() / non_null <= category_max_ratio:
+                df[col] = series.astype("category")
+    return df
+
+
+def _concat_chunks(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate optimized chunks, merging per-chunk categories"""
+    if len(chunks) == 1:
+        return chunks[0]
+
+    columns = chunks[0].columns
+    cat_cols = [
+        col for col in columns
+        if all(isinstance(chunk[col].dtype, pd.CategoricalDtype) for chunk in chunks)
+    ]
+    combined = pd.concat([chunk.drop(columns=cat_cols) for chunk in chunks], ignore_index=True)
+    for col in cat_cols:
+        combined[col] = union_categoricals([chunk[col] for chunk in chunks])
+    return combined[columns]
+
+
+# ============================================================
+# READERS
+# ============================================================
+class _ChunkAccumulator:
+    """Collects optimized chunks while enforcing the memory budget"""
+
+    def __init__(self, budget_bytes: int, progress: Optional[ProgressCallback]):
+        self.budget_bytes = budget_bytes
+        self.progress = progress
+        self.chunks: List[pd.DataFrame] = []
+        self.rows = 0
+        self.memory_bytes = 0
+
+    def add(self, chunk: pd.DataFrame, fraction: Optional[float]) -> None:
+        chunk = optimize_dtypes(chunk)
+        self.memory_bytes += int(chunk.memory_usage(deep=True).sum())
+        self.rows += len(chunk)
+        if self.memory_bytes > self.budget_bytes:
+            raise UploadTooLargeError(
+                f"Upload exceeds the {self.budget_bytes / 1024 ** 2:.0f} MB memory budget "
+                f"after {self.rows:,} rows"
+            )
+        self.chunks.append(chunk)
+        if self.progress is not None:
+            self.progress(min(fraction if fraction is not None else 0.0, 1.0), f"Read {self.rows:,} rows")
+
+
+def _file_size(file: IO) -> Optional[int]:
+    """Size of an uploaded file or path, if known"""
+    size = getattr(file, "size", None)
+    if size is not None:
+        return int(size)
+    if isinstance(file, (str, Path)):
+        return Path(file).stat().st_size
+    return None
+
+
+def _read_csv(file: IO, acc: _ChunkAccumulator, chunk_rows: int, file_bytes: Optional[int]) -> None:
+    with pd.read_csv(file, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            fraction = None
+            if file_bytes and hasattr(file, "tell"):
+                fraction = file.tell() / file_bytes
+            acc.add(chunk, fraction)
+
+
+def _read_parquet(file: IO, acc: _ChunkAccumulator, chunk_rows: int) -> None:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ValueError("Parquet uploads require the 'pyarrow' package") from e
+
+    parquet_file = pq.ParquetFile(file)
+    total_rows = parquet_file.metadata.num_rows or 1
+    for batch in parquet_file.iter_batches(batch_size=chunk_rows):
+        acc.add(batch.to_pandas(), (acc.rows + batch.num_rows) / total_rows)
+
+
+def _read_xlsx(file: IO, acc: _ChunkAccumulator, chunk_rows: int) -> None:
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise ValueError("Excel uploads require the 'openpyxl' package") from e
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        total_rows = max((sheet.max_row or 1) - 1, 1)
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(h) if h is not None else f"Unnamed: {i}" for i, h in enumerate(next(rows, ()))]
+
+        buffer = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) >= chunk_rows:
+                acc.add(pd.DataFrame(buffer, columns=header).infer_objects(), (acc.rows + len(buffer)) / total_rows)
+                buffer = []
+        if buffer or not acc.chunks:
+            acc.add(pd.DataFrame(buffer, columns=header).infer_objects(), 1.0)
+    finally:
+        workbook.close()
+
+
+def detect_format(filename: str) -> str:
+    """Infer the upload format from its file extension"""
+    suffix = Path(filename).suffix.lower().lstrip(".")
+    if suffix not in SUPPORTED_UPLOAD_TYPES:
+        raise ValueError(f"Unsupported file type '.{suffix}'. Expected one of: {', '.join(SUPPORTED_UPLOAD_TYPES)}")
+    return suffix
+
+
+def load_uploaded_dataset(
+    file: IO,
+    filename: Optional[str] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+    memory_budget_mb: Optional[int] = None,
+    chunk_rows: Optional[int] = None
+) -> Tuple[pd.DataFrame, IngestionReport]:
+    """
+    Read an uploaded CSV, Parquet or xlsx file chunk by chunk
+
+    Each chunk is downcast as soon as it is read, so peak memory is roughly the
+    optimized frame plus one raw chunk rather than the full float64/object frame.
+
+    Args:
+        file: File-like object (e.g. Streamlit ``UploadedFile``) or path
+        filename: Name used to detect the format (defaults to ``file.name``)
+        progress_callback: Called with (fraction, message) after each chunk
+        memory_budget_mb: Abort once the optimized frame exceeds this size
+        chunk_rows: Rows per chunk
+
+    Returns:
+        Tuple of (DataFrame, IngestionReport)
+
+    Raises:
+        UploadTooLargeError: If the memory budget is exceeded
+        ValueError: If the file type is unsupported or cannot be parsed
+    """
+    filename = filename or getattr(file, "name", None) or str(file)
+    source_format = detect_format(filename)
+    budget_mb = memory_budget_mb or config.UPLOAD_MEMORY_BUDGET_MB
+    chunk_rows = chunk_rows or config.UPLOAD_CHUNK_ROWS
+    file_bytes = _file_size(file)
+
+    acc = _ChunkAccumulator(budget_mb * 1024 ** 2, progress_callback)
+    if source_format == "csv":
+        _read_csv(file, acc, chunk_rows, file_bytes)
+    elif source_format == "parquet":
+        _read_parquet(file, acc, chunk_rows)
+    else:
+        _read_xlsx(file, acc, chunk_rows)
+
+    if not acc.chunks:
+        raise ValueError("Uploaded file contains no rows")
+
+    # Chunks may disagree on dtypes (e.g. NaNs in a later chunk), so run one
+    # final pass over the combined frame
+    df = optimize_dtypes(_concat_chunks(acc.chunks))
+    report = IngestionReport(
+        source_format=source_format,
+        rows=len(df),
+        columns=len(df.columns),
+        memory_bytes=int(df.memory_usage(deep=True).sum()),
+        file_bytes=file_bytes,
+        chunks=len(acc.chunks)
+    )
+
+    if progress_callback is not None:
+        progress_callback(1.0, f"Loaded {report.rows:,} rows")
+    logger.info(f"📥 Ingested {filename}: {report.rows:,} rows, {report.memory_mb:.1f} MB in {report.chunks} chunks")
+    return df, report
@@ -0,0 +1,60 @@
+"""
+Lazy Imports for Heavy Optional Modules
+"""
+import importlib
+import threading
+from types import ModuleType
+from typing import Any, Callable
+
+
+class LazyModule(ModuleType):
+    """
+    Module proxy that imports the real module on first attribute access
+
+    ``go = lazy_import("plotly.graph_objects")`` costs nothing at import time;
+    the first ``go.Figure`` triggers the actual import, later accesses hit the
+    cached module directly.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a proxy for ``name`` that is imported on first use"""
+    return LazyModule(name)
+
+
+def lazy_callable(module_name: str, attr: str) -> Callable:
+    """Return a function that imports ``module_name.attr`` when first called"""
+    module = lazy_import(module_name)
+
+    def call(*args, **kwargs):
+        return getattr(module, attr)(*args, **kwargs)
+
+    call.__name__ = attr
+    call.__qualname__ = attr
+    call.__doc__ = f"Lazily imported {module_name}.{attr}"
+    return call
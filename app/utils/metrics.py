@@ -0,0 +1,246 @@
+"""
+Per-stage Timing Instrumentation and Metrics Export
+"""
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Deque, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+METRIC_NAME = "twinmetrics_stage_seconds"
+QUANTILES = (0.5, 0.95, 0.99)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+# Shared no-op context returned by span() when metrics are off
+_DISABLED_SPAN = nullcontext()
+
+
+# ============================================================
+# AGGREGATION
+# ============================================================
+class StageHistogram:
+    """
+    Running count/sum plus a sliding window of recent samples
+
+    Quantiles are computed from the last ``window`` observations so they
+    follow the current behaviour instead of averaging over the process life.
+    """
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+
+    def quantiles(self) -> Dict[float, float]:
+        if not self.samples:
+            return {q: 0.0 for q in QUANTILES}
+        values = np.percentile(np.fromiter(self.samples, dtype=float), [q * 100 for q in QUANTILES])
+        return dict(zip(QUANTILES, values.tolist()))
+
+
+class MetricsRegistry:
+    """Thread-safe collection of stage histograms keyed by stage and labels"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._histograms: Dict[Tuple[str, LabelSet], StageHistogram] = {}
+        self._gauges: Dict[Tuple[str, LabelSet], float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float, **labels: str) -> None:
+        key = (stage, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = StageHistogram(self.window)
+            histogram.observe(seconds)
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """Set a point-in-time value exported as ``twinmetrics_<name>``"""
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def snapshot(self) -> List[Dict]:
+        """Return one summary dict per stage/label combination"""
+        with self._lock:
+            items = [(key, h.count, h.total, h.quantiles()) for key, h in self._histograms.items()]
+        return [
+            {
+                "stage": stage,
+                "labels": dict(labels),
+                "count": count,
+                "sum_s": total,
+                **{f"p{int(q * 100)}_s": value for q, value in quantiles.items()},
+            }
+            for (stage, labels), count, total, quantiles in sorted(items)
+        ]
+
+    def render_prometheus(self) -> str:
+        """Render all stages in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent per inference and rendering stage",
+            f"# TYPE {METRIC_NAME} summary",
+        ]
+        for entry in self.snapshot():
+            labels = {"stage": entry["stage"], **entry["labels"]}
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+            for q in QUANTILES:
+                lines.append(f'{METRIC_NAME}{{{base},quantile="{q}"}} {entry[f"p{int(q * 100)}_s"]:.6f}')
+            lines.append(f"{METRIC_NAME}_sum{{{base}}} {entry['sum_s']:.6f}")
+            lines.append(f"{METRIC_NAME}_count{{{base}}} {entry['count']}")
+
+        with self._lock:
+            gauges = sorted(self._gauges.items())
+        for name in dict.fromkeys(name for (name, _), _ in gauges):
+            lines.append(f"# TYPE twinmetrics_{name} gauge")
+            for (gauge_name, labels), value in gauges:
+                if gauge_name == name:
+                    base = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                    lines.append(f"twinmetrics_{name}{{{base}}} {value}" if base else f"twinmetrics_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def summary_line(self) -> str:
+        """Compact one-line summary for periodic logging"""
+        parts = []
+        for entry in self.snapshot():
+            name = entry["stage"] + "".join(f"[{v}]" for v in entry["labels"].values())
+            parts.append(
+                f"{name} n={entry['count']} "
+                f"p50={entry['p50_s'] * 1000:.1f} p95={entry['p95_s'] * 1000:.1f} p99={entry['p99_s'] * 1000:.1f}ms"
+            )
+        return "; ".join(parts) if parts else "no samples"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._gauges.clear()
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Process-wide registry shared by all sessions
+registry = MetricsRegistry(window=config.METRICS_WINDOW)
+
+
+# ============================================================
+# SPANS
+# ============================================================
+@contextmanager
+def _span(stage: str, labels: Dict[str, str]) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe(stage, time.perf_counter() - start, **labels)
+
+
+def span(stage: str, **labels: str):
+    """
+    Time the enclosed block under ``stage``
+
+    When metrics are disabled this returns a shared no-op context, so the
+    cost is one attribute lookup and a function call.
+    """
+    if not config.METRICS_ENABLED:
+        return _DISABLED_SPAN
+    return _span(stage, labels)
+
+
+def observe(stage: str, seconds: float, **labels: str) -> None:
+    """Record a duration measured elsewhere (e.g. time spent waiting in a queue)"""
+    if config.METRICS_ENABLED:
+        registry.observe(stage, seconds, **labels)
+
+
+def timed(stage: str, **labels: str) -> Callable:
+    """Decorator form of span(); returns the function untouched when disabled"""
+    def decorator(func: Callable) -> Callable:
+        if not config.METRICS_ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _span(stage, labels):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# ============================================================
+# EXPORT
+# ============================================================
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") not in ("", "/metrics"):
+            self.send_error(404)
+            return
+        body = registry.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_started = False
+_start_lock = threading.Lock()
+
+
+def _log_periodically(interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        logger.info(f"📊 Stage timings: {registry.summary_line()}")
+
+
+def start_exporters() -> None:
+    """
+    Start the Prometheus endpoint and/or periodic log line once per process
+
+    Safe to call on every script rerun; does nothing when metrics are off.
+    """
+    global _started
+    if not config.METRICS_ENABLED or _started:
+        return
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+
+        if config.METRICS_PORT:
+            try:
+                server = ThreadingHTTPServer(("0.0.0.0", config.METRICS_PORT), _MetricsHandler)
+            except OSError as e:
+                logger.warning(f"⚠️ Metrics endpoint not started on port {config.METRICS_PORT}: {e}")
+            else:
+                threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+                logger.info(f"📊 Metrics endpoint on :{config.METRICS_PORT}/metrics")
+
+        if config.METRICS_LOG_INTERVAL_S > 0:
+            threading.Thread(
+                target=_log_periodically,
+                args=(config.METRICS_LOG_INTERVAL_S,),
+                name="metrics-log",
+                daemon=True
+            ).start()
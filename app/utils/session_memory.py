@@ -0,0 +1,174 @@
+"""
+Per-session Memory Accounting and Session-state Compaction
+"""
+import sys
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config import config
+from utils.cache_manager import dataset_fingerprint
+from utils.metrics import registry
+
+# Process-wide objects (cached datasets, interned uploads) by id; sessions
+# that reference them are not charged for their memory
+_shared: Dict[int, str] = {}
+_interned: "weakref.WeakValueDictionary[str, pd.DataFrame]" = weakref.WeakValueDictionary()
+_session_bytes: Dict[str, int] = {}
+_lock = threading.Lock()
+_last_published = 0.0
+
+
+# ============================================================
+# SHARED DATASETS
+# ============================================================
+def mark_shared(obj: Any, label: str) -> Any:
+    """Record ``obj`` as shared by all sessions and return it unchanged"""
+    with _lock:
+        _shared[id(obj)] = label
+    return obj
+
+
+def intern_frame(df: pd.DataFrame, label: str = "upload") -> pd.DataFrame:
+    """
+    Return one shared instance per distinct dataset content
+
+    Sessions that load the same data end up holding the same frame; it is
+    released once no session references it any more. Callers must treat the
+    returned frame as read-only.
+    """
+    fingerprint = dataset_fingerprint(df)
+    with _lock:
+        existing = _interned.get(fingerprint)
+        if existing is not None:
+            return existing
+        _interned[fingerprint] = df
+        _shared[id(df)] = label
+        weakref.finalize(df, _shared.pop, id(df), None)
+    return df
+
+
+# ============================================================
+# ACCOUNTING
+# ============================================================
+def object_bytes(obj: Any, _seen: Optional[set] = None) -> int:
+    """Approximate deep size of ``obj``, excluding shared objects"""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen or id(obj) in _shared:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    size = sys.getsizeof(obj)
+    if isinstance(obj, Mapping):
+        size += sum(object_bytes(k, seen) + object_bytes(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(object_bytes(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += object_bytes(vars(obj), seen)
+    return size
+
+
+def session_memory_report() -> List[Dict[str, Any]]:
+    """One row per session-state key with its private (non-shared) size"""
+    rows = []
+    for key, value in st.session_state.to_dict().items():
+        rows.append({
+            "Key": str(key),
+            "Type": type(value).__name__,
+            "Shared": _shared.get(id(value), ""),
+            "Bytes": object_bytes(value),
+        })
+    return sorted(rows, key=lambda row: row["Bytes"], reverse=True)
+
+
+def compact_session_state(stale_when: Mapping[str, Callable[[Mapping[str, Any]], bool]]) -> int:
+    """
+    Drop session-state entries that are no longer needed
+
+    Args:
+        stale_when: Key -> predicate over session state; the key is removed
+            when the predicate returns True
+
+    Returns:
+        Bytes released
+    """
+    state = st.session_state
+    freed = 0
+    for key, is_stale in stale_when.items():
+        if key in state and is_stale(state):
+            freed += object_bytes(state[key])
+            del state[key]
+    return freed
+
+
+def current_session_id() -> Optional[str]:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+
+def _prune_inactive_sessions() -> None:
+    if not st.runtime.exists():
+        return
+    runtime = st.runtime.get_instance()
+    for session_id in list(_session_bytes):
+        if not runtime.is_active_session(session_id):
+            _session_bytes.pop(session_id, None)
+
+
+def record_session_memory() -> None:
+    """Store this session's private memory and publish process-wide gauges"""
+    global _last_published
+    if not (config.METRICS_ENABLED or config.SHOW_MEMORY_REPORT):
+        return
+    session_id = current_session_id()
+    if session_id is None:
+        return
+    total = sum(row["Bytes"] for row in session_memory_report())
+
+    with _lock:
+        _session_bytes[session_id] = total
+        now = time.monotonic()
+        if now - _last_published < config.SESSION_MEMORY_PUBLISH_INTERVAL_S:
+            return
+        _last_published = now
+        _prune_inactive_sessions()
+        sizes = list(_session_bytes.values())
+
+    registry.set_gauge("session_memory_sessions", len(sizes))
+    registry.set_gauge("session_memory_bytes_total", sum(sizes))
+    registry.set_gauge("session_memory_bytes_max", max(sizes, default=0))
+
+
+# ============================================================
+# REPORT
+# ============================================================
+def render_memory_report() -> None:
+    """Show this session's memory by key and the process-wide totals"""
+    if not config.SHOW_MEMORY_REPORT:
+        return
+
+    rows = session_memory_report()
+    with _lock:
+        sessions = dict(_session_bytes)
+    with st.sidebar.expander("Session memory", expanded=False):
+        st.caption(
+            f"This session: {sum(r['Bytes'] for r in rows) / 1024:.1f} KB private · "
+            f"{len(sessions)} sessions tracked, {sum(sessions.values()) / 1024 ** 2:.1f} MB total, "
+            f"largest {max(sessions.values(), default=0) / 1024 ** 2:.1f} MB"
+        )
+        if rows:
+            report = pd.DataFrame(rows)
+            report["KB"] = (report.pop("Bytes") / 1024).round(1)
+            st.dataframe(report, hide_index=True, use_container_width=True)
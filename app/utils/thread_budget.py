@@ -0,0 +1,112 @@
+"""
+Process-wide Thread Budget for Model Inference
+"""
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from joblib import parallel_config
+from threadpoolctl import ThreadpoolController
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+def available_cpus() -> int:
+    """CPUs this process may use: affinity mask, capped by a cgroup v2 quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+def unpin_n_jobs(estimator: Any) -> Any:
+    """
+    Reset every ``n_jobs`` in a (possibly nested) estimator to None
+
+    None defers to the active joblib ``parallel_config``, so the budget below
+    decides the worker count instead of the value saved at training time
+    (e.g. ``n_jobs=-1``, one worker per core for every concurrent request).
+    """
+    if not hasattr(estimator, "get_params"):
+        return estimator
+    pinned = {
+        name: None for name, value in estimator.get_params(deep=True).items()
+        if name.endswith("n_jobs") and value is not None
+    }
+    if pinned:
+        estimator.set_params(**pinned)
+        logger.info(f"🧵 Unpinned n_jobs on {type(estimator).__name__}: {sorted(pinned)}")
+    return estimator
+
+
+class ThreadBudget:
+    """
+    Share a fixed number of CPU threads between concurrent inference calls
+
+    Each call inside ``limit()`` gets ``total // active`` threads (at least
+    one) for joblib workers, and the BLAS/OpenMP pools are resized to the same
+    share. BLAS limits are process-global, so they track the current
+    concurrency rather than being exact per call; the joblib setting is
+    thread-local and exact.
+    """
+
+    def __init__(self, total_threads: Optional[int] = None):
+        self.total_threads = total_threads or available_cpus()
+        self._active = 0
+        self._blas_threads: Optional[int] = None
+        self._controller: Optional[ThreadpoolController] = None
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def share(self) -> int:
+        """Threads a call would get at the current concurrency"""
+        return max(1, self.total_threads // max(1, self._active))
+
+    def _resize_blas(self, threads: int) -> None:
+        # Called with the lock held; only touch the pools when the share changes
+        if threads == self._blas_threads:
+            return
+        if self._controller is None:
+            self._controller = ThreadpoolController()
+        self._controller.limit(limits=threads)
+        self._blas_threads = threads
+
+    @contextmanager
+    def limit(self) -> Iterator[int]:
+        """Run the enclosed inference within this call's share of the budget"""
+        if not config.THREAD_BUDGET_ENABLED:
+            yield self.total_threads
+            return
+
+        with self._lock:
+            self._active += 1
+            threads = self.share()
+            self._resize_blas(threads)
+        try:
+            # An explicit backend is required: with only prefer="threads" joblib
+            # falls back to n_jobs=1 for callers that pass prefer themselves (forests)
+            with parallel_config(backend="threading", n_jobs=threads):
+                yield threads
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._resize_blas(self.share())
+
+
+# Process-wide instance shared by all sessions
+thread_budget = ThreadBudget(total_threads=config.THREAD_BUDGET or None)
@@ -0,0 +1,182 @@
+"""
+Lightweight Trendlines (NumPy replacement for Plotly's statsmodels trendlines)
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.lazy import lazy_import
+
+go = lazy_import("plotly.graph_objects")
+
+
+@dataclass
+class TrendlineFit:
+    """Container for a fitted trendline"""
+    x: np.ndarray
+    y: np.ndarray
+    method: str
+    slope: Optional[float] = None
+    intercept: Optional[float] = None
+    r_squared: Optional[float] = None
+
+
+def _clean_xy(x, y) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert inputs to float arrays and drop rows with missing values"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    mask = np.isfinite(x) & np.isfinite(y)
+    return x[mask], y[mask]
+
+
+def ols_fit(x, y) -> Optional[TrendlineFit]:
+    """
+    Fit y = slope * x + intercept in closed form
+
+    Returns None when there are fewer than two points or x is constant.
+    """
+    x, y = _clean_xy(x, y)
+    if len(x) < 2:
+        return None
+
+    x_mean = x.mean()
+    y_mean = y.mean()
+    sxx = np.dot(x - x_mean, x - x_mean)
+    if sxx == 0:
+        return None
+
+    sxy = np.dot(x - x_mean, y - y_mean)
+    syy = np.dot(y - y_mean, y - y_mean)
+    slope = sxy / sxx
+    intercept = y_mean - slope * x_mean
+    r_squared = (sxy * sxy) / (sxx * syy) if syy > 0 else 1.0
+
+    x_line = np.array([x.min(), x.max()])
+    return TrendlineFit(
+        x=x_line,
+        y=slope * x_line + intercept,
+        method="ols",
+        slope=float(slope),
+        intercept=float(intercept),
+        r_squared=float(r_squared)
+    )
+
+
+def lowess_fit(
+    x,
+    y,
+    frac: float = 2 / 3,
+    iterations: int = 3,
+    n_points: int = 100,
+    chunk_size: int = 16
+) -> Optional[TrendlineFit]:
+    """
+    Locally weighted linear regression (tricube kernel, bisquare robustifying)
+
+    The smooth is evaluated on at most ``n_points`` evenly spaced x values and
+    interpolated back onto the data for the robustness iterations, so memory
+    stays bounded at ``chunk_size * len(x)`` even for very large inputs.
+    """
+    x, y = _clean_xy(x, y)
+    n = len(x)
+    if n < 3 or np.ptp(x) == 0:
+        return None
+
+    k = min(n, max(3, int(np.ceil(frac * n))))
+    x_eval = np.linspace(x.min(), x.max(), min(n_points, n))
+    robustness = np.ones(n)
+
+    for _ in range(iterations + 1):
+        y_eval = np.empty_like(x_eval)
+
+        for start in range(0, len(x_eval), chunk_size):
+            xe = x_eval[start:start + chunk_size, None]
+            dist = np.abs(x[None, :] - xe)
+            h = np.partition(dist, k - 1, axis=1)[:, k - 1:k]
+            h[h == 0] = 1e-12
+            w = np.clip(1 - (dist / h) ** 3, 0, None) ** 3 * robustness
+
+            sw = w.sum(axis=1)
+            sw[sw == 0] = 1e-12
+            xm = (w * x).sum(axis=1) / sw
+            ym = (w * y).sum(axis=1) / sw
+            dx = x[None, :] - xm[:, None]
+            sxx = (w * dx * dx).sum(axis=1)
+            sxy = (w * dx * (y[None, :] - ym[:, None])).sum(axis=1)
+            slope = np.divide(sxy, sxx, out=np.zeros_like(sxy), where=sxx > 0)
+            y_eval[start:start + chunk_size] = ym + slope * (xe[:, 0] - xm)
+
+        residuals = y - np.interp(x, x_eval, y_eval)
+        scale = np.median(np.abs(residuals))
+        if scale == 0:
+            break
+        u = residuals / (6 * scale)
+        robustness = np.clip(1 - u * u, 0, None) ** 2
+
+    return TrendlineFit(x=x_eval, y=y_eval, method="lowess")
+
+
+def fit_trendline(x, y, method: str = "ols", **kwargs) -> Optional[TrendlineFit]:
+    """Fit a trendline using 'ols' or 'lowess'"""
+    if method == "ols":
+        return ols_fit(x, y)
+    if method == "lowess":
+        return lowess_fit(x, y, **kwargs)
+    raise ValueError(f"Unknown trendline method: {method}")
+
+
+def add_trendlines(
+    fig: go.Figure,
+    x: pd.Series,
+    y: pd.Series,
+    groups: Optional[pd.Series] = None,
+    color_map: Optional[Dict[str, str]] = None,
+    method: str = "ols",
+    **kwargs
+) -> go.Figure:
+    """
+    Add one trendline per group to an existing scatter figure
+
+    Mirrors ``px.scatter(..., color=groups, trendline=method)`` without
+    importing statsmodels.
+    """
+    color_map = color_map or {}
+
+    if groups is None:
+        series = [(None, x, y)]
+    else:
+        groups = pd.Series(groups, index=x.index)
+        series = [
+            (name, x[groups == name], y[groups == name])
+            for name in pd.unique(groups.dropna())
+        ]
+
+    for name, gx, gy in series:
+        fit = fit_trendline(gx, gy, method=method, **kwargs)
+        if fit is None:
+            continue
+
+        if fit.method == "ols":
+            hover = (
+                f"<b>OLS trendline</b><br>y = {fit.slope:.4g} * x + {fit.intercept:.4g}"
+                f"<br>R<sup>2</sup>={fit.r_squared:.4f}<extra>{name or ''}</extra>"
+            )
+        else:
+            hover = "<b>LOWESS trendline</b><extra>%s</extra>" % (name or "")
+
+        fig.add_trace(go.Scatter(
+            x=fit.x,
+            y=fit.y,
+            mode="lines",
+            name=str(name) if name is not None else "Trendline",
+            legendgroup=str(name) if name is not None else None,
+            showlegend=False,
+            line=dict(color=color_map.get(name)),
+            hovertemplate=hover
+        ))
+
+    return fig
@@ -0,0 +1,63 @@
+"""
+Ensemble-weight Solver Benchmark (SLSQP restarts vs batched vs closed form)
+
+Uses the regression pipeline's out-of-fold member predictions (from the
+stage cache, computing them if needed) and times each solver, reporting
+the out-of-fold R² each reaches.
+
+Usage:
+    python benchmarks/ensemble_weights.py
+    python benchmarks/ensemble_weights.py --repeats 20 --min-weight 0.05 --max-weight 0.6
+"""
+import argparse
+import logging
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from training import DEFAULT_CACHE_DIR  # noqa: E402
+from training import regression  # noqa: E402
+from training.stages import StageCache, StagePipeline  # noqa: E402
+from training.weights import METHODS, optimize_weights  # noqa: E402
+
+RAW_DATASET = ROOT / "data" / "Round 1 - Dataset - SOIL Hackathon 2025 V1.0.xlsx"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=10, help="Timed runs per solver")
+    parser.add_argument("--min-weight", type=float, default=0.10)
+    parser.add_argument("--max-weight", type=float, default=0.50)
+    parser.add_argument("--restarts", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    warnings.filterwarnings("ignore")
+    stages = regression.build_stages(RAW_DATASET, out_dir=Path(tempfile.gettempdir()))
+    outputs, _ = StagePipeline(stages, StageCache(DEFAULT_CACHE_DIR)).run(
+        targets=["regression_outliers", "regression_ensemble"]
+    )
+    predictions = outputs["regression_ensemble"]["oof_predictions"]
+    y = outputs["regression_outliers"]["y"].to_numpy()
+    print(f"{predictions.shape[0]} members × {predictions.shape[1]} out-of-fold predictions\n")
+    print(f"{'solver':<12} {'median ms':>10} {'R²':>9}  weights")
+
+    for method in (m for m in METHODS if m != "auto"):
+        timings = []
+        for _ in range(args.repeats):
+            began = time.perf_counter()
+            solution = optimize_weights(predictions, y, args.min_weight, args.max_weight, method, args.restarts)
+            timings.append(time.perf_counter() - began)
+        weights = " ".join(f"{w:.3f}" for w in solution.weights)
+        print(f"{method:<12} {statistics.median(timings) * 1000:>10.1f} {solution.r2:>9.5f}  {weights}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
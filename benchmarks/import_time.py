@@ -0,0 +1,112 @@
+"""
+Startup Import-time Budget Check
+
+Imports ``app/main.py`` in a fresh interpreter with ``-X importtime`` and fails
+(non-zero exit) when startup exceeds the budget or when modules that are meant
+to be lazy get imported eagerly.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget-ms 1500 --repeat 5 --top 15
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, NamedTuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must not be imported until a chart is rendered. Streamlit itself
+# imports plotly.graph_objects/plotly.io, so only the heavier layers are listed.
+FORBIDDEN_AT_STARTUP = (
+    "plotly.express",
+    "statsmodels",
+    "components.visualizations",
+)
+
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+
+_LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+class ImportRecord(NamedTuple):
+    self_us: int
+    cumulative_us: int
+    depth: int
+    module: str
+
+
+def profile_startup() -> List[ImportRecord]:
+    """Import the app once with -X importtime and parse the report"""
+    code = "import sys; sys.path.insert(0, 'app'); import main"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr[-2000:])
+        raise SystemExit(f"Importing app/main.py failed with exit code {result.returncode}")
+
+    records = []
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            records.append(ImportRecord(
+                self_us=int(match.group(1)),
+                cumulative_us=int(match.group(2)),
+                depth=(len(match.group(3)) - 1) // 2,
+                module=match.group(4),
+            ))
+    return records
+
+
+def main_import_ms(records: List[ImportRecord]) -> float:
+    """Cumulative time spent importing app/main.py"""
+    return next(r.cumulative_us for r in records if r.module == "main" and r.depth == 0) / 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Maximum median cumulative import time of app/main.py")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of fresh interpreters to sample")
+    parser.add_argument("--top", type=int, default=10, help="Show the N slowest imports")
+    args = parser.parse_args()
+
+    samples = [profile_startup() for _ in range(args.repeat)]
+    main_ms = statistics.median(main_import_ms(records) for records in samples)
+    records = samples[-1]
+
+    print(f"import main: {main_ms:.0f} ms (median of {args.repeat}, budget {args.budget_ms:.0f} ms)")
+    print("\nSlowest imports by self time (last run):")
+    for record in sorted(records, key=lambda r: r.self_us, reverse=True)[:args.top]:
+        print(f"  {record.self_us / 1000:8.1f} ms self  {record.cumulative_us / 1000:8.1f} ms cum  {record.module}")
+
+    failures = []
+    imported = {r.module for r in records}
+    for module in FORBIDDEN_AT_STARTUP:
+        eager = sorted(m for m in imported if m == module or m.startswith(module + "."))
+        if eager:
+            failures.append(f"{module} imported at startup ({len(eager)} modules)")
+    if main_ms > args.budget_ms:
+        failures.append(f"startup {main_ms:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+
+    print("\nOK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
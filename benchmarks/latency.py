@@ -0,0 +1,375 @@
+"""
+End-to-end Latency Benchmark (inference and dashboard paths)
+
+Runs headless: ``streamlit`` is replaced by a stub whose widgets return their
+defaults and whose ``plotly_chart`` serializes the figure (the part of a real
+render that scales with the data), so no server or browser is needed.
+
+Timed stages:
+    - model load (classification, regression)
+    - prepare_input, scaler, predict_proba, label decoding
+    - full single-row prediction and predict_batch at several batch sizes
+    - every display_* function on sample_dataset.csv and enlarged copies
+
+Results are written as JSON and can be compared against a stored baseline.
+
+Usage:
+    python benchmarks/latency.py
+    python benchmarks/latency.py --save-baseline
+    python benchmarks/latency.py --compare --threshold 0.25
+    python benchmarks/latency.py --only inference --batch-sizes 1,100,10000
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import types
+import warnings
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_PATH = ROOT / "benchmarks" / "results" / "latest.json"
+BASELINE_PATH = ROOT / "benchmarks" / "baseline.json"
+
+# Differences below this are timer noise, never a regression
+NOISE_FLOOR_MS = 1.0
+
+
+# ============================================================
+# STREAMLIT STUB
+# ============================================================
+class _NullBlock:
+    """Stands in for containers (columns, tabs, expanders, spinners, forms)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return getattr(_stub_module(), name)
+
+
+class _SessionState(dict):
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+
+_STUB = None
+
+
+def _stub_module() -> types.ModuleType:
+    return _STUB
+
+
+def install_streamlit_stub() -> Dict[str, int]:
+    """
+    Register a headless ``streamlit`` in sys.modules
+
+    Returns a dict that accumulates serialized chart bytes and chart counts.
+    """
+    global _STUB
+    counters = {"charts": 0, "chart_bytes": 0}
+    st = types.ModuleType("streamlit")
+    errors = types.ModuleType("streamlit.errors")
+
+    class StreamlitAPIException(Exception):
+        pass
+
+    errors.StreamlitAPIException = StreamlitAPIException
+
+    def noop(*args, **kwargs):
+        return None
+
+    def identity_decorator(func=None, **kwargs):
+        if func is None:
+            return lambda f: f
+        return func
+
+    def blocks(spec, *args, **kwargs):
+        count = spec if isinstance(spec, int) else len(spec)
+        return [_NullBlock() for _ in range(count)]
+
+    def plotly_chart(fig, *args, **kwargs):
+        counters["charts"] += 1
+        counters["chart_bytes"] += len(fig.to_json())
+
+    def selectbox(label, options, index=0, *args, **kwargs):
+        options = list(options)
+        return options[index] if options else None
+
+    def slider(label, min_value=None, max_value=None, value=None, *args, **kwargs):
+        return value if value is not None else min_value
+
+    def download_button(label, data, *args, **kwargs):
+        return False
+
+    st.errors = errors
+    st.session_state = _SessionState()
+    st.sidebar = _NullBlock()
+    st.cache_resource = identity_decorator
+    st.cache_data = identity_decorator
+    st.fragment = identity_decorator
+    st.columns = blocks
+    st.tabs = blocks
+    st.plotly_chart = plotly_chart
+    st.selectbox = selectbox
+    st.radio = selectbox
+    st.slider = slider
+    st.button = lambda *args, **kwargs: False
+    st.toggle = lambda *args, value=False, **kwargs: value
+    st.download_button = download_button
+    for name in ("container", "expander", "spinner", "form", "empty", "status"):
+        setattr(st, name, lambda *args, **kwargs: _NullBlock())
+    st.__getattr__ = lambda name: noop
+
+    sys.modules["streamlit"] = st
+    sys.modules["streamlit.errors"] = errors
+    _STUB = st
+    return counters
+
+
+# ============================================================
+# TIMING
+# ============================================================
+def measure(func: Callable[[], Any], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    """Run ``func`` ``warmup + repeat`` times and summarize the timed runs"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))], 3),
+        "min_ms": round(samples[0], 3),
+        "runs": repeat,
+    }
+
+
+def record(results: Dict[str, Dict], name: str, func: Callable[[], Any], repeat: int, warmup: int = 1) -> None:
+    """Time ``func`` under ``name``; failures are recorded rather than raised"""
+    try:
+        results[name] = measure(func, repeat, warmup)
+    except Exception as e:
+        results[name] = {"error": f"{type(e).__name__}: {e}"}
+    print(f"  {name:<55} {_format(results[name])}")
+
+
+def _format(entry: Dict) -> str:
+    if "error" in entry:
+        return f"ERROR {entry['error'][:80]}"
+    return f"{entry['median_ms']:10.2f} ms  (p95 {entry['p95_ms']:.2f}, n={entry['runs']})"
+
+
+# ============================================================
+# INFERENCE PATH
+# ============================================================
+def random_inputs(n: int, seed: int = 0) -> List[Dict[str, float]]:
+    """Inputs drawn uniformly from config.FEATURE_RANGES"""
+    from config import config
+
+    rng = np.random.default_rng(seed)
+    columns = {
+        name: rng.uniform(bounds["min"], bounds["max"], size=n)
+        for name, bounds in config.FEATURE_RANGES.items()
+    }
+    return pd.DataFrame(columns).to_dict("records")
+
+
+def bench_inference(results: Dict[str, Dict], repeat: int, batch_sizes: List[int]) -> None:
+    from config import config
+    from models.feature_engineering import FeatureEngineer
+    from models.model_loader import ModelLoader
+    from models.predictor import Predictor
+
+    loader = ModelLoader(config.MODELS_DIR)
+    row = random_inputs(1)[0]
+
+    for model_type, load in (
+        ("classification", loader.load_classification_model),
+        ("regression", loader.load_regression_model),
+    ):
+        print(f"\n[{model_type}]")
+        record(results, f"{model_type}.model_load", load, max(1, repeat // 2), warmup=0)
+        try:
+            model = load()
+        except Exception:
+            continue
+
+        predictor = Predictor(model, model_type)
+        X = FeatureEngineer.prepare_input(row, model.feature_names, model_type)
+        record(results, f"{model_type}.prepare_input",
+               lambda: FeatureEngineer.prepare_input(row, model.feature_names, model_type), repeat)
+
+        if model_type == "classification":
+            X_scaled = model.scaler.transform(X)
+            preds = model.model.predict(X_scaled)
+            record(results, f"{model_type}.scaler", lambda: model.scaler.transform(X), repeat)
+            record(results, f"{model_type}.predict", lambda: model.model.predict(X_scaled), repeat)
+            record(results, f"{model_type}.predict_proba", lambda: model.model.predict_proba(X_scaled), repeat)
+            record(results, f"{model_type}.label_decode",
+                   lambda: model.label_encoder.inverse_transform(preds), repeat)
+        else:
+            record(results, f"{model_type}.predict", lambda: model.model.predict(X), repeat)
+
+        record(results, f"{model_type}.predict_single", lambda: predictor.predict(row), repeat)
+        for size in batch_sizes:
+            batch = pd.DataFrame(random_inputs(size, seed=size))
+            record(results, f"{model_type}.predict_batch[{size}]",
+                   lambda: predictor.predict_batch(batch), repeat)
+
+
+# ============================================================
+# DASHBOARD PATH
+# ============================================================
+def enlarge(df: pd.DataFrame, scale: int, seed: int = 0) -> pd.DataFrame:
+    """Repeat ``df`` ``scale`` times with small noise so rows stay distinct"""
+    if scale == 1:
+        return df
+    big = pd.concat([df] * scale, ignore_index=True)
+    rng = np.random.default_rng(seed)
+    for col in big.select_dtypes("number").columns:
+        if "appiness" in col:
+            continue  # keep discrete happiness levels discrete
+        std = df[col].std()
+        if pd.notna(std) and std > 0:
+            big[col] = big[col] + rng.normal(0, std * 0.01, len(big))
+    return big
+
+
+def bench_dashboard(results: Dict[str, Dict], repeat: int, scales: List[int], counters: Dict[str, int]) -> None:
+    from components import visualizations
+    from utils.cache_manager import dataset_fingerprint, figure_cache
+
+    base = visualizations.load_dataset()
+    if base is None:
+        print("\n[dashboard] data/sample_dataset.csv not found, skipping")
+        return
+
+    functions = {
+        "display_dataset_overview": lambda df, fp: visualizations.display_dataset_overview(df),
+        "display_hdi_analysis": visualizations.display_hdi_analysis,
+        "display_happiness_analysis": visualizations.display_happiness_analysis,
+        "display_data_summary": visualizations.display_data_summary,
+    }
+
+    for scale in scales:
+        df = enlarge(base, scale)
+        fingerprint = dataset_fingerprint(df)
+        print(f"\n[dashboard x{scale}: {len(df):,} rows]")
+        record(results, f"dashboard[x{scale}].fingerprint", lambda: dataset_fingerprint(df), repeat)
+
+        # Large frames take seconds per call; a few runs are enough there
+        runs = repeat if scale < 100 else max(1, repeat // 3)
+        for name, func in functions.items():
+            def cold():
+                figure_cache.clear()
+                func(df, fingerprint)
+
+            before = dict(counters)
+            record(results, f"dashboard[x{scale}].{name}", cold, runs, warmup=0)
+            entry = results[f"dashboard[x{scale}].{name}"]
+            if "error" not in entry:
+                entry["charts"] = (counters["charts"] - before["charts"]) // runs
+                entry["chart_kb"] = round((counters["chart_bytes"] - before["chart_bytes"]) / runs / 1024, 1)
+
+            record(results, f"dashboard[x{scale}].{name}.cached", lambda: func(df, fingerprint), runs)
+        figure_cache.clear()
+
+
+# ============================================================
+# BASELINE COMPARISON
+# ============================================================
+def compare(current: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """Return descriptions of timings that regressed beyond ``threshold``"""
+    regressions = []
+    print(f"\nComparison against baseline (threshold +{threshold:.0%}):")
+    for name, entry in current.items():
+        base = baseline.get(name)
+        if base is None or "median_ms" not in base or "median_ms" not in entry:
+            continue
+        delta = entry["median_ms"] - base["median_ms"]
+        ratio = entry["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold and delta > NOISE_FLOOR_MS:
+            flag = "  REGRESSION"
+            regressions.append(f"{name}: {base['median_ms']:.2f} -> {entry['median_ms']:.2f} ms ({ratio:.2f}x)")
+        print(f"  {name:<55} {base['median_ms']:10.2f} -> {entry['median_ms']:10.2f} ms  ({ratio:5.2f}x){flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", choices=("inference", "dashboard"), help="Run a single benchmark group")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per stage")
+    parser.add_argument("--batch-sizes", default="1,10,100,1000", help="Comma-separated predict_batch sizes")
+    parser.add_argument("--scales", default="1,10,1000", help="Comma-separated dataset enlargement factors")
+    parser.add_argument("--output", type=Path, default=RESULTS_PATH, help="Where to write the JSON results")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Stored baseline JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="Also write the results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare against the baseline, exit 1 on regression")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before flagging (0.2 = +20%%)")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    # Model loaders log at INFO and sklearn warns on version skew; keep the report readable
+    logging.disable(logging.CRITICAL)
+    warnings.filterwarnings("ignore")
+    sys.path.insert(0, str(ROOT / "app"))
+    counters = install_streamlit_stub()
+
+    results: Dict[str, Dict] = {}
+    if args.only in (None, "inference"):
+        bench_inference(results, args.repeat, [int(s) for s in args.batch_sizes.split(",")])
+    if args.only in (None, "dashboard"):
+        bench_dashboard(results, max(1, args.repeat // 4), [int(s) for s in args.scales.split(",")], counters)
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {args.output}")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Baseline written to {args.baseline}")
+
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"No baseline at {args.baseline}; run with --save-baseline first")
+            return 1
+        regressions = compare(results, json.loads(args.baseline.read_text())["results"], args.threshold)
+        if regressions:
+            print("\nFAILED:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("\nOK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,413 @@
+"""
+Synthetic Multi-session Load Generator
+
+Drives N concurrent simulated browser sessions against a locally running
+app over Streamlit's websocket protocol (the same BackMsg/ForwardMsg
+protobufs the frontend uses), so every session is a real server session
+sharing one process, its caches and its memory.
+
+Each session loads the page, optionally switches the prediction pages to
+live preview, then performs a weighted random mix of actions:
+
+    slider     move a random prediction input (reruns the fragment in live
+               preview; staged client-side until submit in form mode)
+    predict    submit the HDI or Happiness prediction
+    dashboard  open (or re-open) the data analysis dashboard
+
+For each concurrency level it reports round-trip throughput, latency
+percentiles per action and the server's resident memory. By default the app
+is launched on a free port with UX_DELAY_SCALE=0 so the spinner pauses do not
+hide real costs; use ``--url`` to target an app that is already running
+(``--server-pid`` then enables the memory column).
+
+Usage:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --sessions 1,4,16,32 --duration 30
+    python benchmarks/load_test.py --mix slider=6,predict=3,dashboard=1 --live-fraction 1
+    python benchmarks/load_test.py --url http://localhost:8501 --server-pid 12345
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_PATH = ROOT / "app" / "main.py"
+
+DEFAULT_MIX = "slider=5,predict=3,dashboard=2"
+PREDICT_LABELS = ("Predict HDI", "Predict Happiness Level")
+LIVE_PREVIEW_KEYS = ("hdi_live_preview", "happy_live_preview")
+DASHBOARD_LABELS = ("View Data Analysis", "Hide Data Analysis")
+SLIDER_KEY_PREFIXES = ("hdi_", "happy_")
+
+_EARLY_RERUN = ForwardMsg.ScriptFinishedStatus.Value("FINISHED_EARLY_FOR_RERUN")
+_COMPILE_ERROR = ForwardMsg.ScriptFinishedStatus.Value("FINISHED_WITH_COMPILE_ERROR")
+
+
+# ============================================================
+# SERVER
+# ============================================================
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_healthy(url: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/_stcore/health", timeout=2) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.25)
+    raise SystemExit(f"App at {url} did not become healthy within {timeout:.0f}s")
+
+
+def launch_server(port: int, ux_delay_scale: float) -> subprocess.Popen:
+    """Start ``streamlit run app/main.py`` headless on ``port``"""
+    env = {**os.environ, "UX_DELAY_SCALE": str(ux_delay_scale)}
+    return subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(APP_PATH),
+         "--server.headless", "true", "--server.port", str(port),
+         "--browser.gatherUsageStats", "false"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def process_rss_mb(pid: Optional[int]) -> Optional[float]:
+    """Resident set size of ``pid`` (Linux /proc), or None if unavailable"""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+# ============================================================
+# SIMULATED BROWSER SESSION
+# ============================================================
+@dataclass
+class Widget:
+    id: str
+    kind: str
+    label: str
+    form_id: str
+    fragment_id: str
+    min: float = 0.0
+    max: float = 0.0
+    is_int: bool = False
+
+
+class Session:
+    """
+    One browser tab speaking the Streamlit websocket protocol
+
+    Widget values set by the session are sent with every rerun, like the
+    frontend does; edits inside a form are held back until its submit.
+    """
+
+    def __init__(self, ws_url: str, index: int, timeout: float):
+        self.ws_url = ws_url
+        self.rng = random.Random(index)
+        self.timeout = timeout
+        self.ws = None
+        self.widgets: Dict[str, Widget] = {}
+        self.values: Dict[str, WidgetState] = {}
+        self.staged: Dict[str, Dict[str, WidgetState]] = defaultdict(dict)
+        self.errors: List[str] = []
+
+    async def connect(self) -> None:
+        self.ws = await websockets.connect(self.ws_url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self) -> None:
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def rerun(self, triggers: List[WidgetState] = (), fragment_id: str = "") -> None:
+        """Send a rerun request and wait until the script (or fragment) finishes"""
+        msg = BackMsg()
+        client_state = msg.rerun_script
+        client_state.query_string = ""
+        client_state.page_script_hash = ""
+        client_state.fragment_id = fragment_id
+        client_state.widget_states.widgets.extend(list(self.values.values()) + list(triggers))
+        await self.ws.send(msg.SerializeToString())
+        await asyncio.wait_for(self._read_until_finished(), self.timeout)
+
+    async def _read_until_finished(self) -> None:
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self.ws.recv())
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                self._track_element(forward.delta.new_element, forward.delta.fragment_id)
+            elif kind == "script_finished":
+                if forward.script_finished == _COMPILE_ERROR:
+                    self.errors.append("script compile error")
+                if forward.script_finished != _EARLY_RERUN:
+                    return
+
+    def _track_element(self, element, fragment_id: str) -> None:
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            self.errors.append(f"{element.exception.type}: {element.exception.message[:160]}")
+            return
+        if kind not in ("slider", "button", "checkbox"):
+            return
+        proto = getattr(element, kind)
+        widget = Widget(proto.id, kind, proto.label, proto.form_id, fragment_id)
+        if kind == "slider":
+            widget.min, widget.max = proto.min, proto.max
+            widget.is_int = proto.data_type == proto.INT
+        self.widgets[proto.id] = widget
+
+    def _find(self, kind: str, labels=(), key_suffixes=(), key_prefixes=()) -> List[Widget]:
+        found = []
+        for widget in self.widgets.values():
+            if widget.kind != kind:
+                continue
+            key = widget.id.rsplit("-", 1)[-1]
+            if (labels and widget.label in labels) or (key_suffixes and key in key_suffixes) \
+                    or (key_prefixes and key.startswith(key_prefixes)):
+                found.append(widget)
+        return found
+
+    def _commit_form(self, form_id: str) -> None:
+        self.values.update(self.staged.pop(form_id, {}))
+
+    # ------------------------------------------------------------
+    # Actions; each returns True when it caused a server round trip
+    # ------------------------------------------------------------
+    async def load(self, live_preview: bool) -> None:
+        await self.rerun()
+        if live_preview:
+            for toggle in self._find("checkbox", key_suffixes=LIVE_PREVIEW_KEYS):
+                state = WidgetState(id=toggle.id, bool_value=True)
+                self.values[toggle.id] = state
+                await self.rerun(fragment_id=toggle.fragment_id)
+
+    async def slider(self) -> bool:
+        sliders = self._find("slider", key_prefixes=SLIDER_KEY_PREFIXES)
+        if not sliders:
+            return False
+        widget = self.rng.choice(sliders)
+        value = widget.min + (widget.max - widget.min) * self.rng.random()
+        if widget.is_int:
+            value = round(value)
+        state = WidgetState(id=widget.id)
+        state.double_array_value.data.append(value)
+        if widget.form_id:
+            self.staged[widget.form_id][widget.id] = state
+            return False
+        self.values[widget.id] = state
+        await self.rerun(fragment_id=widget.fragment_id)
+        return True
+
+    async def predict(self) -> bool:
+        buttons = self._find("button", labels=(self.rng.choice(PREDICT_LABELS),))
+        if not buttons:
+            return False
+        button = buttons[0]
+        if button.form_id:
+            self._commit_form(button.form_id)
+        await self.rerun([WidgetState(id=button.id, trigger_value=True)], button.fragment_id)
+        return True
+
+    async def dashboard(self) -> bool:
+        for label in DASHBOARD_LABELS:
+            buttons = self._find("button", labels=(label,))
+            if buttons:
+                # Drop the other state's button so the next lookup sees the fresh one
+                self.widgets.pop(buttons[0].id, None)
+                await self.rerun([WidgetState(id=buttons[0].id, trigger_value=True)], buttons[0].fragment_id)
+        return True
+
+
+# ============================================================
+# LOAD LEVELS
+# ============================================================
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        action, _, weight = part.partition("=")
+        if action not in ("slider", "predict", "dashboard"):
+            raise SystemExit(f"Unknown action in --mix: {action}")
+        mix[action] = float(weight or 1)
+    return mix
+
+
+async def run_level(ws_url: str, sessions: int, args, mix: Dict[str, float], server_pid: Optional[int]) -> Dict:
+    """Run ``sessions`` concurrent sessions for ``args.duration`` seconds of steady load"""
+    actions, weights = zip(*mix.items())
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    staged_edits = 0
+    clients = [Session(ws_url, i, args.timeout) for i in range(sessions)]
+    rss_before = process_rss_mb(server_pid)
+    rss_peak = rss_before or 0.0
+    stop = asyncio.Event()
+
+    async def sample_memory():
+        nonlocal rss_peak
+        while not stop.is_set():
+            rss_peak = max(rss_peak, process_rss_mb(server_pid) or 0.0)
+            await asyncio.sleep(0.5)
+
+    async def start(client: Session):
+        await client.connect()
+        began = time.perf_counter()
+        await client.load(client.rng.random() < args.live_fraction)
+        latencies["initial_load"].append(time.perf_counter() - began)
+
+    async def drive(client: Session):
+        nonlocal staged_edits
+        while not stop.is_set():
+            action = client.rng.choices(actions, weights)[0]
+            began = time.perf_counter()
+            try:
+                round_trip = await getattr(client, action)()
+            except Exception as e:
+                client.errors.append(f"{action}: {type(e).__name__}: {e}")
+                break
+            if round_trip:
+                latencies[action].append(time.perf_counter() - began)
+            else:
+                staged_edits += 1
+            if args.think_time:
+                await asyncio.sleep(client.rng.expovariate(1 / args.think_time))
+
+    sampler = asyncio.create_task(sample_memory())
+    await asyncio.gather(*(start(client) for client in clients))
+    began = time.perf_counter()
+    workers = [asyncio.create_task(drive(client)) for client in clients]
+    await asyncio.sleep(args.duration)
+    stop.set()
+    await asyncio.gather(*workers)
+    wall = time.perf_counter() - began
+    await sampler
+    rss_after = process_rss_mb(server_pid)
+    await asyncio.gather(*(client.close() for client in clients))
+
+    errors = [error for client in clients for error in client.errors]
+    round_trips = sum(len(v) for k, v in latencies.items() if k != "initial_load")
+    return {
+        "sessions": sessions,
+        "wall_s": round(wall, 2),
+        "round_trips": round_trips,
+        "staged_edits": staged_edits,
+        "throughput_per_s": round(round_trips / wall, 2),
+        "server_rss_mb": round(rss_after, 1) if rss_after is not None else None,
+        "server_rss_peak_mb": round(rss_peak, 1) if rss_after is not None else None,
+        "server_rss_delta_mb": round(rss_after - rss_before, 1) if rss_after is not None else None,
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:5],
+        "latency_ms": {
+            action: {
+                "count": len(samples),
+                "p50": round(statistics.median(samples) * 1000, 1),
+                "p95": round(percentile(samples, 0.95) * 1000, 1),
+                "p99": round(percentile(samples, 0.99) * 1000, 1),
+                "max": round(max(samples) * 1000, 1),
+            }
+            for action, samples in sorted(latencies.items()) if samples
+        },
+    }
+
+
+def print_level(result: Dict) -> None:
+    memory = "n/a" if result["server_rss_mb"] is None else (
+        f"{result['server_rss_mb']:.0f} MB (peak {result['server_rss_peak_mb']:.0f}, "
+        f"{result['server_rss_delta_mb']:+.0f})"
+    )
+    print(
+        f"\n== {result['sessions']} sessions: {result['throughput_per_s']:.2f} round trips/s "
+        f"({result['round_trips']} in {result['wall_s']:.1f}s, {result['staged_edits']} staged edits), "
+        f"server RSS {memory}, errors {result['errors']}"
+    )
+    print(f"   {'action':<14}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for action, stats in result["latency_ms"].items():
+        print(f"   {action:<14}{stats['count']:>6}{stats['p50']:>10.1f}{stats['p95']:>10.1f}"
+              f"{stats['p99']:>10.1f}{stats['max']:>10.1f}")
+    for sample in result["error_samples"]:
+        print(f"   ! {sample}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running app (default: launch one)")
+    parser.add_argument("--server-pid", type=int, help="PID of the app at --url, for memory reporting")
+    parser.add_argument("--sessions", default="1,2,4,8", help="Comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds of steady load per level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Action weights, e.g. slider=5,predict=3,dashboard=2")
+    parser.add_argument("--live-fraction", type=float, default=0.5,
+                        help="Share of sessions that switch the prediction pages to live preview")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between actions per session (s)")
+    parser.add_argument("--timeout", type=float, default=120, help="Max seconds to wait for one rerun")
+    parser.add_argument("--ux-delay-scale", type=float, default=0.0,
+                        help="UX_DELAY_SCALE for the launched app (1 keeps the spinner pauses)")
+    parser.add_argument("--json", type=Path, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    server = None
+    url, server_pid = args.url, args.server_pid
+    if url is None:
+        port = _free_port()
+        server = launch_server(port, args.ux_delay_scale)
+        url, server_pid = f"http://127.0.0.1:{port}", server.pid
+    url = url.rstrip("/")
+    ws_url = url.replace("http", "ws", 1) + "/_stcore/stream"
+
+    try:
+        wait_healthy(url)
+        print(f"Load test against {url}: mix {mix}, {args.duration:.0f}s per level, "
+              f"live preview {args.live_fraction:.0%}, think time {args.think_time}s")
+        results = []
+        for level in (int(s) for s in args.sessions.split(",")):
+            result = asyncio.run(run_level(ws_url, level, args, mix, server_pid))
+            print_level(result)
+            results.append(result)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.json}")
+    return 1 if any(r["errors"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Hyperparameter Search Benchmark (nested RandomizedSearchCV vs HalvingSearch)
+
+Runs the classification search on the pipeline's resampled training data:
+
+    - notebook: ``RandomizedSearchCV(n_jobs=-1)`` around an estimator that
+      itself uses ``n_jobs=-1`` (nested pools)
+    - each engine strategy twice: cold (fresh worker pool and shared-data
+      directory) and warm (pool and memory-mapped data reused)
+
+Usage:
+    python benchmarks/search.py
+    python benchmarks/search.py --estimator extra_trees --n-candidates 60 --strategies halving,asha
+"""
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sklearn.model_selection import RandomizedSearchCV, StratifiedKFold  # noqa: E402
+
+from training import DEFAULT_CACHE_DIR  # noqa: E402
+from training import classification  # noqa: E402
+from training.search import STRATEGIES, HalvingSearch, shutdown_pool  # noqa: E402
+from training.stages import StageCache, StagePipeline  # noqa: E402
+
+RAW_DATASET = ROOT / "data" / "Round 1 - Dataset - SOIL Hackathon 2025 V1.0.xlsx"
+
+
+def training_data(seed: int):
+    """Resampled training set, from the stage cache when available"""
+    stages = classification.build_stages(RAW_DATASET, out_dir=Path(tempfile.gettempdir()), seed=seed)
+    outputs, _ = StagePipeline(stages, StageCache(DEFAULT_CACHE_DIR)).run(targets=["classification_resample"])
+    resampled = outputs["classification_resample"]
+    return resampled["X"], resampled["y"]
+
+
+def run_notebook(X, y, args) -> dict:
+    cv = StratifiedKFold(n_splits=args.cv_folds, shuffle=True, random_state=args.seed)
+    searcher = RandomizedSearchCV(
+        classification.make_estimator(args.estimator, args.seed),
+        classification.PARAM_GRIDS[args.estimator],
+        n_iter=args.n_candidates, cv=cv, scoring="accuracy", random_state=args.seed, n_jobs=-1,
+    )
+    began = time.perf_counter()
+    searcher.fit(X, y)
+    return {"wall_s": time.perf_counter() - began, "fits": args.n_candidates * args.cv_folds,
+            "best_score": float(searcher.best_score_)}
+
+
+def run_engine(X, y, strategy: str, data_dir: Path, args) -> dict:
+    result = HalvingSearch(
+        classification.make_estimator(args.estimator, args.seed),
+        classification.PARAM_GRIDS[args.estimator],
+        n_candidates=args.n_candidates, strategy=strategy, eta=args.eta,
+        cv=args.cv_folds, data_dir=data_dir, seed=args.seed,
+    ).fit(X, y)
+    return result.summary()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--estimator", choices=classification.ESTIMATORS, default="random_forest")
+    parser.add_argument("--n-candidates", type=int, default=30)
+    parser.add_argument("--strategies", default=",".join(STRATEGIES), help="Comma-separated engine strategies")
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--cv-folds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-notebook", action="store_true", help="Skip the nested RandomizedSearchCV run")
+    parser.add_argument("--json", type=Path, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    warnings.filterwarnings("ignore")
+    X, y = training_data(args.seed)
+    print(f"{args.estimator}: {args.n_candidates} candidates, {len(y)} rows, {args.cv_folds}-fold CV\n")
+    print(f"{'run':<20} {'wall s':>8} {'fits':>6} {'best acc':>9}")
+
+    results = {}
+    if not args.skip_notebook:
+        results["notebook"] = run_notebook(X, y, args)
+    for strategy in args.strategies.split(","):
+        shutdown_pool()
+        with tempfile.TemporaryDirectory() as data_dir:
+            results[f"{strategy} (cold)"] = run_engine(X, y, strategy, Path(data_dir), args)
+            results[f"{strategy} (warm)"] = run_engine(X, y, strategy, Path(data_dir), args)
+
+    for name, stats in results.items():
+        print(f"{name:<20} {stats['wall_s']:>8.2f} {stats['fits']:>6} {stats['best_score']:>9.4f}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2, default=str))
+        print(f"\nResults written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Stability Analysis Benchmark (notebook refit loop vs training.stability)
+
+Runs the notebook's validation on the regression pipeline's data (from the
+stage cache, computing it if needed):
+
+    - notebook: clone and refit the full voting pipeline on each of N
+      holdout splits in a serial loop
+    - stability: the same splits, non-linear members refit on the worker
+      pool, Ridge / BayesianRidge solved from Gram-matrix updates
+    - linear only: Ridge + BayesianRidge, where no member is refit at all
+
+and checks that the per-replicate R² agree.
+
+Usage:
+    python benchmarks/stability.py
+    python benchmarks/stability.py --replicates 200 --workers 4
+"""
+import argparse
+import logging
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+from sklearn.base import clone  # noqa: E402
+from sklearn.ensemble import VotingRegressor  # noqa: E402
+from sklearn.metrics import r2_score  # noqa: E402
+from sklearn.model_selection import train_test_split  # noqa: E402
+
+from training import DEFAULT_CACHE_DIR  # noqa: E402
+from training import regression  # noqa: E402
+from training.stability import analyze_stability  # noqa: E402
+from training.stages import StageCache, StagePipeline  # noqa: E402
+
+RAW_DATASET = ROOT / "data" / "Round 1 - Dataset - SOIL Hackathon 2025 V1.0.xlsx"
+LINEAR_MEMBERS = ("ridge", "bayesian")
+
+
+def notebook_loop(members, weights, X, y, replicates: int, seed: int) -> np.ndarray:
+    model = regression._pipeline(VotingRegressor(members, weights=weights))
+    scores = []
+    for i in range(replicates):
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=seed + i)
+        scores.append(r2_score(y_test, clone(model).fit(X_train, y_train).predict(X_test)))
+    return np.array(scores)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--replicates", type=int, default=50)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: available CPUs)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    warnings.filterwarnings("ignore")
+    stages = regression.build_stages(RAW_DATASET, out_dir=Path(tempfile.gettempdir()), seed=args.seed)
+    outputs, _ = StagePipeline(stages, StageCache(DEFAULT_CACHE_DIR)).run(
+        targets=["regression_outliers", "regression_tune", "regression_ensemble"]
+    )
+    X = outputs["regression_outliers"]["X"].to_numpy()
+    y = outputs["regression_outliers"]["y"].to_numpy()
+    tuned, ensemble = outputs["regression_tune"], outputs["regression_ensemble"]
+    weights = dict(zip(ensemble["base_models"], ensemble["weights"]))
+    print(f"{args.replicates} holdout replicates, {len(y)} rows, {len(weights)} members\n")
+    print(f"{'run':<28} {'wall s':>8} {'R² mean':>9} {'max |ΔR²|':>10}")
+
+    for label, names in (("all members", list(weights)), ("linear only", list(LINEAR_MEMBERS))):
+        members = [(name, regression.make_base_model(name, args.seed, **tuned[name])) for name in names]
+        member_weights = [weights[name] for name in names]
+
+        began = time.perf_counter()
+        reference = notebook_loop(members, member_weights, X, y, args.replicates, args.seed)
+        print(f"{'notebook, ' + label:<28} {time.perf_counter() - began:>8.2f} {reference.mean():>9.4f} {'':>10}")
+
+        pipelines = [(name, regression._pipeline(model)) for name, model in members]
+        began = time.perf_counter()
+        report = analyze_stability(pipelines, member_weights, X, y, args.replicates,
+                                   workers=args.workers, seed=args.seed)
+        wall = time.perf_counter() - began
+        scores = np.array([r.r2 for r in sorted(report.replicates, key=lambda r: r.index)])
+        print(f"{'stability, ' + label:<28} {wall:>8.2f} {scores.mean():>9.4f} "
+              f"{np.abs(scores - reference).max():>10.2e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
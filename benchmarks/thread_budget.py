@@ -0,0 +1,139 @@
+"""
+Thread-budget Benchmark (oversubscription under concurrent inference)
+
+Runs the classification Predictor from N concurrent threads, the way N
+Streamlit sessions would, once with the saved model settings (``n_jobs=-1``,
+default BLAS pools) and once with the thread budget enabled. Each mode runs
+in a fresh interpreter so thread-pool state cannot leak between them.
+
+The difference only shows on multi-core machines: with one CPU both modes
+run single-threaded.
+
+Usage:
+    python benchmarks/thread_budget.py
+    python benchmarks/thread_budget.py --concurrency 1,4,16 --duration 15 --batch-size 50
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+MODES = {"unmanaged": "0", "budget": "1"}
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def run_worker(concurrency: int, duration: float, batch_size: int) -> Dict:
+    """Inside the child process: hammer the predictor from ``concurrency`` threads"""
+    import logging
+    import warnings
+
+    logging.disable(logging.CRITICAL)
+    warnings.filterwarnings("ignore")
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT / "app"))
+    from latency import install_streamlit_stub, random_inputs
+
+    install_streamlit_stub()
+    import pandas as pd
+    from config import config
+    from models.model_loader import ModelLoader
+    from models.predictor import Predictor
+    from utils.thread_budget import thread_budget
+
+    predictor = Predictor(ModelLoader(config.MODELS_DIR).load_classification_model(), "classification")
+    batches = [pd.DataFrame(random_inputs(batch_size, seed=i)) for i in range(concurrency)]
+    predictor.predict_batch(batches[0])  # warm up pools and caches
+
+    latencies: List[float] = []
+    lock = threading.Lock()
+    stop = threading.Event()
+    start_gate = threading.Barrier(concurrency + 1)
+
+    def worker(index: int) -> None:
+        local = []
+        start_gate.wait()
+        while not stop.is_set():
+            began = time.perf_counter()
+            predictor.predict_batch(batches[index])
+            local.append(time.perf_counter() - began)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    start_gate.wait()
+    began = time.perf_counter()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - began
+
+    return {
+        "requests": len(latencies),
+        "throughput_per_s": len(latencies) / wall,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "budget_threads": thread_budget.total_threads,
+    }
+
+
+def run_mode(mode: str, concurrency: int, args) -> Dict:
+    env = {**os.environ, "THREAD_BUDGET_ENABLED": MODES[mode]}
+    result = subprocess.run(
+        [sys.executable, __file__, "--worker", "--concurrency", str(concurrency),
+         "--duration", str(args.duration), "--batch-size", str(args.batch_size)],
+        env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr[-2000:])
+        raise SystemExit(f"{mode} run at concurrency {concurrency} failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,2,4,8,16", help="Comma-separated thread counts")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per run")
+    parser.add_argument("--batch-size", type=int, default=20, help="Rows per predict_batch call")
+    parser.add_argument("--json", type=Path, help="Also write the results to this file")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(int(args.concurrency), args.duration, args.batch_size)))
+        return 0
+
+    results = []
+    print(f"{'threads':>7} {'mode':>10} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        row = {"concurrency": concurrency}
+        for mode in MODES:
+            stats = row[mode] = run_mode(mode, concurrency, args)
+            print(f"{concurrency:>7} {mode:>10} {stats['throughput_per_s']:>8.1f} {stats['p50_ms']:>9.1f} "
+                  f"{stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f}")
+        gain = row["unmanaged"]["p99_ms"] / row["budget"]["p99_ms"]
+        print(f"{'':>7} {'p99 gain':>10} {gain:>8.2f}x  (budget {row['budget']['budget_threads']} threads)")
+        results.append(row)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
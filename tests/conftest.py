@@ -0,0 +1,11 @@
+"""
+Test Configuration (the app and training packages importable from the repository root)
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+for path in (ROOT, ROOT / "app"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,42 @@
+"""
+CompactForest against the sklearn forest it was packed from
+"""
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+
+from models.compact_forest import CompactForest
+
+
+@pytest.fixture(scope="module")
+def data():
+    X, y = make_classification(n_samples=600, n_features=12, n_informative=6, n_classes=4, random_state=0)
+    return X, y
+
+
+@pytest.mark.parametrize("forest_class", [RandomForestClassifier, ExtraTreesClassifier])
+def test_reproduces_forest_probabilities(data, forest_class):
+    X, y = data
+    forest = forest_class(n_estimators=40, random_state=0).fit(X, y)
+    compact = CompactForest.from_forest(forest)
+
+    np.testing.assert_allclose(compact.predict_proba(X), forest.predict_proba(X), rtol=0, atol=1e-6)
+    np.testing.assert_array_equal(compact.predict(X), forest.predict(X))
+
+
+def test_depth_cap_keeps_probability_distributions(data):
+    X, y = data
+    forest = RandomForestClassifier(n_estimators=20, random_state=0).fit(X, y)
+    compact = CompactForest.from_forest(forest, n_trees=10, max_depth=4)
+
+    assert compact.n_trees == 10
+    assert compact.max_depth == 4
+    np.testing.assert_allclose(compact.predict_proba(X).sum(axis=1), 1.0, atol=1e-6)
+
+
+def test_rejects_wrong_feature_count(data):
+    X, y = data
+    compact = CompactForest.from_forest(RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y))
+    with pytest.raises(ValueError):
+        compact.predict_proba(X[:, :-1])
@@ -0,0 +1,40 @@
+"""
+Inference executor: failed predictions degrade to the caller's fallback
+"""
+from models.executor import DEGRADED, ERROR, OK, InferenceExecutor
+from models.predictor import PredictionResult
+
+
+class StubPredictor:
+    model_type = "regression"
+
+    def __init__(self, fail: bool):
+        self.fail = fail
+
+    def predict(self, input_data):
+        if self.fail:
+            raise ValueError("bad input")
+        return PredictionResult(value=0.5, category="Medium")
+
+
+def estimate(input_data):
+    return PredictionResult(value=0.1, category="Low")
+
+
+def test_successful_predictions_are_ok():
+    executor = InferenceExecutor(StubPredictor(fail=False), workers=1, deadline_s=5)
+    outcome = executor.predict({"x": 1}, fallback=estimate)
+    executor.shutdown()
+    assert outcome.status == OK and outcome.result.value == 0.5
+
+
+def test_failed_predictions_are_served_by_the_fallback():
+    executor = InferenceExecutor(StubPredictor(fail=True), workers=1, deadline_s=5)
+    outcome = executor.predict({"x": 1}, fallback=estimate)
+    assert outcome.status == DEGRADED and outcome.result.value == 0.1
+    assert "ValueError: bad input" in outcome.reason
+
+    bare = executor.predict({"x": 2})
+    executor.shutdown()
+    assert bare.status == ERROR and bare.result is None
+    assert executor.outcomes[DEGRADED] == 1 and executor.outcomes[ERROR] == 1
@@ -0,0 +1,57 @@
+"""
+Gram-statistics solvers against refitting the pipeline on each replicate
+"""
+import numpy as np
+import pytest
+from sklearn.base import clone
+from sklearn.linear_model import BayesianRidge, Ridge
+
+from training.gram import GramStatistics, LinearMoments, gram_solver
+from training.regression import _pipeline
+from training.stability import replicate_indices, replicate_statistics
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.RandomState(0)
+    X = rng.normal(size=(200, 6)) * [1, 5, 0.1, 20, 2, 1] + [0, 10, -3, 100, 0, 1]
+    y = X @ rng.normal(size=6) + rng.normal(scale=0.5, size=200)
+    return X, y
+
+
+def test_moments_add_and_remove_rows(data):
+    X, y = data
+    full = LinearMoments.of(X, y)
+    rebuilt = LinearMoments.of(X[:150], y[:150]) + LinearMoments.of(X[150:], y[150:])
+    head = full - LinearMoments.of(X[150:], y[150:])
+    for name, value in full.to_dict().items():
+        np.testing.assert_allclose(getattr(rebuilt, name), value, rtol=1e-12)
+    np.testing.assert_allclose(head.xx, LinearMoments.of(X[:150], y[:150]).xx, rtol=1e-9)
+
+
+@pytest.mark.parametrize("scheme", ["holdout", "bootstrap"])
+@pytest.mark.parametrize("model, atol", [(Ridge(alpha=1.0), 1e-8), (BayesianRidge(), 1e-6)])
+def test_solver_matches_refit(data, scheme, model, atol):
+    X, y = data
+    trains = replicate_indices(len(y), 5, scheme, 0.2, seed=0)
+    stats = replicate_statistics(X, y, trains)
+    predictions = stats.predict(gram_solver(model)(stats), X)
+
+    for index, train in enumerate(trains):
+        refit = clone(_pipeline(model)).fit(X[train], y[train])
+        np.testing.assert_allclose(predictions[index], refit.predict(X), rtol=0, atol=atol)
+
+
+def test_unsupported_models_are_refit():
+    assert gram_solver(Ridge(positive=True)) is None
+    assert gram_solver(Ridge(fit_intercept=False)) is None
+    assert gram_solver(BayesianRidge(fit_intercept=False)) is None
+
+
+def test_unscaled_ridge_matches_sklearn(data):
+    X, y = data
+    stats = GramStatistics(LinearMoments.of(X, y))
+    fitted = Ridge(alpha=3.0).fit(X, y)
+    coef = stats.ridge(Ridge(alpha=3.0))
+    np.testing.assert_allclose(coef[0], fitted.coef_, rtol=1e-9)
+    np.testing.assert_allclose(stats.intercept(coef)[0], fitted.intercept_, rtol=1e-9)
@@ -0,0 +1,162 @@
+"""
+Incremental updates: scaler statistics, remapped thresholds, the regression gate and chained updates
+"""
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier, VotingRegressor
+from sklearn.linear_model import BayesianRidge, Lasso, Ridge
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold
+from sklearn.preprocessing import StandardScaler
+
+from config import config
+from training import regression
+from training.data import clean_dataset, load_raw, row_keys
+from training.gram import LinearMoments
+from training.incremental import (
+    merge_rows, out_of_fold_r2, remap_forest_thresholds, update_regression, update_standard_scaler,
+)
+
+DATASET = Path(__file__).resolve().parent.parent / "data" / "Round 1 - Dataset - SOIL Hackathon 2025 V1.0.xlsx"
+
+
+@pytest.fixture(scope="module")
+def rows():
+    rng = np.random.RandomState(0)
+    return rng.normal(size=(300, 5)) * [1, 10, 0.1, 3, 50] + [0, 5, 1, -2, 100]
+
+
+def test_scaler_update_matches_refit(rows):
+    scaler = StandardScaler().fit(rows[:200])
+    updated = update_standard_scaler(scaler, added=rows[200:], removed=rows[:40])
+    refit = StandardScaler().fit(rows[40:])
+    np.testing.assert_allclose(updated.mean_, refit.mean_, rtol=1e-12)
+    np.testing.assert_allclose(updated.var_, refit.var_, rtol=1e-10)
+    np.testing.assert_allclose(updated.scale_, refit.scale_, rtol=1e-10)
+    assert updated.n_samples_seen_ == refit.n_samples_seen_
+    np.testing.assert_array_equal(scaler.mean_, StandardScaler().fit(rows[:200]).mean_)  # the original is untouched
+
+
+def test_remapped_thresholds_keep_raw_space_decisions(rows):
+    labels = (rows[:, 0] + rows[:, 1] / 10 > 0.5).astype(int) + (rows[:, 3] > -2)
+    old = StandardScaler().fit(rows[:200])
+    forest = RandomForestClassifier(n_estimators=30, random_state=0).fit(old.transform(rows[:200]), labels[:200])
+    expected = forest.predict_proba(old.transform(rows))
+
+    new = update_standard_scaler(old, added=rows[200:])
+    remap_forest_thresholds(forest, old, new)
+    np.testing.assert_array_equal(forest.predict_proba(new.transform(rows)), expected)
+
+
+def _ensemble() -> VotingRegressor:
+    return VotingRegressor([
+        ('ridge', Ridge(alpha=1.0)),
+        ('bayesian_ridge', BayesianRidge()),
+        ('lasso', Lasso(alpha=0.001, max_iter=20000, tol=1e-8)),
+    ])
+
+
+def test_out_of_fold_r2_matches_refits(rows):
+    X = pd.DataFrame(rows, index=np.arange(1000, 1300))
+    y = pd.Series(rows @ [0.3, 0.02, 2.0, -0.1, 0.01] + np.random.RandomState(1).normal(size=300), index=X.index)
+    model = regression._pipeline(_ensemble()).fit(X, y)
+    Z = model[:-1].transform(X)
+    labels = list(X.index)
+    both = (labels, Z, y.to_numpy(), LinearMoments.of(Z, y))
+    current, updated = out_of_fold_r2(model, both, both, X, y, scored=labels[:200], seed=0)
+    assert current == pytest.approx(updated, abs=1e-12)
+
+    # Every member refit without the fold, behind the same fitted imputer/scaler
+    predictions = pd.Series(np.nan, index=labels[:200])
+    for _, fold in KFold(n_splits=5, shuffle=True, random_state=0).split(labels[:200]):
+        out = np.isin(labels, np.asarray(labels)[fold])
+        members = [member.fit(Z[~out], y[~out]).predict(Z[out]) for _, member in _ensemble().estimators]
+        predictions.iloc[fold] = np.mean(members, axis=0)
+    assert current == pytest.approx(r2_score(y.loc[labels[:200]], predictions), abs=1e-6)
+
+
+# ============================================================
+# CHAINED REGRESSION UPDATES
+# ============================================================
+@pytest.fixture(scope="module")
+def raw():
+    return load_raw(DATASET)
+
+
+def _publish(raw: pd.DataFrame, models_dir: Path) -> None:
+    """A small published HDI ensemble, stored the way regression.export stores it"""
+    features = regression.build_features(clean_dataset(raw))
+    names = regression.select_features(features, top_n=8, redundancy_threshold=0.85, min_corr=0.1)['feature_names']
+    # Every 15th row stands in for the outlier filter's removals
+    train = [row for position, row in enumerate(features['X'].index) if position % 15]
+    X, y = features['X'].loc[train, names].reset_index(drop=True), features['y'].loc[train].reset_index(drop=True)
+    model = regression._pipeline(_ensemble()).fit(X, y)
+    package = {
+        'model': model,
+        'feature_names': names,
+        'linear_moments': LinearMoments.of(model[:-1].transform(X), y).to_dict(),
+        'train_keys': row_keys(pd.concat([X, y], axis=1)).to_numpy(),
+        'metadata': {'n_samples': len(y)},
+    }
+    path = models_dir / "regression" / config.REGRESSION_MODEL_FILE
+    path.parent.mkdir(parents=True)
+    joblib.dump(package, path)
+
+
+def _new_countries(raw: pd.DataFrame, names, source_rows, scale: float) -> pd.DataFrame:
+    rows = raw.iloc[source_rows].copy()
+    rows['Country_Name'] = names
+    rows['HDI_Index'] = (rows['HDI_Index'] * scale).clip(upper=0.99)
+    rows['Internet_Access_pct'] = (rows['Internet_Access_pct'] * scale).clip(upper=100)
+    return rows
+
+
+def _round_trip(df: pd.DataFrame, path: Path) -> pd.DataFrame:
+    """The merged dataset as the CLI writes it and the next --data reads it"""
+    df.to_csv(path, index=False)
+    return load_raw(path)
+
+
+def test_chained_updates_keep_statistics_and_rows_in_step(raw, tmp_path):
+    _publish(raw, tmp_path)
+    correction = pd.DataFrame({'Country_Name': [raw['Country_Name'].iloc[3]], 'Internet_Access_pct': [99.0]})
+    first = pd.concat([_new_countries(raw, ['Aland', 'Bland', 'Cland'], [10, 50, 90], 1.05), correction])
+    result = update_regression(raw, first, tmp_path, tmp_path, tolerance=1.0)
+    assert result.published
+    merged, _, _ = merge_rows(raw, first)
+    merged = _round_trip(merged, tmp_path / "first.csv")
+
+    # Running the second update against the stale dataset is refused
+    second = pd.concat([
+        _new_countries(raw, ['Dland', 'Eland'], [20, 120], 0.9),
+        pd.DataFrame({'Country_Name': ['Bland'], 'Literacy_Rate_pct': [60.0]}),
+    ])
+    with pytest.raises(ValueError, match="training rows"):
+        update_regression(raw, second, tmp_path, tmp_path, tolerance=1.0, publish=False)
+
+    result = update_regression(merged, second, tmp_path, tmp_path, tolerance=1.0)
+    assert result.published
+    final, _, _ = merge_rows(merged, second)
+    final = _round_trip(final, tmp_path / "second.csv")
+
+    # The stored rows are found in the final dataset and are exactly what the statistics describe
+    package = joblib.load(tmp_path / "regression" / config.REGRESSION_MODEL_FILE)
+    model, names = package['model'], package['feature_names']
+    features = regression.build_features(clean_dataset(final))
+    X, y = features['X'][names], features['y']
+    train = X.index[row_keys(pd.concat([X, y], axis=1)).isin(package['train_keys'])]
+    assert len(train) == len(package['train_keys']) == sum(1 for position in range(len(raw)) if position % 15) + 5
+    Z = model[:-1].transform(X.loc[train])
+    expected = LinearMoments.of(Z, y.loc[train])
+    for name, value in expected.to_dict().items():
+        np.testing.assert_allclose(package['linear_moments'][name], value, rtol=1e-9, atol=1e-9)
+
+    # The re-solved Ridge member is the one a refit on those rows gives
+    ridge = dict(zip((name for name, _ in model[-1].estimators), model[-1].estimators_))['ridge']
+    refit = Ridge(alpha=1.0).fit(Z, y.loc[train])
+    np.testing.assert_allclose(ridge.coef_, refit.coef_, rtol=1e-8, atol=1e-10)
+    assert ridge.intercept_ == pytest.approx(refit.intercept_, rel=1e-9)
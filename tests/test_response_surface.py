@@ -0,0 +1,53 @@
+"""
+Response-surface lookups against a linear table, including rows that leave inputs out
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.response_surface import ResponseSurface
+
+GRIDS = [np.linspace(0.0, 1.0, 5), np.linspace(10.0, 20.0, 3)]
+
+
+def linear(a, b):
+    return 0.3 * a + 0.02 * b
+
+
+def fallback(rows: pd.DataFrame) -> np.ndarray:
+    return np.full(len(rows), -1.0)
+
+
+def package(with_dim_base: bool = True):
+    a, b = np.meshgrid(*GRIDS, indexing='ij')
+    base = {'a': 0.5, 'b': 15.0, 'c': 2.0} if with_dim_base else {'c': 2.0}
+    return {'task': 'regression', 'dims': ['a', 'b'], 'grids': GRIDS,
+            'values': linear(a, b).astype(np.float32), 'base': base, 'classes': None}
+
+
+def test_interpolation_is_exact_for_linear_tables():
+    surface = ResponseSurface(package())
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({'a': rng.uniform(0, 1, 50), 'b': rng.uniform(10, 20, 50), 'c': 2.0})
+    np.testing.assert_allclose(surface.predict(frame, fallback), linear(frame['a'], frame['b']), rtol=1e-6)
+
+
+def test_rows_off_the_subspace_go_to_the_fallback():
+    surface = ResponseSurface(package())
+    frame = pd.DataFrame({'a': [0.5, 1.5, 0.5], 'b': [15.0, 15.0, 15.0], 'c': [2.0, 2.0, 3.0]})
+    np.testing.assert_allclose(surface.predict(frame, fallback), [linear(0.5, 15.0), -1.0, -1.0], rtol=1e-6)
+
+
+def test_partial_rows_take_base_values_for_tabulated_inputs():
+    surface = ResponseSurface(package())
+    frame = pd.DataFrame({'a': [0.25, 0.75]})
+    np.testing.assert_allclose(surface.predict(frame, fallback), linear(frame['a'], 15.0), rtol=1e-6)
+
+
+@pytest.mark.parametrize("frame, expected", [
+    (pd.DataFrame({'a': [0.25, 0.75]}), [-1.0, -1.0]),
+    (pd.DataFrame({'a': [0.25, np.nan], 'b': [12.0, 12.0]}), [linear(0.25, 12.0), -1.0]),
+])
+def test_partial_rows_without_base_values_go_to_the_fallback(frame, expected):
+    surface = ResponseSurface(package(with_dim_base=False))
+    np.testing.assert_allclose(surface.predict(frame, fallback), expected, rtol=1e-6)
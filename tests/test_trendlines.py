@@ -0,0 +1,54 @@
+"""
+NumPy trendlines against np.polyfit and statsmodels' LOWESS
+"""
+import numpy as np
+import pytest
+
+from utils.trendlines import lowess_fit, ols_fit
+
+
+@pytest.fixture(scope="module")
+def noisy():
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, 60)
+    y = np.sin(x) + rng.normal(scale=0.3, size=60)
+    y[5] += 5  # one outlier for the robustness iterations
+    return x, y
+
+
+def test_ols_matches_polyfit(noisy):
+    x, y = noisy
+    fit = ols_fit(x, y)
+    slope, intercept = np.polyfit(x, y, 1)
+    assert fit.slope == pytest.approx(slope, rel=1e-12)
+    assert fit.intercept == pytest.approx(intercept, rel=1e-12)
+    assert fit.r_squared == pytest.approx(np.corrcoef(x, y)[0, 1] ** 2, rel=1e-12)
+    np.testing.assert_allclose(fit.y, np.polyval([slope, intercept], [x.min(), x.max()]), rtol=1e-12)
+
+
+def test_ols_drops_missing_values_and_degenerate_inputs(noisy):
+    x, y = noisy
+    gappy = y.copy()
+    gappy[::7] = np.nan
+    keep = np.isfinite(gappy)
+    assert ols_fit(x, gappy).slope == pytest.approx(np.polyfit(x[keep], y[keep], 1)[0], rel=1e-12)
+    assert ols_fit([1.0], [2.0]) is None
+    assert ols_fit([3.0, 3.0, 3.0], [1.0, 2.0, 3.0]) is None
+
+
+@pytest.mark.parametrize("iterations", [0, 3])
+def test_lowess_reproduces_a_line(iterations):
+    x = np.linspace(-2, 5, 40)
+    fit = lowess_fit(x, 0.7 * x - 1.5, iterations=iterations)
+    np.testing.assert_allclose(fit.y, 0.7 * fit.x - 1.5, atol=1e-12)
+
+
+@pytest.mark.parametrize("iterations", [0, 1, 3])
+def test_lowess_matches_statsmodels(noisy, iterations):
+    smoothers = pytest.importorskip("statsmodels.nonparametric.smoothers_lowess")
+    x, y = noisy
+    # Evenly spaced x with n <= n_points, so the evaluation grid is the data and frac * n is a whole neighbourhood
+    fit = lowess_fit(x, y, frac=2 / 3, iterations=iterations)
+    expected = smoothers.lowess(y, x, frac=2 / 3, it=iterations, delta=0, return_sorted=False)
+    np.testing.assert_allclose(fit.x, x, atol=1e-12)
+    np.testing.assert_allclose(fit.y, expected, atol=1e-10)
@@ -0,0 +1,57 @@
+"""
+Ensemble weight solvers: the closed form is the constrained optimum
+"""
+import numpy as np
+import pytest
+
+from training.weights import _gram, _sse, optimize_weights, project_capped_simplex, solve_closed_form
+
+
+@pytest.fixture(scope="module")
+def members():
+    rng = np.random.RandomState(0)
+    y = rng.normal(size=300)
+    predictions = np.array([y + rng.normal(scale=s, size=300) for s in (0.3, 0.5, 0.8, 1.2, 0.4)])
+    return predictions, y
+
+
+def _grid_optimum(predictions, y, low, high, step=0.025):
+    """Smallest squared error over every weight vector on a grid of the constraint set"""
+    levels = np.round(np.arange(low, high + step / 2, step), 10)
+    mesh = np.array(np.meshgrid(*[levels] * (len(predictions) - 1), indexing="ij")).reshape(len(predictions) - 1, -1).T
+    weights = np.column_stack([mesh, 1 - mesh.sum(axis=1)])
+    weights = weights[(weights[:, -1] >= low - 1e-12) & (weights[:, -1] <= high + 1e-12)]
+    return _sse(weights, *_gram(predictions, y)).min()
+
+
+@pytest.mark.parametrize("low, high", [(0.10, 0.50), (0.0, 1.0), (0.15, 0.30)])
+def test_closed_form_is_feasible_and_optimal(members, low, high):
+    predictions, y = members
+    weights = solve_closed_form(predictions, y, low, high)
+    gram, cross, yy = _gram(predictions, y)
+
+    assert weights.sum() == pytest.approx(1.0, abs=1e-9)
+    assert weights.min() >= low - 1e-9 and weights.max() <= high + 1e-9
+    assert _sse(weights[None], gram, cross, yy)[0] <= _grid_optimum(predictions, y, low, high) + 1e-9
+
+
+@pytest.mark.parametrize("method", ["batched", "slsqp"])
+def test_iterative_solvers_do_not_beat_closed_form(members, method):
+    predictions, y = members
+    exact = optimize_weights(predictions, y, method="closed_form")
+    other = optimize_weights(predictions, y, method=method)
+    assert other.r2 <= exact.r2 + 1e-9
+    assert other.r2 == pytest.approx(exact.r2, abs=1e-4)
+
+
+def test_projection_lands_on_capped_simplex():
+    rng = np.random.RandomState(1)
+    projected = project_capped_simplex(rng.normal(scale=2, size=(50, 6)), 0.05, 0.40)
+    np.testing.assert_allclose(projected.sum(axis=1), 1.0, atol=1e-9)
+    assert projected.min() >= 0.05 - 1e-12 and projected.max() <= 0.40 + 1e-12
+
+
+def test_infeasible_bounds_are_rejected(members):
+    predictions, y = members
+    with pytest.raises(ValueError):
+        optimize_weights(predictions, y, min_weight=0.3, max_weight=0.5)
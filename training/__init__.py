@@ -0,0 +1,14 @@
+"""
+Reproducible Model Training Pipelines
+
+Run with ``python -m training --help`` from the repository root.
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_DIR = ROOT / ".training_cache"
+
+# Share config and feature engineering with the app so training and serving agree
+if str(ROOT / "app") not in sys.path:
+    sys.path.insert(0, str(ROOT / "app"))
@@ -0,0 +1,308 @@
+"""
+Training CLI (cleaning → features → resampling → search → export)
+
+Every stage caches its output under the cache directory, keyed on its
+inputs, parameters and code, so only stages affected by a change rerun:
+switching the estimator reruns the search and export stages, while editing
+the cleaning code reruns everything.
+
+Usage:
+    python -m training all
+    python -m training classification --estimator extra_trees --n-iter 50
+    python -m training classification --candidates random_forest,extra_trees,svm,voting,stacking
+    python -m training all --max-latency-ms 20 --max-size-mb 25
+    python -m training regression --out /tmp/models
+    python -m training classification --status
+    python -m training classification --force classification_split
+    python -m training regression --stability 50
+    python -m training all --update new_rows.csv
+    python -m training classification --compress
+    python -m training all --distill
+    python -m training all --response-surface --surface-dims 4 --surface-points 9
+"""
+import argparse
+import logging
+import sys
+import warnings
+from datetime import datetime
+from pathlib import Path
+
+from training import DEFAULT_CACHE_DIR
+from training import classification, compress, distill, incremental, regression, search, stability, weights
+from training import response_surface
+from training.data import load_raw
+from training.selection import BudgetExceededError, InferenceBudget
+from training.stages import StageCache, StagePipeline
+
+from config import config
+
+RAW_DATASET = config.DATA_DIR / "Round 1 - Dataset - SOIL Hackathon 2025 V1.0.xlsx"
+
+
+def build_pipelines(args, cache: StageCache) -> dict:
+    budget = InferenceBudget(
+        max_single_ms=args.max_latency_ms, max_batch_ms=args.max_batch_ms, batch_rows=config.MODEL_BUDGET_BATCH_ROWS,
+        max_size_mb=args.max_size_mb, max_load_ms=args.max_load_ms, max_memory_mb=args.max_memory_mb,
+    )
+    # Fold data shared with worker processes lives with the stage cache, so --clear-cache removes it too
+    data_dir = args.cache_dir / "search_data"
+    pipelines = {}
+    if args.task in ("classification", "all"):
+        pipelines["classification"] = StagePipeline(classification.build_stages(
+            args.data, args.out, estimator=args.estimator, n_iter=args.n_iter,
+            cv_folds=args.cv_folds, select_k=args.select_k, strategy=args.search, eta=args.eta,
+            candidates=args.candidates, budget=budget, data_dir=data_dir, seed=args.seed,
+        ), cache)
+    if args.task in ("regression", "all"):
+        pipelines["regression"] = StagePipeline(regression.build_stages(
+            args.data, args.out, top_n=args.top_n, cv_folds=args.cv_folds,
+            cv_repeats=args.cv_repeats, weight_method=args.weight_solver,
+            stability_replicates=args.stability, stability_scheme=args.stability_scheme, budget=budget,
+            data_dir=data_dir, seed=args.seed,
+        ), cache)
+    return pipelines
+
+
+def print_selection(selected: dict) -> None:
+    """Accuracy and inference cost of every classification candidate"""
+    print(f"\n{'candidate':<18} {'cv acc':>7} {'test acc':>8} {'ms/row':>7} {'p95 ms':>7} {'batch ms':>9} "
+          f"{'MB':>7} {'load ms':>8}  budget")
+    for row in selected["candidates"]:
+        marker = " *" if row["estimator"] == selected["estimator"] else ""
+        print(f"{row['estimator'] + marker:<18} {row['cv_accuracy']:>7.4f} {row['test_accuracy']:>8.4f} "
+              f"{row['single_p50_ms']:>7.2f} {row['single_p95_ms']:>7.2f} {row['batch_ms']:>9.1f} "
+              f"{row['size_mb']:>7.2f} {row['load_ms']:>8.1f}  {'ok' if row['within_budget'] else 'over'}")
+
+
+def run_updates(args) -> int:
+    """Incremental update of the published models; 1 if a validation gate rejected one"""
+    base, rows = load_raw(args.data), load_raw(args.update)
+    results = []
+    if args.task in ("classification", "all"):
+        results.append(incremental.update_classification(
+            base, rows, models_dir=args.out, out_dir=args.out, extra_trees=args.update_trees,
+            tolerance=args.gate_tolerance, publish=not args.dry_run, seed=args.seed,
+        ))
+    if args.task in ("regression", "all"):
+        results.append(incremental.update_regression(
+            base, rows, models_dir=args.out, out_dir=args.out,
+            tolerance=args.gate_tolerance, publish=not args.dry_run, seed=args.seed,
+        ))
+
+    print(f"\n{'task':<16} {'new':>4} {'fixed':>5} {'gate metric':<20} {'current':>8} {'candidate':>9} "
+          f"{'seconds':>8}  result")
+    for result in results:
+        gate = result.gate
+        outcome = "published" if result.published else "passed (dry run)" if gate.passed else "rejected"
+        print(f"{result.task:<16} {len(result.added):>4} {len(result.replaced):>5} {gate.metric:<20} "
+              f"{gate.current:>8.4f} {gate.candidate:>9.4f} {result.elapsed_s:>8.2f}  {outcome}")
+
+    published = [result.task for result in results if result.published]
+    if published:
+        # Rows applied, so the next update (or a full retrain) starts from what was published. A task whose
+        # gate rejected them must keep the old dataset, so then each published task gets its own
+        merged, _, _ = incremental.merge_rows(base, rows)
+        stamp = f"{datetime.now():%Y%m%d_%H%M%S}"
+        targets = {None: "dataset"} if len(published) == len(results) else {
+            task: f"{task}_dataset" for task in published
+        }
+        for task, name in targets.items():
+            dataset = args.cache_dir / "updates" / f"{stamp}_{name}.csv"
+            dataset.parent.mkdir(parents=True, exist_ok=True)
+            merged.to_csv(dataset, index=False)
+            hint = "" if task is None else f" for the next {task} update only"
+            print(f"\nUpdated dataset written to {dataset} (pass it as --data{hint})")
+    return 0 if all(result.gate.passed for result in results) else 1
+
+
+def run_compression(args) -> int:
+    """Compress the published forest; prints the before/after report"""
+    result = compress.compress_classification(
+        load_raw(args.data), models_dir=args.out, out_dir=args.out, tolerance=args.gate_tolerance,
+        min_trees=args.min_trees, publish=not args.dry_run, seed=args.seed,
+    )
+    print(f"\n{'':<10} {'trees':>6} {'depth':>6} {'nodes':>7} {'accuracy':>9} {'ms/row':>7} {'p95 ms':>7} "
+          f"{'batch ms':>9} {'MB':>7} {'load ms':>8} {'memory MB':>10}")
+    for label, shape, accuracy, profile in (
+        ("before", result.before, result.accuracy_before, result.before_profile),
+        ("after", result.after, result.accuracy_after, result.after_profile),
+    ):
+        print(f"{label:<10} {shape['n_trees']:>6} {shape['max_depth']:>6} {shape['n_nodes']:>7} {accuracy:>9.4f} "
+              f"{profile.single_p50_ms:>7.2f} {profile.single_p95_ms:>7.2f} {profile.batch_ms:>9.1f} "
+              f"{profile.size_mb:>7.3f} {profile.load_ms:>8.1f} {profile.memory_mb:>10.3f}")
+    outcome = "published" if result.published else "dry run, nothing written"
+    print(f"\nAgreement with the full forest on held-out rows: {result.agreement:.2%} ({outcome})")
+    return 0
+
+
+def run_distillation(args) -> int:
+    """Distill live-preview surrogates of the published models; prints their fidelity"""
+    raw = load_raw(args.data)
+    tasks = distill.TASKS if args.task == "all" else (args.task,)
+    results = [
+        distill.distill(task, raw, models_dir=args.out, out_dir=args.out, n_samples=args.distill_samples,
+                        min_speedup=args.min_speedup, publish=not args.dry_run, seed=args.seed)
+        for task in tasks
+    ]
+    print(f"\n{'task':<16} {'surrogate':<18} {'fidelity (held-out synthetic)':<44} {'on dataset':<28} {'ms/row':>7}")
+    for result in results:
+        for name, report in result.fidelity.items():
+            marker = " *" if name == result.selected else ""
+            synthetic = ", ".join(f"{k} {v:.3f}" for k, v in list(report["synthetic"].items())[:2])
+            dataset = ", ".join(f"{k} {v:.3f}" for k, v in list(report["dataset"].items())[:1])
+            print(f"{result.task:<16} {name + marker:<18} {synthetic:<44} {dataset:<28} "
+                  f"{report['single_p50_ms']:>7.2f}")
+        print(f"{result.task:<16} {'production model':<18} {'':<44} {'':<28} "
+              f"{result.details['teacher_single_p50_ms']:>7.2f}")
+        if result.selected is None:
+            print(f"{result.task:<16} no surrogate shipped: none is {args.min_speedup:g}× faster within tolerance")
+    outcome = "dry run, nothing written" if args.dry_run else "published"
+    print(f"\nSurrogates: {outcome} (* = shipped; full report in <task>/surrogate_report.json)")
+    return 0
+
+
+def run_response_surfaces(args) -> int:
+    """Tabulate the published models over their most influential inputs; prints error and speed"""
+    raw = load_raw(args.data)
+    tasks = distill.TASKS if args.task == "all" else (args.task,)
+    results = [
+        response_surface.build_surface(task, raw, models_dir=args.out, out_dir=args.out, n_dims=args.surface_dims,
+                                       points=args.surface_points, publish=not args.dry_run, seed=args.seed)
+        for task in tasks
+    ]
+    print(f"\n{'task':<16} {'grid':<14} {'KB':>6} {'interpolation error':<44} {'µs/row':>7} {'model µs/row':>12}")
+    for result in results:
+        error = ", ".join(f"{k} {v:.4f}" for k, v in result.accuracy.items())
+        print(f"{result.task:<16} {' × '.join(map(str, result.grid_shape)):<14} {result.details['size_kb']:>6.1f} "
+              f"{error:<44} {result.speed['table_us_per_row']:>7.2f} {result.speed['model_us_per_row']:>12.1f}")
+        print(f"{'':<16} inputs: {', '.join(result.dims)}")
+    outcome = "published" if all(result.published for result in results) else "dry run, nothing written"
+    print(f"\nResponse surfaces: {outcome} (full report in <task>/response_surface_report.json)")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m training", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("task", choices=["classification", "regression", "all"])
+    parser.add_argument("--data", type=Path, default=RAW_DATASET, help="Raw dataset (.xlsx or .csv)")
+    parser.add_argument("--out", type=Path, default=config.MODELS_DIR, help="Model output directory")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="Stage cache directory")
+    parser.add_argument("--force", action="append", default=[], metavar="STAGE",
+                        help="Recompute this stage even if cached (repeatable)")
+    parser.add_argument("--status", action="store_true", help="Show which stages are cached and exit")
+    parser.add_argument("--clear-cache", action="store_true", help="Delete all cached stage outputs (and shared fold data) first")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cv-folds", type=int, default=5)
+
+    group = parser.add_argument_group("classification")
+    group.add_argument("--estimator", choices=classification.ESTIMATORS, default="random_forest")
+    group.add_argument("--n-iter", type=int, default=100, help="Search candidates")
+    group.add_argument("--search", choices=search.STRATEGIES, default="halving",
+                       help="halving: synchronous rungs; asha: asynchronous promotion; random: no early stopping")
+    group.add_argument("--eta", type=int, default=3, help="Keep 1/eta of the candidates per rung")
+    group.add_argument("--select-k", type=int, help="Keep the k best features by mutual information")
+    group.add_argument("--candidates", type=lambda value: value.split(","), metavar="NAMES",
+                       help="Compare these estimators/ensembles (comma-separated, from "
+                            f"{', '.join(classification.ESTIMATORS + list(classification.ENSEMBLES))}) "
+                            "instead of --estimator alone")
+
+    group = parser.add_argument_group("export budget (single core; 0 = no limit)")
+    group.add_argument("--max-latency-ms", type=float, default=config.MODEL_MAX_SINGLE_MS,
+                       help="Single-row prediction p95")
+    group.add_argument("--max-batch-ms", type=float, default=config.MODEL_MAX_BATCH_MS,
+                       help=f"Prediction of a {config.MODEL_BUDGET_BATCH_ROWS}-row batch")
+    group.add_argument("--max-size-mb", type=float, default=config.MODEL_MAX_SIZE_MB, help="Artifact size")
+    group.add_argument("--max-load-ms", type=float, default=config.MODEL_MAX_LOAD_MS, help="Artifact load time")
+    group.add_argument("--max-memory-mb", type=float, default=config.MODEL_MAX_MEMORY_MB,
+                       help="Memory allocated loading the artifact")
+
+    group = parser.add_argument_group("regression")
+    group.add_argument("--top-n", type=int, default=15, help="Features kept by correlation selection")
+    group.add_argument("--cv-repeats", type=int, default=10, help="Repeats of the final ensemble CV")
+    group.add_argument("--weight-solver", choices=weights.METHODS, default="auto",
+                       help="Ensemble weights: exact closed form, batched projected gradient or SLSQP")
+    group.add_argument("--stability", type=int, default=0, metavar="N",
+                       help="Refit the ensemble on N replicates and export the stability summary")
+    group.add_argument("--stability-scheme", choices=stability.SCHEMES, default="holdout",
+                       help="holdout: the notebook's 80/20 splits; bootstrap: resampling with out-of-bag scoring")
+
+    group = parser.add_argument_group("incremental update (instead of a full retrain)")
+    group.add_argument("--update", type=Path, metavar="ROWS",
+                       help="New or corrected rows (.csv/.xlsx, matched on Country_Name) for the models in --out")
+    group.add_argument("--update-trees", type=int, default=50, help="Trees added to the forest")
+    group.add_argument("--gate-tolerance", type=float, default=0.01,
+                       help="Largest metric drop vs the current models that still publishes")
+    group.add_argument("--dry-run", action="store_true", help="Evaluate the update without publishing it")
+
+    group = parser.add_argument_group("forest compression (instead of a full retrain)")
+    group.add_argument("--compress", action="store_true",
+                       help="Pack the published forest into the fewest trees and shallowest depth within "
+                            "--gate-tolerance of its held-out accuracy (float32 compact artifact)")
+    group.add_argument("--min-trees", type=int, default=10, help="Smallest sub-forest considered")
+
+    group = parser.add_argument_group("live-preview surrogates (instead of a full retrain)")
+    group.add_argument("--distill", action="store_true",
+                       help="Fit fast surrogates of the published models on synthetic inputs from FEATURE_RANGES")
+    group.add_argument("--distill-samples", type=int, default=20000, help="Synthetic inputs labelled per model")
+    group.add_argument("--min-speedup", type=float, default=5.0,
+                       help="Ship a surrogate only if it is this many times faster per row than the model")
+
+    group = parser.add_argument_group("response-surface tables (instead of a full retrain)")
+    group.add_argument("--response-surface", action="store_true",
+                       help="Tabulate the published models over their most influential FEATURE_RANGES inputs")
+    group.add_argument("--surface-dims", type=int, default=4, help="Inputs tabulated, by permutation importance")
+    group.add_argument("--surface-points", type=int, default=9, help="Grid points per tabulated input")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    warnings.filterwarnings("ignore", category=UserWarning)
+    warnings.filterwarnings("ignore", category=FutureWarning)
+
+    if args.update:
+        return run_updates(args)
+    if args.compress:
+        if args.task != "classification":
+            parser.error("--compress applies to the classification forest only")
+        return run_compression(args)
+    if args.distill:
+        return run_distillation(args)
+    if args.response_surface:
+        return run_response_surfaces(args)
+
+    cache = StageCache(args.cache_dir)
+    if args.clear_cache:
+        cache.clear()
+
+    try:
+        pipelines = build_pipelines(args, cache)
+    except ValueError as e:
+        parser.error(str(e))
+    known = {name for pipeline in pipelines.values() for name in pipeline.stages}
+    unknown = sorted(set(args.force) - known)
+    if unknown:
+        parser.error(f"unknown stage(s) for --force: {', '.join(unknown)}")
+
+    for task, pipeline in pipelines.items():
+        if args.status:
+            reports = pipeline.status()
+        else:
+            task_force = [name for name in args.force if name in pipeline.stages]
+            try:
+                outputs, reports = pipeline.run(force=task_force)
+            except BudgetExceededError as e:
+                print(f"\n{task}: not exported, {e}")
+                return 1
+            if "classification_select" in outputs:
+                print_selection(outputs["classification_select"])
+
+        print(f"\n{task}")
+        print(f"{'stage':<36} {'status':>8} {'seconds':>8}  key")
+        for report in reports:
+            print(f"{report.name:<36} {report.status:>8} {report.elapsed_s:>8.2f}  {report.key[:12]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
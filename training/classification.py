@@ -0,0 +1,410 @@
+"""
+Happiness Classification Pipeline (SOIL_HACKATHON_CLASSIFICATION.ipynb)
+"""
+import importlib.util
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import (
+    ExtraTreesClassifier, GradientBoostingClassifier, RandomForestClassifier, StackingClassifier, VotingClassifier
+)
+from sklearn.feature_selection import SelectKBest, mutual_info_classif
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import StratifiedKFold, cross_val_score, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.svm import SVC
+
+from models.feature_engineering import FeatureEngineer
+from training.data import clean_dataset, load_raw
+from training.search import HalvingSearch
+from training.selection import InferenceBudget, enforce_budget, profile_inference
+from training.stages import Stage
+
+logger = logging.getLogger(__name__)
+
+TARGET = 'Happiness_Index'
+
+# Composite score weights; negative factors are inverted before weighting
+HAPPINESS_WEIGHTS = {
+    'HDI_Index': 0.25, 'GDP_per_Capita_USD': 0.15, 'Life_Expectancy_years': 0.15,
+    'Literacy_Rate_pct': 0.10, 'Internet_Access_pct': 0.05, 'Gender_Equality_Index': 0.10,
+    'Unemployment_Rate_pct': 0.10, 'Days_engaged_in_warfare_per_year': 0.10,
+}
+INVERTED_FACTORS = {'Unemployment_Rate_pct', 'Days_engaged_in_warfare_per_year'}
+
+# ============================================================
+# SEARCH SPACES
+# ============================================================
+PARAM_GRIDS = {
+    'random_forest': {
+        'n_estimators': [150, 200, 250, 300],
+        'max_depth': [4, 5, 6, 7, 8],
+        'min_samples_split': [5, 8, 10, 15],
+        'min_samples_leaf': [2, 3, 4, 5],
+        'max_features': ['sqrt', 'log2', 0.5, 0.7],
+        'class_weight': ['balanced', 'balanced_subsample', None],
+    },
+    'extra_trees': {
+        'n_estimators': [150, 200, 250],
+        'max_depth': [5, 6, 7, 8, None],
+        'min_samples_split': [2, 5, 8],
+        'min_samples_leaf': [1, 2, 3],
+        'max_features': ['sqrt', 'log2', 0.5],
+        'class_weight': ['balanced', 'balanced_subsample'],
+    },
+    'svm': {
+        'C': [0.1, 1, 10, 50, 100],
+        'gamma': ['scale', 'auto', 0.01, 0.1],
+        'kernel': ['rbf', 'poly'],
+        'degree': [2, 3],
+        'class_weight': ['balanced', None],
+    },
+    'gradient_boosting': {
+        'n_estimators': [100, 150, 200],
+        'max_depth': [2, 3, 4],
+        'learning_rate': [0.03, 0.05, 0.1],
+        'subsample': [0.7, 0.8, 0.9],
+        'min_samples_leaf': [2, 4, 8],
+    },
+    'xgboost': {
+        'n_estimators': [150, 200, 250, 300],
+        'max_depth': [3, 4, 5, 6],
+        'learning_rate': [0.03, 0.05, 0.08, 0.1],
+        'min_child_weight': [1, 2, 3, 5],
+        'subsample': [0.7, 0.8, 0.9],
+        'colsample_bytree': [0.7, 0.8, 0.9],
+        'reg_alpha': [0.1, 0.5, 1.0],
+        'reg_lambda': [1.0, 2.0, 5.0],
+        'gamma': [0, 0.1, 0.2],
+    },
+}
+ESTIMATORS = list(PARAM_GRIDS)
+# Built from the tuned candidates (the notebook's soft voting and stacking over its best models)
+ENSEMBLES = ('voting', 'stacking')
+
+
+def make_estimator(name: str, seed: int) -> Any:
+    """Untuned base estimator for ``name``"""
+    if name == 'random_forest':
+        return RandomForestClassifier(random_state=seed, n_jobs=-1)
+    if name == 'extra_trees':
+        return ExtraTreesClassifier(random_state=seed, n_jobs=-1)
+    if name == 'svm':
+        return SVC(probability=True, random_state=seed)
+    if name == 'gradient_boosting':
+        return GradientBoostingClassifier(random_state=seed)
+    if name == 'xgboost':
+        if importlib.util.find_spec('xgboost') is None:
+            raise ImportError("xgboost is not installed: pip install xgboost")
+        from xgboost import XGBClassifier
+        return XGBClassifier(random_state=seed, eval_metric='mlogloss', verbosity=0)
+    raise ValueError(f"Unknown estimator '{name}'; choose from {ESTIMATORS}")
+
+
+def make_ensemble(name: str, members: List[Any], cv_folds: int, seed: int) -> Any:
+    """Unfitted ensemble over (name, tuned estimator) ``members``"""
+    if name == 'voting':
+        return VotingClassifier(members, voting='soft', n_jobs=-1)
+    if name == 'stacking':
+        # LogisticRegression (sklearn's default) as meta-learner: xgboost is optional here
+        return StackingClassifier(members, final_estimator=LogisticRegression(max_iter=1000),
+                                  cv=StratifiedKFold(cv_folds, shuffle=True, random_state=seed), n_jobs=-1)
+    raise ValueError(f"Unknown ensemble '{name}'; choose from {ENSEMBLES}")
+
+
+# ============================================================
+# STAGES
+# ============================================================
+def happiness_levels(df: pd.DataFrame) -> pd.Series:
+    """Happiness level 1-5: equal-width bins of a weighted min-max composite"""
+    score = pd.Series(0.0, index=df.index)
+    for col, weight in HAPPINESS_WEIGHTS.items():
+        low, high = df[col].min(), df[col].max()
+        norm = (df[col] - low) / (high - low) if high != low else pd.Series(0.5, index=df.index)
+        score += weight * (1 - norm if col in INVERTED_FACTORS else norm)
+    return pd.cut(score, bins=5, labels=[1, 2, 3, 4, 5], include_lowest=True).astype(int)
+
+
+def build_features(cleaned: pd.DataFrame) -> Dict[str, Any]:
+    """Target plus numeric features, engineered the way the app does at serving time"""
+    y = happiness_levels(cleaned).rename(TARGET)
+    X = cleaned[[c for c in cleaned.columns if not c.startswith(TARGET)]]
+    # One-hot dummies are not collected by the prediction forms
+    X = X.select_dtypes(include=np.number)
+    X = FeatureEngineer.engineer_classification_features(X)
+    X = X.replace([np.inf, -np.inf], np.nan)
+    X = X.fillna(X.median())
+    return {'X': X, 'y': y}
+
+
+def split_and_scale(features: Dict[str, Any], test_size: float, seed: int) -> Dict[str, Any]:
+    """Stratified train/test split; scaler and label encoder fitted on the training part"""
+    X, y = features['X'], features['y']
+    label_encoder = LabelEncoder().fit(y)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=seed, stratify=y
+    )
+    # Fitted on a DataFrame so the scaler records feature_names_in_ for the loader
+    scaler = StandardScaler().fit(X_train)
+    return {
+        # Exported with the model so updates and compression reuse its test rows
+        'split': {'test_size': test_size, 'seed': seed, 'n_rows': len(X),
+                  'test_rows': sorted(int(row) for row in X_test.index)},
+        'X_train': scaler.transform(X_train),
+        'X_test': scaler.transform(X_test),
+        'y_train': label_encoder.transform(y_train),
+        'y_test': label_encoder.transform(y_test),
+        'scaler': scaler,
+        'label_encoder': label_encoder,
+        'feature_names': list(X.columns),
+    }
+
+
+def recorded_split(
+    features: Dict[str, Any], info: Dict[str, Any], test_size: float, seed: int
+) -> Tuple[pd.Index, pd.Index]:
+    """
+    Training and test rows of ``features`` as the exported model was split
+
+    Rows after the ones the model was exported with (added by updates) are
+    training rows. Refuses when ``model_info.json`` has no split record, was
+    split with another ``test_size``/``seed``, or ``features`` lacks its rows.
+    """
+    record = info.get('split')
+    if record is None:
+        raise ValueError("model_info.json does not record the model's train/test split; run a full retrain")
+    if (record['test_size'], record['seed']) != (test_size, seed):
+        raise ValueError(f"The model was split with test_size={record['test_size']}, seed={record['seed']}, "
+                         f"not test_size={test_size}, seed={seed}; pass the same values or run a full retrain")
+    index = features['X'].index
+    test_rows = pd.Index(record['test_rows'])
+    if len(index) < record['n_rows'] or not test_rows.isin(index).all():
+        raise ValueError(f"The dataset lacks rows the model was split on ({record['n_rows']} rows, "
+                         f"{len(test_rows)} held out); pass the dataset it was trained on or run a full retrain")
+    return index.difference(test_rows, sort=False), test_rows
+
+
+def resample(split: Dict[str, Any], k_neighbors: int, seed: int) -> Dict[str, np.ndarray]:
+    """Balance the training classes with SMOTE (random oversampling without imblearn)"""
+    X, y = split['X_train'], split['y_train']
+    if importlib.util.find_spec('imblearn') is not None:
+        from imblearn.over_sampling import SMOTE
+        smallest = int(np.bincount(y).min())
+        smote = SMOTE(random_state=seed, k_neighbors=min(k_neighbors, smallest - 1))
+        X_res, y_res = smote.fit_resample(X, y)
+    else:
+        logger.warning("⚠️ imbalanced-learn not installed; using random oversampling instead of SMOTE")
+        rng = np.random.default_rng(seed)
+        counts = np.bincount(y)
+        rows = [np.flatnonzero(y == label) for label in range(len(counts))]
+        rows = [np.concatenate([r, rng.choice(r, counts.max() - len(r))]) for r in rows if len(r)]
+        order = np.concatenate(rows)
+        X_res, y_res = X[order], y[order]
+    logger.info(f"⚖️ Resampled training set: {len(y)} → {len(y_res)} rows")
+    return {'X': X_res, 'y': y_res}
+
+
+def search(
+    resampled: Dict[str, np.ndarray],
+    estimator: str,
+    n_iter: int,
+    cv_folds: int,
+    select_k: Optional[int],
+    strategy: str,
+    eta: int,
+    seed: int,
+    data_dir: Optional[Path] = None
+) -> Dict[str, Any]:
+    """Hyperparameter search for the chosen estimator with successive-halving early stopping"""
+    model = make_estimator(estimator, seed)
+    grid = PARAM_GRIDS[estimator]
+    if select_k:
+        model = Pipeline([('select', SelectKBest(mutual_info_classif, k=select_k)), ('model', model)])
+        grid = {f'model__{name}': values for name, values in grid.items()}
+
+    result = HalvingSearch(
+        model, grid, n_candidates=n_iter, strategy=strategy, eta=eta,
+        cv=cv_folds, scoring='accuracy', seed=seed, data_dir=data_dir,
+    ).fit(resampled['X'], resampled['y'])
+    logger.info(f"🔎 {estimator}: best CV accuracy {result.best_score:.4f}")
+    return {
+        'estimator': estimator,
+        'model': result.best_estimator,
+        'best_params': result.best_params,
+        'cv_accuracy': float(result.best_score),
+        'search': result.summary(),
+    }
+
+
+def evaluate(model: Any, split: Dict[str, Any], cv_accuracy: float) -> Dict[str, float]:
+    """Accuracy metrics on the training and held-out parts of the split"""
+    train_pred = model.predict(split['X_train'])
+    test_pred = model.predict(split['X_test'])
+    metrics = {
+        'train_accuracy': float(accuracy_score(split['y_train'], train_pred)),
+        'test_accuracy': float(accuracy_score(split['y_test'], test_pred)),
+        'test_f1_weighted': float(f1_score(split['y_test'], test_pred, average='weighted')),
+        'cv_accuracy': cv_accuracy,
+    }
+    metrics['overfit_gap'] = metrics['train_accuracy'] - metrics['test_accuracy']
+    return metrics
+
+
+def select_model(
+    split: Dict[str, Any],
+    resampled: Dict[str, np.ndarray],
+    *searches: Dict[str, Any],
+    ensembles: List[str],
+    cv_folds: int,
+    budget: Dict[str, float],
+    seed: int
+) -> Dict[str, Any]:
+    """
+    Compare every candidate on accuracy and inference cost, keeping the best one within budget
+
+    Candidates are ranked by CV accuracy (ties go to the faster model). If
+    none fits the budget the most accurate is kept and export refuses it.
+    """
+    budget = InferenceBudget(**budget)
+    candidates = [(s['estimator'], s['model'], s['cv_accuracy'], s['best_params'], s['search']) for s in searches]
+    for name in ensembles:
+        members = [(s['estimator'], clone(s['model'])) for s in searches]
+        model = make_ensemble(name, members, cv_folds, seed)
+        folds = StratifiedKFold(cv_folds, shuffle=True, random_state=seed)
+        cv_accuracy = float(cross_val_score(model, resampled['X'], resampled['y'], cv=folds,
+                                            scoring='accuracy').mean())
+        model.fit(resampled['X'], resampled['y'])
+        logger.info(f"🧩 {name} over {', '.join(m for m, _ in members)}: CV accuracy {cv_accuracy:.4f}")
+        candidates.append((name, model, cv_accuracy, {}, None))
+
+    table = []
+    for name, model, cv_accuracy, _, _ in candidates:
+        profile = profile_inference(model, split['X_test'], batch_rows=budget.batch_rows)
+        violations = budget.violations(profile)
+        table.append({'estimator': name, **evaluate(model, split, cv_accuracy), **profile.to_dict(),
+                      'within_budget': not violations, 'violations': violations})
+        logger.info(f"⏱️ {name}: CV accuracy {cv_accuracy:.4f}, {profile.single_p50_ms:.2f} ms/row, "
+                    f"{profile.size_mb:.2f} MB{'' if not violations else ' — over budget: ' + '; '.join(violations)}")
+
+    ranked = sorted(range(len(table)), key=lambda i: (not table[i]['within_budget'], -table[i]['cv_accuracy'],
+                                                      table[i]['single_p50_ms']))
+    name, model, cv_accuracy, best_params, search_summary = candidates[ranked[0]]
+    logger.info(f"🏁 Selected {name} of {len(candidates)} candidate(s)")
+    return {
+        'estimator': name,
+        'model': model,
+        'best_params': best_params,
+        'cv_accuracy': cv_accuracy,
+        'search': search_summary,
+        'candidates': table,
+    }
+
+
+def export(split: Dict[str, Any], selected: Dict[str, Any], out_dir: Path, budget: Dict[str, float]) -> Dict[str, Any]:
+    """Evaluate on the held-out split, gate on the inference budget and write the artifacts the app loads"""
+    model = selected['model']
+    metrics = evaluate(model, split, selected['cv_accuracy'])
+
+    out_dir = Path(out_dir) / "classification"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # Measure the artifact as written, and replace nothing unless it fits the budget
+    budget = InferenceBudget(**budget)
+    staged = out_dir / "model.joblib.tmp"
+    joblib.dump(model, staged)
+    try:
+        profile = profile_inference(model, split['X_test'], batch_rows=budget.batch_rows, path=staged)
+        enforce_budget(selected['estimator'], profile, budget)
+    except Exception:
+        staged.unlink()
+        raise
+    os.replace(staged, out_dir / "model.joblib")
+    joblib.dump(split['scaler'], out_dir / "scaler.joblib")
+    joblib.dump(split['label_encoder'], out_dir / "label_encoder.joblib")
+    with open(out_dir / "feature_names.json", 'w') as f:
+        json.dump(split['feature_names'], f, indent=2)
+
+    info = {
+        'timestamp': datetime.now().strftime('%Y%m%d_%H%M%S'),
+        'n_features': len(split['feature_names']),
+        'classes': [int(c) for c in split['label_encoder'].classes_],
+        'estimator': selected['estimator'],
+        'best_params': {k: v if isinstance(v, (str, int, float, type(None))) else repr(v)
+                        for k, v in selected['best_params'].items()},
+        'metrics': metrics,
+        'inference': profile.to_dict(),
+        'budget': budget.to_dict(),
+        'search': selected['search'],
+        'selection': selected['candidates'],
+        'split': split['split'],
+    }
+    with open(out_dir / "model_info.json", 'w') as f:
+        json.dump(info, f, indent=2)
+    logger.info(f"💾 Classification model exported to {out_dir} (test accuracy {metrics['test_accuracy']:.2%})")
+    return info
+
+
+def build_stages(
+    raw_path: Path,
+    out_dir: Path,
+    estimator: str = 'random_forest',
+    n_iter: int = 100,
+    cv_folds: int = 5,
+    select_k: Optional[int] = None,
+    strategy: str = 'halving',
+    eta: int = 3,
+    test_size: float = 0.2,
+    candidates: Optional[List[str]] = None,
+    budget: Optional[InferenceBudget] = None,
+    data_dir: Optional[Path] = None,
+    seed: int = 42
+) -> List[Stage]:
+    """
+    Stages from the raw workbook to the exported classification model
+
+    ``candidates`` (estimators and ensembles) are each searched in their
+    own stage, so adding one to the comparison reruns only its search; the
+    default compares ``estimator`` alone. ``data_dir`` holds the fold data
+    the search workers share.
+    """
+    candidates = candidates or [estimator]
+    unknown = [name for name in candidates if name not in ESTIMATORS + list(ENSEMBLES)]
+    if unknown:
+        raise ValueError(f"Unknown candidate(s) {unknown}; choose from {ESTIMATORS + list(ENSEMBLES)}")
+    estimators = [name for name in candidates if name in ESTIMATORS]
+    ensembles = [name for name in candidates if name in ENSEMBLES]
+    if ensembles and len(estimators) < 2:
+        raise ValueError(f"Ensembles {ensembles} need at least two estimators among the candidates")
+    budget = (budget or InferenceBudget.from_config()).to_dict()
+
+    searches = [
+        Stage(f'classification_search_{name}', search, inputs=('classification_resample',),
+              params={'estimator': name, 'n_iter': n_iter, 'cv_folds': cv_folds,
+                      'select_k': select_k, 'strategy': strategy, 'eta': eta, 'seed': seed,
+                      'data_dir': data_dir})
+        for name in estimators
+    ]
+    return [
+        Stage('load', load_raw, params={'path': Path(raw_path)}),
+        Stage('clean', clean_dataset, inputs=('load',)),
+        Stage('classification_features', build_features, inputs=('clean',)),
+        Stage('classification_split', split_and_scale, inputs=('classification_features',),
+              params={'test_size': test_size, 'seed': seed}),
+        Stage('classification_resample', resample, inputs=('classification_split',),
+              params={'k_neighbors': 3, 'seed': seed}),
+        *searches,
+        Stage('classification_select', select_model,
+              inputs=('classification_split', 'classification_resample', *(stage.name for stage in searches)),
+              params={'ensembles': ensembles, 'cv_folds': cv_folds, 'budget': budget, 'seed': seed}),
+        Stage('classification_export', export, inputs=('classification_split', 'classification_select'),
+              params={'out_dir': Path(out_dir), 'budget': budget}, cache=False),
+    ]
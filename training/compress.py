@@ -0,0 +1,184 @@
+"""
+Forest Compression (smallest sub-forest and depth cap within an accuracy tolerance)
+
+Packs the published forest into a ``CompactForest`` (float32 thresholds and
+leaf values, training-only node arrays dropped), searching for the fewest
+trees and the shallowest depth cap whose held-out accuracy stays within the
+tolerance of the full forest's. The compact model is written next to the
+full one, which incremental updates keep growing.
+"""
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.metrics import accuracy_score
+
+from config import config
+from models.compact_forest import CompactForest
+from training import classification
+from training.data import clean_dataset
+from training.incremental import _atomic_dump, _atomic_write_json, _load_classification
+from training.selection import InferenceProfile, profile_inference
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CompressionResult:
+    n_trees: int
+    max_depth: int
+    tolerance: float
+    accuracy_before: float
+    accuracy_after: float
+    agreement: float  # share of held-out rows where both models predict the same class
+    before: Dict[str, Any]
+    after: Dict[str, Any]
+    before_profile: InferenceProfile
+    after_profile: InferenceProfile
+    candidates: List[Dict[str, Any]] = field(default_factory=list)
+    published: bool = False
+    elapsed_s: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'n_trees': self.n_trees,
+            'max_depth': self.max_depth,
+            'tolerance': self.tolerance,
+            'accuracy_before': self.accuracy_before,
+            'accuracy_after': self.accuracy_after,
+            'agreement': self.agreement,
+            'before': {**self.before, **self.before_profile.to_dict()},
+            'after': {**self.after, **self.after_profile.to_dict()},
+        }
+
+
+# ============================================================
+# SEARCH
+# ============================================================
+def search_compression(
+    forest: Any,
+    X: np.ndarray,
+    y: np.ndarray,
+    tolerance: float,
+    min_trees: int = 10
+) -> Tuple[int, int, List[Dict[str, Any]]]:
+    """
+    Fewest-node (tree count, depth cap) whose accuracy on ``X, y`` is within ``tolerance``
+
+    Every depth cap is scored for all tree counts at once from cumulative
+    per-tree probabilities. A tree count qualifies only if every larger
+    count at that depth also stays within tolerance, so a prefix that
+    scores well by chance on a small held-out set is not picked.
+
+    Returns:
+        (n_trees, max_depth, the best candidate per depth cap)
+    """
+    reference = float(accuracy_score(y, forest.predict(X)))
+    full = CompactForest.from_forest(forest)
+    n_trees = full.n_trees
+    counts = np.arange(1, n_trees + 1)
+
+    table = []
+    for depth in range(1, full.max_depth + 1):
+        compact = CompactForest.from_forest(forest, max_depth=depth)
+        votes = np.cumsum(compact.tree_proba(X), axis=1, dtype=np.float64)
+        accuracy = (compact.classes_[votes.argmax(axis=2)] == np.asarray(y)[:, None]).mean(axis=0)
+        within = accuracy >= reference - tolerance
+        # Largest prefix length below which some count fails, so all counts from ``k`` onward pass
+        failing = counts[~within]
+        k = max(min_trees, int(failing.max()) + 1 if len(failing) else 1)
+        if k > n_trees:
+            continue
+        nodes = int(compact.roots[k]) if k < n_trees else compact.n_nodes
+        table.append({'max_depth': depth, 'n_trees': k, 'n_nodes': nodes, 'accuracy': float(accuracy[k - 1])})
+
+    if not table:
+        return n_trees, full.max_depth, table
+    best = min(table, key=lambda row: (row['n_nodes'], row['n_trees'] * row['max_depth']))
+    return best['n_trees'], best['max_depth'], table
+
+
+def _holdout(
+    raw: pd.DataFrame, current: Dict[str, Any], test_size: float, seed: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """The published model's test split (as recorded in model_info.json), scaled with its scaler"""
+    features = classification.build_features(clean_dataset(raw))
+    _, test_rows = classification.recorded_split(features, current['info'], test_size, seed)
+    scaler, label_encoder = current['scaler'], current['label_encoder']
+    columns = list(scaler.feature_names_in_)
+    X = scaler.transform(features['X'].loc[test_rows, columns])
+    return X, label_encoder.transform(features['y'].loc[test_rows])
+
+
+def compress_classification(
+    raw: pd.DataFrame,
+    models_dir: Path,
+    out_dir: Path,
+    tolerance: float = 0.01,
+    min_trees: int = 10,
+    test_size: float = 0.2,
+    publish: bool = True,
+    seed: int = 42
+) -> CompressionResult:
+    """Compress the published forest and write ``model_compact.joblib`` with a before/after report"""
+    began = time.perf_counter()
+    current = _load_classification(models_dir)
+    forest = current['model']
+    if not isinstance(forest, (RandomForestClassifier, ExtraTreesClassifier)):
+        raise ValueError(f"Compression needs a RandomForest/ExtraTrees model, not {type(forest).__name__}")
+    X, y = _holdout(raw, current, test_size, seed)
+
+    n_trees, max_depth, table = search_compression(forest, X, y, tolerance, min_trees)
+    compact = CompactForest.from_forest(forest, n_trees=n_trees, max_depth=max_depth)
+    full_pred = forest.predict(X)
+    compact_pred = compact.predict(X)
+
+    result = CompressionResult(
+        n_trees=n_trees,
+        max_depth=max_depth,
+        tolerance=tolerance,
+        accuracy_before=float(accuracy_score(y, full_pred)),
+        accuracy_after=float(accuracy_score(y, compact_pred)),
+        agreement=float((full_pred == compact_pred).mean()),
+        before=_forest_summary(forest),
+        after=compact.summary(),
+        before_profile=profile_inference(forest, X, path=Path(models_dir) / "classification" / "model.joblib"),
+        after_profile=profile_inference(compact, X),
+        candidates=table,
+    )
+    logger.info(f"🗜️ Compressed {len(forest.estimators_)} trees → {n_trees} trees, depth ≤ {max_depth}: "
+                f"accuracy {result.accuracy_before:.4f} → {result.accuracy_after:.4f}, "
+                f"{result.before_profile.size_mb:.2f} → {result.after_profile.size_mb:.2f} MB")
+
+    if publish:
+        out_path = Path(out_dir) / "classification" / config.CLASSIFICATION_COMPACT_MODEL_FILE
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_dump(compact, out_path)
+        info = dict(current['info'])
+        # The loader only uses the compact model while model_info's timestamp still matches
+        info['compression'] = {
+            'artifact': out_path.name,
+            'source_timestamp': info.get('timestamp'),
+            'at': datetime.now().isoformat(),
+            **result.to_dict(),
+        }
+        _atomic_write_json(info, Path(out_dir) / "classification" / "model_info.json")
+        result.published = True
+        logger.info(f"💾 Compact classification model written to {out_path}")
+    result.elapsed_s = time.perf_counter() - began
+    return result
+
+
+def _forest_summary(forest: Any) -> Dict[str, Any]:
+    trees = [estimator.tree_ for estimator in forest.estimators_]
+    return {
+        'n_trees': len(trees),
+        'max_depth': max(tree.max_depth for tree in trees),
+        'n_nodes': int(sum(tree.node_count for tree in trees)),
+    }
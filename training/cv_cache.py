@@ -0,0 +1,145 @@
+"""
+Cross-validation Fold Cache (one fit per estimator, data and fold)
+"""
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+import joblib
+import numpy as np
+from sklearn.base import clone, is_classifier
+from sklearn.metrics import accuracy_score, f1_score, mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import check_cv
+
+logger = logging.getLogger(__name__)
+
+Folds = Sequence[Tuple[np.ndarray, np.ndarray]]
+
+# Prediction-based scorers, computed from cached out-of-fold predictions
+SCORERS: Dict[str, Callable[[np.ndarray, np.ndarray], float]] = {
+    "r2": r2_score,
+    "neg_mean_squared_error": lambda y, p: -mean_squared_error(y, p),
+    "neg_root_mean_squared_error": lambda y, p: -np.sqrt(mean_squared_error(y, p)),
+    "neg_mean_absolute_error": lambda y, p: -mean_absolute_error(y, p),
+    "accuracy": accuracy_score,
+    "f1_weighted": lambda y, p: f1_score(y, p, average="weighted"),
+}
+
+
+@dataclass
+class FoldResult:
+    model: Any
+    test_index: np.ndarray
+    predictions: np.ndarray
+
+
+def _values(data: Any) -> np.ndarray:
+    return data.to_numpy() if hasattr(data, "to_numpy") else np.asarray(data)
+
+
+def _rows(data: Any, index: np.ndarray) -> Any:
+    return data.iloc[index] if hasattr(data, "iloc") else data[index]
+
+
+class FoldCache:
+    """
+    Memoized fold fits keyed on (estimator params, data, fold indices)
+
+    ``cross_val_score`` and ``cross_val_predict`` share entries, so scoring
+    and predicting the same estimator on the same folds fits each fold once,
+    and a later call with an identical configuration (e.g. the tuned model
+    re-evaluated for ensembling) costs nothing. Estimators are assumed to be
+    deterministic given their parameters (fix ``random_state``).
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], FoldResult]" = OrderedDict()
+        self._data_keys: Dict[Tuple[int, int], Tuple[Any, Any, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------
+    @staticmethod
+    def estimator_key(estimator: Any) -> str:
+        return joblib.hash((type(estimator).__qualname__, clone(estimator).get_params(deep=True)))
+
+    def data_key(self, X: Any, y: Any) -> str:
+        # Hash once per (X, y) pair; the objects are held so their ids stay unique
+        cached = self._data_keys.get((id(X), id(y)))
+        if cached is not None and cached[0] is X and cached[1] is y:
+            return cached[2]
+        key = joblib.hash((_values(X), _values(y), getattr(X, "columns", None)))
+        self._data_keys[(id(X), id(y))] = (X, y, key)
+        return key
+
+    def folds(self, cv: Any, X: Any, y: Any, estimator: Any) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Materialize ``cv`` (int, splitter or explicit folds) as index pairs"""
+        if isinstance(cv, (list, tuple)):
+            return [(np.asarray(train), np.asarray(test)) for train, test in cv]
+        splitter = check_cv(cv, y, classifier=is_classifier(estimator))
+        return list(splitter.split(X, y))
+
+    # ------------------------------------------------------------
+    # Fits
+    # ------------------------------------------------------------
+    def fold_results(self, estimator: Any, X: Any, y: Any, cv: Any = 5) -> List[FoldResult]:
+        """Fitted model and test-fold predictions for every fold"""
+        est_key, data_key = self.estimator_key(estimator), self.data_key(X, y)
+        results = []
+        for train, test in self.folds(cv, X, y, estimator):
+            key = (est_key, data_key, joblib.hash((train, test)))
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                model = clone(estimator).fit(_rows(X, train), _rows(y, train))
+                result = FoldResult(model, test, np.asarray(model.predict(_rows(X, test))))
+                self._entries[key] = result
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            results.append(result)
+        return results
+
+    def cross_val_score(self, estimator: Any, X: Any, y: Any, cv: Any = 5, scoring: str = "r2") -> np.ndarray:
+        """Per-fold scores, like ``sklearn.model_selection.cross_val_score``"""
+        score = SCORERS[scoring]
+        y_values = _values(y)
+        return np.array([
+            score(y_values[fold.test_index], fold.predictions)
+            for fold in self.fold_results(estimator, X, y, cv)
+        ])
+
+    def cross_val_predict(self, estimator: Any, X: Any, y: Any, cv: Any = 5) -> np.ndarray:
+        """Out-of-fold predictions, like ``sklearn.model_selection.cross_val_predict``"""
+        results = self.fold_results(estimator, X, y, cv)
+        covered = np.sort(np.concatenate([fold.test_index for fold in results]))
+        if not np.array_equal(covered, np.arange(len(_values(y)))):
+            raise ValueError("cross_val_predict needs folds that partition the rows exactly once")
+        predictions = np.empty(len(covered), dtype=results[0].predictions.dtype)
+        for fold in results:
+            predictions[fold.test_index] = fold.predictions
+        return predictions
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "fits": self.misses,
+            "reused": self.hits,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._data_keys.clear()
+        self.hits = self.misses = 0
+
+
+# Process-wide instance shared by all training stages
+fold_cache = FoldCache()
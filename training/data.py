@@ -0,0 +1,137 @@
+"""
+Dataset Cleaning (SOIL_HACKATHON_DATA_PROCESSING.ipynb)
+"""
+import logging
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# ============================================================
+# COLUMN GROUPS
+# ============================================================
+CATEGORICAL_COLUMNS = [
+    'Country_Name', 'Political_System_Type', 'Economic_Classification',
+    'Language_Diversity_Level', 'Regulation_Strictness', 'Happiness_Index',
+    'Space_Tech_Level', 'Nuclear_Power_Status',
+]
+NOMINAL_COLUMNS = ['Political_System_Type', 'Economic_Classification', 'Language_Diversity_Level']
+
+ORDINAL_MAPS = {
+    'Regulation_Strictness': {'Very Low': 1, 'Low': 2, 'Medium': 3, 'High': 4, 'Very High': 5},
+    'Happiness_Index': {'Unhappy': 1, 'Neutral': 2, 'Happy': 3, 'Very Happy': 4},
+    'Space_Tech_Level': {'Beginner': 1, 'Intermediate': 2, 'Advanced': 3, 'Elite': 4},
+}
+
+# Stored as fractions in some rows and as percentages in others
+PERCENTAGE_COLUMNS = [
+    'Literacy_Rate_pct', 'Internet_Access_pct', 'Higher_Education_Rate', 'Gender_Equality_Index',
+    'Migration_Rate', 'Immigration_Rate', 'Defence_expenditure_on_GDP',
+    'Govt_Education_Expenditure_pct_GDP', 'R_and_D_Expenditure_pct_GDP', 'Health_Expenditure_pct_GDP',
+]
+BOUNDED_PERCENTAGE_COLUMNS = [
+    'Literacy_Rate_pct', 'Internet_Access_pct', 'Higher_Education_Rate',
+    'Govt_Education_Expenditure_pct_GDP', 'Health_Expenditure_pct_GDP', 'R_and_D_Expenditure_pct_GDP',
+    'Migration_Rate', 'Immigration_Rate', 'Defence_expenditure_on_GDP',
+]
+NON_NEGATIVE_COLUMNS = ['HDI_Index', 'Gender_Equality_Index']
+HEAVY_TAILED_COLUMNS = [
+    'Population', 'GDP_per_Capita_USD', 'Carbon_Footprint',
+    'Number_of_Patents', 'Olympic_Medals_Count', 'Number_of_Startups',
+]
+LOG_COLUMNS = ['Population', 'GDP_per_Capita_USD', 'Olympic_Medals_Count', 'Carbon_Footprint']
+
+# Imputation, in notebook order
+MEDIAN_IMPUTED = [
+    'Literacy_Rate_pct', 'Internet_Access_pct', 'Higher_Education_Rate',
+    'Govt_Education_Expenditure_pct_GDP', 'Unemployment_Rate_pct',
+    'R_and_D_Expenditure_pct_GDP', 'Number_of_Patents', 'Carbon_Footprint',
+    'Medical_Doctors_per_1000',
+]
+MODE_IMPUTED = ['Regulation_Strictness_Ordinal', 'Happiness_Index_Ordinal', 'Nuclear_Power_Status']
+LATE_MEDIAN_IMPUTED = ['Population', 'GDP_per_Capita_USD', 'Migration_Rate', 'Immigration_Rate']
+
+
+def load_raw(path: Union[str, Path]) -> pd.DataFrame:
+    """Read the raw hackathon workbook (or a CSV export of it)"""
+    path = Path(path)
+    if path.suffix.lower() == '.csv':
+        # Exact floats, so a dataset written by --update cleans to the same rows when read back
+        return pd.read_csv(path, float_precision='round_trip')
+    return pd.read_excel(path)
+
+
+def row_keys(X: pd.DataFrame) -> pd.Series:
+    """Content hash of each cleaned row, which identifies training rows across datasets"""
+    return pd.util.hash_pandas_object(X.astype(np.float64), index=False)
+
+
+def _iqr_cap(series: pd.Series) -> pd.Series:
+    """Cap values at Q3 + 1.5*IQR (upper outliers only)"""
+    q1, q3 = series.quantile(0.25), series.quantile(0.75)
+    return series.clip(upper=q3 + 1.5 * (q3 - q1))
+
+
+def _present(df: pd.DataFrame, columns):
+    return [col for col in columns if col in df.columns]
+
+
+def clean_dataset(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Turn the raw dataset into the model-ready table
+
+    Type correction, ordinal/binary encoding, percentage harmonization,
+    outlier capping, domain bounds, imputation, log features and one-hot
+    encoding, exactly as the data-processing notebook applies them.
+    """
+    df = df.copy()
+
+    # Type correction
+    for col in df.columns:
+        if col not in CATEGORICAL_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    # Binary and ordinal encoding
+    df['Nuclear_Power_Status'] = df['Nuclear_Power_Status'].str.strip().map({'No': 0, 'Yes': 1})
+    for col, mapping in ORDINAL_MAPS.items():
+        df[f'{col}_Ordinal'] = df[col].str.strip().map(mapping)
+
+    # Percentages on a 0-100 scale
+    for col in _present(df, PERCENTAGE_COLUMNS):
+        df[col] = np.where(df[col].notna() & (df[col] <= 1), df[col] * 100, df[col])
+
+    for col in _present(df, HEAVY_TAILED_COLUMNS):
+        df[col] = _iqr_cap(df[col])
+
+    # Domain bounds
+    for col in _present(df, BOUNDED_PERCENTAGE_COLUMNS):
+        df[col] = df[col].clip(lower=0, upper=100)
+    for col in _present(df, NON_NEGATIVE_COLUMNS):
+        df[col] = df[col].clip(lower=0)
+
+    # Imputation
+    for col in _present(df, MEDIAN_IMPUTED):
+        df[col] = df[col].fillna(df[col].median())
+    for col in _present(df, MODE_IMPUTED):
+        df[col] = df[col].fillna(df[col].mode()[0])
+    for col in _present(df, NOMINAL_COLUMNS):
+        df[col] = df[col].fillna('Unknown')
+    for col in _present(df, LATE_MEDIAN_IMPUTED):
+        df[col] = df[col].fillna(df[col].median())
+
+    for col in _present(df, LOG_COLUMNS):
+        df[f'{col}_log'] = np.log1p(df[col])
+
+    # Ordinal text is encoded above; nominal columns become dummies
+    df = df.drop(columns=_present(df, ORDINAL_MAPS))
+    df = pd.get_dummies(df, columns=_present(df, NOMINAL_COLUMNS), drop_first=True)
+    df = df.drop(columns=_present(df, ['Country_Name']))
+
+    remaining = int(df.isnull().sum().sum())
+    if remaining:
+        logger.warning(f"⚠️ {remaining} missing values remain after cleaning")
+    logger.info(f"🧹 Cleaned dataset: {df.shape[0]} rows × {df.shape[1]} columns")
+    return df
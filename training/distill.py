@@ -0,0 +1,264 @@
+"""
+Surrogate Distillation for the Live Preview
+
+The production models are scored on dense synthetic inputs drawn from
+``config.FEATURE_RANGES`` (every other input held at the dataset median)
+through the app's own Predictor, and small surrogates are fitted to their
+answers: a shallow histogram GBM and an additive piecewise-linear model.
+The fastest one within a fidelity tolerance of the most faithful is
+written next to the production artifact as ``surrogate.joblib``, with its
+fidelity measured on held-out synthetic inputs and on the real dataset
+rows. A surrogate that is not at least ``min_speedup`` times faster than
+the production model per row is not shipped.
+"""
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier, HistGradientBoostingRegressor
+from sklearn.linear_model import LogisticRegression, Ridge
+from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import SplineTransformer
+
+from config import config
+from models.feature_engineering import FeatureEngineer
+from models.model_loader import ModelLoader
+from models.predictor import Predictor
+from models.surrogate import PiecewiseLinear, model_fingerprint
+from training.data import clean_dataset
+from training.incremental import _atomic_dump, _atomic_write_json
+from training.selection import profile_inference
+
+logger = logging.getLogger(__name__)
+
+TASKS = ('classification', 'regression')
+CANDIDATES = ('gbm', 'piecewise_linear')
+# Task outputs that are never inputs of that task's model
+_TARGETS = {'classification': set(), 'regression': {'HDI_Index'}}
+# Fidelity a faster candidate may give up against the most faithful: agreement points, or HDI MAE
+FIDELITY_TOLERANCE = {'classification': 0.02, 'regression': 0.005}
+
+
+def make_surrogate(name: str, task: str, seed: int) -> Any:
+    """Unfitted surrogate ``name`` for ``task``"""
+    if name == 'gbm':
+        if task == 'classification':
+            return HistGradientBoostingClassifier(max_depth=4, max_iter=400, random_state=seed)
+        return HistGradientBoostingRegressor(max_depth=3, max_iter=300, random_state=seed)
+    if name == 'piecewise_linear':
+        # Degree-1 splines: one linear interpolation table per input, summed (see ``tabulate``)
+        splines = SplineTransformer(n_knots=10, degree=1)
+        if task == 'classification':
+            return make_pipeline(splines, LogisticRegression(max_iter=2000))
+        return make_pipeline(splines, Ridge(alpha=1e-3))
+    raise ValueError(f"Unknown surrogate '{name}'; choose from {CANDIDATES}")
+
+
+@dataclass
+class DistillResult:
+    task: str
+    selected: Optional[str]  # None when no candidate is fast and faithful enough
+    features: List[str]
+    fidelity: Dict[str, Dict[str, Any]]  # candidate → metrics
+    published: bool = False
+    elapsed_s: float = 0.0
+    details: Dict[str, Any] = field(default_factory=dict)
+
+
+def tabulate(pipeline: Any) -> PiecewiseLinear:
+    """
+    Exact numpy lookup tables of a fitted degree-1 spline → linear model pipeline
+
+    Each input's basis functions are hat functions on its knots, so its
+    contribution is linear between knots and constant beyond them (the
+    spline's constant extrapolation), as ``np.interp`` evaluates it.
+    """
+    splines, linear = pipeline[0], pipeline[-1]
+    coef = np.atleast_2d(linear.coef_)
+    intercept = np.atleast_1d(linear.intercept_).astype(np.float64)
+    classes = getattr(linear, 'classes_', None)
+    if classes is not None and len(classes) == 2:
+        # Binary logistic scores only the second class; score the first at zero
+        coef = np.vstack([np.zeros_like(coef), coef])
+        intercept = np.array([0.0, intercept[0]])
+
+    per_feature = splines.n_features_out_ // splines.n_features_in_
+    knots, values = [], []
+    for j, spline in enumerate(splines.bsplines_):
+        grid = spline.t[spline.k:-spline.k]
+        X = np.tile(grid[:1], (len(grid), splines.n_features_in_))
+        X[:, j] = grid
+        basis = splines.transform(X)[:, j * per_feature:(j + 1) * per_feature]
+        knots.append(grid)
+        values.append(basis @ coef[:, j * per_feature:(j + 1) * per_feature].T)
+    return PiecewiseLinear(knots, values, intercept, classes)
+
+
+# ============================================================
+# TEACHER
+# ============================================================
+def sample_inputs(features: List[str], medians: pd.Series, n_samples: int, seed: int) -> pd.DataFrame:
+    """Uniform samples over ``FEATURE_RANGES`` for ``features``; every other input at its median"""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(np.repeat(medians.to_numpy()[None, :], n_samples, axis=0), columns=medians.index)
+    for name in features:
+        bounds = config.FEATURE_RANGES[name]
+        frame[name] = rng.uniform(bounds['min'], bounds['max'], n_samples)
+    return frame
+
+
+def teacher_outputs(predictor: Predictor, inputs: pd.DataFrame, chunk_rows: int = 5000) -> np.ndarray:
+    """Production answers, through the same feature engineering the app applies"""
+    values = []
+    for start in range(0, len(inputs), chunk_rows):
+        values.extend(result.value for result in predictor.predict_batch(inputs.iloc[start:start + chunk_rows]))
+    return np.asarray(values)
+
+
+def fidelity(task: str, teacher: np.ndarray, student: np.ndarray) -> Dict[str, float]:
+    """How closely the surrogate reproduces the production answers"""
+    if task == 'classification':
+        return {
+            'agreement': float((teacher == student).mean()),
+            'within_one_level': float((np.abs(teacher - student) <= 1).mean()),
+        }
+    bounds = sorted(low for low, _ in config.HDI_THRESHOLDS.values() if low > 0)
+    return {
+        'r2': float(r2_score(teacher, student)),
+        'mae': float(mean_absolute_error(teacher, student)),
+        'max_abs_error': float(np.abs(teacher - student).max()),
+        'category_agreement': float((np.digitize(teacher, bounds) == np.digitize(student, bounds)).mean()),
+    }
+
+
+# ============================================================
+# DISTILLATION
+# ============================================================
+def distill(
+    task: str,
+    raw: pd.DataFrame,
+    models_dir: Path,
+    out_dir: Path,
+    n_samples: int = 20000,
+    holdout: float = 0.2,
+    candidates: Optional[List[str]] = None,
+    tolerance: Optional[float] = None,
+    min_speedup: float = 5.0,
+    publish: bool = True,
+    seed: int = 42
+) -> DistillResult:
+    """Fit every candidate surrogate of the ``task`` model and ship the fastest sufficiently faithful one"""
+    began = time.perf_counter()
+    loader = ModelLoader(Path(models_dir))
+    loaded = loader.load_classification_model() if task == 'classification' else loader.load_regression_model()
+    predictor = Predictor(loaded, task)
+
+    dataset = clean_dataset(raw).select_dtypes(include=np.number)
+    medians = dataset.median()
+    features = [name for name in config.FEATURE_RANGES if name in medians.index and name not in _TARGETS[task]]
+    inputs = sample_inputs(features, medians, n_samples, seed)
+    y = teacher_outputs(predictor, inputs)
+    X = inputs[features].to_numpy()
+    n_fit = int(len(X) * (1 - holdout))
+    # Real rows also test what the surrogate cannot see: inputs outside FEATURE_RANGES
+    real_y = teacher_outputs(predictor, dataset)
+    real_X = dataset[features].to_numpy()
+    logger.info(f"🎓 {task}: {n_samples} synthetic inputs over {len(features)} features, labelled by the model")
+    teacher_profile = profile_inference(loaded.model, _model_rows(loaded, task, inputs.iloc[n_fit:n_fit + 200]))
+
+    reports, fitted = {}, {}
+    for name in candidates or CANDIDATES:
+        model = make_surrogate(name, task, seed).fit(X[:n_fit], y[:n_fit])
+        if name == 'piecewise_linear':
+            model = tabulate(model)
+        profile = profile_inference(model, X[n_fit:n_fit + 200])
+        reports[name] = {
+            'synthetic': fidelity(task, y[n_fit:], model.predict(X[n_fit:])),
+            'dataset': fidelity(task, real_y, model.predict(real_X)),
+            'single_p50_ms': round(profile.single_p50_ms, 3),
+            'size_mb': round(profile.size_mb, 3),
+        }
+        fitted[name] = model
+        logger.info(f"🧪 {name}: {reports[name]['synthetic']}, {profile.single_p50_ms:.2f} ms/row")
+
+    selected = select_surrogate(
+        task, reports, teacher_profile.single_p50_ms,
+        FIDELITY_TOLERANCE[task] if tolerance is None else tolerance, min_speedup,
+    )
+    result = DistillResult(
+        task=task, selected=selected, features=features, fidelity=reports,
+        details={'n_samples': n_samples, 'holdout': holdout, 'dataset_rows': len(dataset),
+                 'teacher_single_p50_ms': round(teacher_profile.single_p50_ms, 3), 'min_speedup': min_speedup},
+    )
+    if selected is None:
+        logger.warning(f"⚠️ No {task} surrogate is {min_speedup:g}× faster than the model within tolerance; "
+                       f"not shipping one")
+        stale = Path(out_dir) / task / config.SURROGATE_MODEL_FILE
+        if publish and stale.exists():
+            # A previously shipped surrogate of this model would still be picked up by the loader
+            stale.unlink()
+            logger.info(f"🗑️ Removed the previous {task} surrogate")
+
+    if publish and selected is not None:
+        out = Path(out_dir) / task
+        out.mkdir(parents=True, exist_ok=True)
+        report = {
+            'task': task,
+            'selected': selected,
+            'features': features,
+            'source': model_fingerprint(Path(models_dir) / task, task),
+            'created_at': datetime.now().isoformat(),
+            'candidates': reports,
+            **result.details,
+        }
+        package = {
+            'model': fitted[selected],
+            'task': task,
+            'features': features,
+            # Inputs the preview has not collected fall back to the form defaults
+            'defaults': {name: config.FEATURE_RANGES[name]['default'] for name in features},
+            'source': report['source'],
+            'fidelity': reports[selected],
+        }
+        _atomic_dump(package, out / config.SURROGATE_MODEL_FILE)
+        _atomic_write_json(report, out / "surrogate_report.json")
+        result.published = True
+        logger.info(f"💾 {task} surrogate ({selected}) written to {out}")
+    result.elapsed_s = time.perf_counter() - began
+    return result
+
+
+def select_surrogate(
+    task: str,
+    reports: Dict[str, Dict[str, Any]],
+    teacher_ms: float,
+    tolerance: float,
+    min_speedup: float
+) -> Optional[str]:
+    """
+    Fastest candidate within ``tolerance`` of the most faithful one on held-out synthetic inputs
+
+    Fidelity is agreement for levels and MAE for HDI. Candidates less than
+    ``min_speedup`` times faster per row than the production model are
+    never selected, so None means nothing is worth shipping.
+    """
+    if task == 'classification':
+        best = max(report['synthetic']['agreement'] for report in reports.values())
+        faithful = [name for name, report in reports.items() if report['synthetic']['agreement'] >= best - tolerance]
+    else:
+        best = min(report['synthetic']['mae'] for report in reports.values())
+        faithful = [name for name, report in reports.items() if report['synthetic']['mae'] <= best + tolerance]
+    fast = [name for name in faithful if reports[name]['single_p50_ms'] * min_speedup <= teacher_ms]
+    return min(fast, key=lambda name: reports[name]['single_p50_ms']) if fast else None
+
+
+def _model_rows(loaded: Any, task: str, inputs: pd.DataFrame) -> Any:
+    """Model-ready rows (engineered, scaled) for timing the production model itself"""
+    X = FeatureEngineer.prepare_batch(inputs, loaded.feature_names, task)
+    return loaded.scaler.transform(X) if loaded.scaler is not None else X
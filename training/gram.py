@@ -0,0 +1,132 @@
+"""
+Sufficient Statistics for Linear Members (Ridge / BayesianRidge without refits)
+"""
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+from sklearn.linear_model import BayesianRidge, Ridge
+
+
+@dataclass
+class LinearMoments:
+    """
+    Additive sufficient statistics of least squares
+
+    Count-weighted sums over the rows: Σc, Σc·x, Σc·y, Σc·y², Σc·xxᵀ and
+    Σc·xy, with a leading batch axis (one entry per row of ``counts``).
+    Adding rows adds their moments and removing rows subtracts them, so a
+    fit can be updated without the rows it was trained on.
+    """
+    n: np.ndarray
+    x_sum: np.ndarray
+    y_sum: np.ndarray
+    yy_sum: np.ndarray
+    xx: np.ndarray
+    xy: np.ndarray
+
+    @classmethod
+    def of(cls, X: np.ndarray, y: np.ndarray, counts: Optional[np.ndarray] = None) -> "LinearMoments":
+        X, y = np.asarray(X, dtype=np.float64), np.asarray(y, dtype=np.float64)
+        n_rows, n_features = X.shape
+        counts = np.ones((1, n_rows)) if counts is None else np.atleast_2d(counts).astype(np.float64)
+        outer = np.einsum("ni,nj->nij", X, X).reshape(n_rows, -1)
+        return cls(
+            n=counts.sum(axis=1),
+            x_sum=counts @ X,
+            y_sum=counts @ y,
+            yy_sum=counts @ (y ** 2),
+            xx=(counts @ outer).reshape(-1, n_features, n_features),
+            xy=counts @ (X * y[:, None]),
+        )
+
+    def __add__(self, other: "LinearMoments") -> "LinearMoments":
+        return LinearMoments(**{name: value + getattr(other, name) for name, value in asdict(self).items()})
+
+    def __sub__(self, other: "LinearMoments") -> "LinearMoments":
+        return LinearMoments(**{name: value - getattr(other, name) for name, value in asdict(self).items()})
+
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        """Plain arrays, so packages loaded by the app need no training code"""
+        return asdict(self)
+
+
+class GramStatistics:
+    """
+    Centered Gram system of each batch entry, optionally in a rescaled space
+
+    ``scale`` is a per-entry, per-feature divisor (e.g. a RobustScaler's
+    scale fitted on that entry's rows). Centering absorbs the scaler's
+    offset, so members behind an impute → scale pipeline get exactly the
+    coefficients a refit would, from p×p systems.
+    """
+
+    def __init__(self, moments: LinearMoments, scale: Optional[np.ndarray] = None):
+        self.n = moments.n
+        self.x_mean = moments.x_sum / self.n[:, None]
+        self.y_mean = moments.y_sum / self.n
+        self.y_var = moments.yy_sum / self.n - self.y_mean ** 2
+        self.scale = np.ones_like(self.x_mean) if scale is None else np.broadcast_to(scale, self.x_mean.shape)
+
+        gram = moments.xx - self.n[:, None, None] * np.einsum("ri,rj->rij", self.x_mean, self.x_mean)
+        cross = moments.xy - self.n[:, None] * self.x_mean * self.y_mean[:, None]
+        self.gram = gram / np.einsum("ri,rj->rij", self.scale, self.scale)
+        self.cross = cross / self.scale
+        self.yy = self.n * self.y_var
+
+    def intercept(self, coef: np.ndarray) -> np.ndarray:
+        """Intercept for unscaled inputs, given scaled-space coefficients"""
+        return self.y_mean - np.sum(coef / self.scale * self.x_mean, axis=1)
+
+    def predict(self, coef: np.ndarray, X: np.ndarray) -> np.ndarray:
+        """Predictions (batch × row) on unscaled ``X``"""
+        return self.intercept(coef)[:, None] + (coef / self.scale) @ np.asarray(X, dtype=np.float64).T
+
+    def ridge(self, model: Ridge) -> np.ndarray:
+        eye = np.eye(self.gram.shape[1])
+        return np.linalg.solve(self.gram + model.alpha * eye, self.cross[..., None])[..., 0]
+
+    def bayesian_ridge(self, model: BayesianRidge) -> Dict[str, np.ndarray]:
+        """
+        BayesianRidge's evidence maximization (MacKay updates), all entries at once
+
+        Returns ``coef``, ``alpha``, ``lambda`` and the posterior covariance
+        ``sigma``, mirroring the fitted attributes.
+        """
+        eigen_vals, vectors = np.linalg.eigh(self.gram)
+        projected = np.einsum("rji,rj->ri", vectors, self.cross)
+
+        def update(alpha, lambda_):
+            coef = np.einsum("rij,rj->ri", vectors, projected / (eigen_vals + (lambda_ / alpha)[:, None]))
+            sse = self.yy - 2 * np.sum(coef * self.cross, axis=1) + np.einsum("ri,rij,rj->r", coef, self.gram, coef)
+            return coef, sse
+
+        eps = np.finfo(np.float64).eps
+        alpha = 1.0 / (self.y_var + eps) if model.alpha_init is None else np.full(len(self.n), model.alpha_init)
+        lambda_ = np.full(len(self.n), 1.0 if model.lambda_init is None else model.lambda_init)
+        done = np.zeros(len(self.n), dtype=bool)
+        coef_old = None
+        for iteration in range(model.max_iter):
+            coef, sse = update(alpha, lambda_)
+            gamma = np.sum(alpha[:, None] * eigen_vals / (lambda_[:, None] + alpha[:, None] * eigen_vals), axis=1)
+            new_lambda = (gamma + 2 * model.lambda_1) / (np.sum(coef ** 2, axis=1) + 2 * model.lambda_2)
+            new_alpha = (self.n - gamma + 2 * model.alpha_1) / (sse + 2 * model.alpha_2)
+            lambda_ = np.where(done, lambda_, new_lambda)
+            alpha = np.where(done, alpha, new_alpha)
+            if iteration:
+                done |= np.sum(np.abs(coef_old - coef), axis=1) < model.tol
+            if done.all():
+                break
+            coef_old = coef
+
+        sigma = np.einsum("rik,rk,rjk->rij", vectors, 1 / (alpha[:, None] * eigen_vals + lambda_[:, None]), vectors)
+        return {"coef": update(alpha, lambda_)[0], "alpha": alpha, "lambda": lambda_, "sigma": sigma}
+
+
+def gram_solver(model: Any) -> Optional[Callable[[GramStatistics], np.ndarray]]:
+    """Coefficient solver for ``model`` from Gram statistics, or None if it must be refit"""
+    if type(model) is Ridge and model.fit_intercept and model.solver in ("auto", "cholesky") and not model.positive:
+        return lambda stats: stats.ridge(model)
+    if type(model) is BayesianRidge and model.fit_intercept:
+        return lambda stats: stats.bayesian_ridge(model)["coef"]
+    return None
@@ -0,0 +1,506 @@
+"""
+Incremental Model Updates from New or Corrected Country Rows
+
+Updates the published models in seconds instead of rerunning the search:
+
+- classification: the StandardScaler's mean and variance are updated
+  online (corrected rows' old values removed, new values added), existing
+  trees have their split thresholds mapped onto the updated scaling, and
+  new trees are grown with ``warm_start`` on the updated training rows
+- regression: Ridge and BayesianRidge members are re-solved from the
+  package's additive sufficient statistics; ElasticNet, Lasso and Huber
+  are refit warm-started from their current coefficients; the fitted
+  imputer/RobustScaler (medians are not updatable online) and the
+  gradient-boosting member are kept
+
+A validation gate compares the candidate against the current artifacts
+out of sample before anything is written.
+"""
+import copy
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble._forest import BaseForest
+from sklearn.linear_model import BayesianRidge, ElasticNet, HuberRegressor, Lasso, Ridge
+from sklearn.metrics import accuracy_score, f1_score, r2_score
+from sklearn.model_selection import KFold
+from sklearn.preprocessing import StandardScaler
+
+from config import config
+from training import classification, regression
+from training.data import clean_dataset, row_keys
+from training.gram import GramStatistics, LinearMoments
+
+logger = logging.getLogger(__name__)
+
+KEY_COLUMN = 'Country_Name'
+
+# Members refit from their current coefficients (cheap coordinate-descent / LBFGS restarts)
+_WARM_STARTED = (ElasticNet, Lasso, HuberRegressor)
+
+
+@dataclass
+class GateResult:
+    metric: str
+    current: float
+    candidate: float
+    tolerance: float
+
+    @property
+    def passed(self) -> bool:
+        return self.candidate >= self.current - self.tolerance
+
+
+@dataclass
+class UpdateResult:
+    task: str
+    added: List[str]
+    replaced: List[str]
+    gate: GateResult
+    published: bool = False
+    elapsed_s: float = 0.0
+    details: Dict[str, Any] = field(default_factory=dict)
+
+
+# ============================================================
+# ROWS
+# ============================================================
+def merge_rows(
+    base: pd.DataFrame,
+    rows: pd.DataFrame,
+    key: str = KEY_COLUMN
+) -> Tuple[pd.DataFrame, List[int], List[int]]:
+    """
+    Apply update rows to the raw dataset
+
+    Rows whose ``key`` matches an existing country correct it: only the
+    values they provide (non-empty cells) overwrite, on every matching row.
+    Other rows are appended as new countries.
+
+    Returns:
+        (merged dataset, replaced row labels, added row labels)
+    """
+    if key not in rows.columns:
+        raise ValueError(f"Update rows need a '{key}' column")
+    unknown = sorted(set(rows.columns) - set(base.columns))
+    if unknown:
+        raise ValueError(f"Update rows have columns the dataset does not: {unknown}")
+
+    rows = rows.drop_duplicates(subset=key, keep='last')
+    merged = base.copy()
+    names = merged[key].astype(str).str.strip()
+    replaced, new_rows = [], []
+    for _, row in rows.iterrows():
+        matches = merged.index[names == str(row[key]).strip()]
+        if len(matches):
+            for column, value in row.dropna().drop(key).items():
+                merged.loc[matches, column] = value
+            replaced.extend(matches)
+        else:
+            new_rows.append(row.reindex(base.columns))
+
+    added = []
+    if new_rows:
+        start = int(merged.index.max()) + 1
+        added = list(range(start, start + len(new_rows)))
+        merged = pd.concat([merged, pd.DataFrame(new_rows, index=added)])
+    logger.info(f"🧾 Update rows: {len(added)} new, {len(replaced)} corrected")
+    return merged, replaced, added
+
+
+def _names(df: pd.DataFrame, index: List[int]) -> List[str]:
+    return sorted(set(df.loc[index, KEY_COLUMN].astype(str)))
+
+
+def _drifted(before: pd.DataFrame, after: pd.DataFrame, rows: List[int]) -> List[int]:
+    """``rows`` whose cleaned values differ between the two cleanings"""
+    same = row_keys(before.loc[rows]).to_numpy() == row_keys(after.loc[rows]).to_numpy()
+    return [row for row, unchanged in zip(rows, same) if not unchanged]
+
+
+# ============================================================
+# CLASSIFICATION
+# ============================================================
+def update_standard_scaler(
+    scaler: StandardScaler,
+    added: np.ndarray,
+    removed: Optional[np.ndarray] = None
+) -> StandardScaler:
+    """
+    Copy of ``scaler`` with rows added to / removed from its running mean and variance
+
+    Uses the pairwise (Chan et al.) combination of counts, means and sums
+    of squared deviations, run backwards for removals, so the result equals
+    a scaler fitted on the updated rows.
+    """
+    updated = copy.deepcopy(scaler)
+    n = float(scaler.n_samples_seen_)
+    mean = scaler.mean_.astype(np.float64)
+    m2 = scaler.var_.astype(np.float64) * n
+
+    def combine(rows: np.ndarray, sign: int):
+        nonlocal n, mean, m2
+        if rows is None or not len(rows):
+            return
+        k = len(rows)
+        rows_mean = rows.mean(axis=0)
+        rows_m2 = ((rows - rows_mean) ** 2).sum(axis=0)
+        total = n + sign * k
+        if sign > 0:
+            delta = rows_mean - mean
+            mean = mean + delta * k / total
+            m2 = m2 + rows_m2 + delta ** 2 * n * k / total
+        else:
+            remaining_mean = (n * mean - k * rows_mean) / total
+            delta = rows_mean - remaining_mean
+            m2 = m2 - rows_m2 - delta ** 2 * total * k / n
+            mean = remaining_mean
+        n = total
+
+    combine(removed, -1)
+    combine(added, 1)
+    seen = scaler.n_samples_seen_
+    updated.n_samples_seen_ = int(n) if np.ndim(seen) == 0 else np.full_like(seen, n)
+    updated.mean_ = mean
+    updated.var_ = np.maximum(m2 / n, 0)
+    updated.scale_ = np.where(updated.var_ > 0, np.sqrt(updated.var_), 1.0)
+    return updated
+
+
+def remap_forest_thresholds(forest: BaseForest, old: StandardScaler, new: StandardScaler) -> None:
+    """
+    Express every split threshold in the ``new`` scaling, in place
+
+    A split ``(x − μ₀)/σ₀ ≤ t`` is the same split as ``(x − μ₁)/σ₁ ≤ t'``
+    with ``t' = (t·σ₀ + μ₀ − μ₁)/σ₁``, so existing trees keep their
+    decisions in the raw feature space when the scaler changes.
+    """
+    for tree in forest.estimators_:
+        nodes = tree.tree_
+        split = nodes.feature >= 0
+        feature = nodes.feature[split]
+        raw = nodes.threshold[split] * old.scale_[feature] + old.mean_[feature]
+        nodes.threshold[split] = (raw - new.mean_[feature]) / new.scale_[feature]
+
+
+def _load_classification(models_dir: Path) -> Dict[str, Any]:
+    model_dir = Path(models_dir) / "classification"
+    info_path = model_dir / "model_info.json"
+    return {
+        'model': joblib.load(model_dir / "model.joblib"),
+        'scaler': joblib.load(model_dir / "scaler.joblib"),
+        'label_encoder': joblib.load(model_dir / "label_encoder.joblib"),
+        'info': json.loads(info_path.read_text()) if info_path.exists() else {},
+    }
+
+
+def update_classification(
+    base_raw: pd.DataFrame,
+    rows: pd.DataFrame,
+    models_dir: Path,
+    out_dir: Path,
+    extra_trees: int = 50,
+    tolerance: float = 0.01,
+    test_size: float = 0.2,
+    publish: bool = True,
+    seed: int = 42
+) -> UpdateResult:
+    """
+    Grow the published forest on new/corrected rows and publish it if it passes the gate
+
+    The gate set is the test split recorded with the model (corrected
+    values where they changed): neither model has trained on it.
+    """
+    began = time.perf_counter()
+    merged, replaced, added = merge_rows(base_raw, rows)
+    current = _load_classification(models_dir)
+    if not isinstance(current['model'], BaseForest):
+        raise ValueError(f"Incremental updates need a forest model, not {type(current['model']).__name__}; "
+                         f"run a full retrain")
+    scaler, label_encoder = current['scaler'], current['label_encoder']
+    columns = list(scaler.feature_names_in_)
+
+    base = classification.build_features(clean_dataset(base_raw))
+    updated = classification.build_features(clean_dataset(merged))
+    train_rows, test_rows = classification.recorded_split(base, current['info'], test_size, seed)
+    unknown = sorted(set(updated['y'].unique()) - set(label_encoder.classes_))
+    if unknown:
+        raise ValueError(f"Happiness levels {unknown} are unknown to the current model; run a full retrain")
+
+    # Corrected training rows leave the scaler's statistics with their old values, as do training rows
+    # that clean differently on the merged dataset (caps and medians move with it)
+    kept = [row for row in train_rows if row not in set(replaced)]
+    drifted = _drifted(base['X'][columns], updated['X'][columns], kept)
+    corrected_train = sorted(set(replaced) & set(train_rows)) + drifted
+    update_rows = corrected_train + added
+    new_scaler = update_standard_scaler(
+        scaler,
+        added=updated['X'].loc[update_rows, columns].to_numpy(dtype=np.float64),
+        removed=base['X'].loc[corrected_train, columns].to_numpy(dtype=np.float64),
+    )
+
+    candidate = copy.deepcopy(current['model'])
+    remap_forest_thresholds(candidate, scaler, new_scaler)
+    training_rows = list(train_rows) + added
+    resampled = classification.resample({
+        'X_train': new_scaler.transform(updated['X'].loc[training_rows, columns]),
+        'y_train': label_encoder.transform(updated['y'].loc[training_rows]),
+    }, k_neighbors=3, seed=seed)
+    if not np.array_equal(np.unique(resampled['y']), candidate.classes_):
+        raise ValueError("The updated training rows do not cover every class of the current model; "
+                         "run a full retrain")
+    n_trees = len(candidate.estimators_)
+    candidate.set_params(warm_start=True, n_estimators=n_trees + extra_trees)
+    candidate.fit(resampled['X'], resampled['y'])
+    candidate.set_params(warm_start=False)
+
+    holdout = updated['X'].loc[test_rows, columns]
+    y_holdout = label_encoder.transform(updated['y'].loc[test_rows])
+    current_pred = current['model'].predict(scaler.transform(holdout))
+    candidate_pred = candidate.predict(new_scaler.transform(holdout))
+    gate = GateResult('test_accuracy', float(accuracy_score(y_holdout, current_pred)),
+                      float(accuracy_score(y_holdout, candidate_pred)), tolerance)
+    result = UpdateResult(
+        task='classification', added=_names(merged, added), replaced=_names(merged, replaced), gate=gate,
+        details={'trees': [n_trees, n_trees + extra_trees], 'training_rows': len(training_rows),
+                 'test_f1_weighted': float(f1_score(y_holdout, candidate_pred, average='weighted'))},
+    )
+    _log_gate(result)
+
+    if publish and gate.passed:
+        _publish_classification(out_dir, candidate, new_scaler, label_encoder, columns, current['info'], result)
+        result.published = True
+    result.elapsed_s = time.perf_counter() - began
+    return result
+
+
+def _publish_classification(out_dir, model, scaler, label_encoder, columns, info, result: UpdateResult) -> None:
+    out_dir = Path(out_dir) / "classification"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    _atomic_dump(model, out_dir / "model.joblib")
+    _atomic_dump(scaler, out_dir / "scaler.joblib")
+    _atomic_dump(label_encoder, out_dir / "label_encoder.joblib")
+    _atomic_write_json(columns, out_dir / "feature_names.json")
+
+    info = dict(info)
+    info['timestamp'] = datetime.now().strftime('%Y%m%d_%H%M%S')
+    # A compressed forest was packed from the previous trees; the loader falls back to model.joblib
+    info.pop('compression', None)
+    info['metrics'] = {**info.get('metrics', {}), 'test_accuracy': result.gate.candidate,
+                       'test_f1_weighted': result.details['test_f1_weighted']}
+    info['updates'] = info.get('updates', []) + [_update_record(result)]
+    _atomic_write_json(info, out_dir / "model_info.json")
+    logger.info(f"💾 Updated classification model published to {out_dir}")
+
+
+# ============================================================
+# REGRESSION
+# ============================================================
+def _solve_members(model: Any, moments: LinearMoments, Z: np.ndarray, y: np.ndarray) -> Tuple[Any, Dict[str, str]]:
+    """
+    Copy of ``model`` with its updatable members solved on the training rows ``Z``, ``y``
+
+    ``moments`` are those rows' sufficient statistics. Returns the model and
+    how each member was updated.
+    """
+    stats = GramStatistics(moments)
+    candidate = copy.deepcopy(model)
+    voting = candidate[-1]
+    routes = {}
+    for name, member in zip((name for name, _ in voting.estimators), voting.estimators_):
+        if type(member) is Ridge:
+            coef = stats.ridge(member)
+            member.coef_, member.intercept_ = coef[0], float(stats.intercept(coef)[0])
+            routes[name] = 'sufficient statistics'
+        elif type(member) is BayesianRidge:
+            solution = stats.bayesian_ridge(member)
+            member.coef_, member.intercept_ = solution['coef'][0], float(stats.intercept(solution['coef'])[0])
+            member.alpha_, member.lambda_ = solution['alpha'][0], solution['lambda'][0]
+            member.sigma_ = solution['sigma'][0]
+            member.X_offset_, member.X_scale_ = stats.x_mean[0], np.ones_like(stats.x_mean[0])
+            routes[name] = 'sufficient statistics'
+        elif isinstance(member, _WARM_STARTED):
+            member.set_params(warm_start=True).fit(Z, y).set_params(warm_start=False)
+            routes[name] = 'warm start'
+        else:
+            routes[name] = 'kept'
+    return candidate, routes
+
+
+def out_of_fold_r2(
+    model: Any,
+    current: Tuple[List[int], np.ndarray, np.ndarray, LinearMoments],
+    updated: Tuple[List[int], np.ndarray, np.ndarray, LinearMoments],
+    X: pd.DataFrame,
+    y: pd.Series,
+    scored: List[int],
+    folds: int = 5,
+    seed: int = 42
+) -> Tuple[float, float]:
+    """
+    K-fold R² on ``scored`` rows of members solved on the current and on the updated training rows
+
+    ``current`` and ``updated`` are (row labels, preprocessed rows, targets,
+    moments) of the two training sets; ``X``, ``y`` hold the updated rows.
+    Each fold of ``scored`` labels is removed from both training sets before
+    the members are solved, so both models are scored on the same rows,
+    unseen by their members. The imputer/scaler and the kept members are
+    shared by both models.
+
+    Returns:
+        (current R², updated R²) over the ``scored`` rows
+    """
+    labels = np.asarray(scored)
+    predictions = {'current': pd.Series(np.nan, index=labels), 'updated': pd.Series(np.nan, index=labels)}
+    splitter = KFold(n_splits=min(folds, len(labels)), shuffle=True, random_state=seed)
+    for _, fold in splitter.split(labels):
+        held_out = labels[fold]
+        for side, (rows, Z, targets, moments) in (('current', current), ('updated', updated)):
+            out = np.isin(rows, held_out)
+            fold_moments = moments - LinearMoments.of(Z[out], targets[out]) if out.any() else moments
+            fold_model, _ = _solve_members(model, fold_moments, Z[~out], targets[~out])
+            predictions[side].loc[held_out] = fold_model.predict(X.loc[held_out])
+    y = y.loc[labels]
+    return float(r2_score(y, predictions['current'])), float(r2_score(y, predictions['updated']))
+
+
+def update_regression(
+    base_raw: pd.DataFrame,
+    rows: pd.DataFrame,
+    models_dir: Path,
+    out_dir: Path,
+    tolerance: float = 0.01,
+    publish: bool = True,
+    seed: int = 42
+) -> UpdateResult:
+    """
+    Update the HDI ensemble's members on new/corrected rows and publish it if it passes the gate
+
+    The current training rows are the rows of ``base_raw`` whose keys the
+    package stores (packages without keys rerun the outlier filter), and
+    must match the package's sufficient statistics. There is no untouched
+    holdout, so the gate checks that the rows the update did not change are predicted no
+    worse out of fold by members solved on the updated rows than by members
+    solved on the current ones (``out_of_fold_r2``).
+    """
+    began = time.perf_counter()
+    merged, replaced, added = merge_rows(base_raw, rows)
+    path = Path(models_dir) / "regression" / config.REGRESSION_MODEL_FILE
+    package = joblib.load(path)
+    model, features = package['model'], package['feature_names']
+    preprocess = model[:-1]
+
+    base = regression.build_features(clean_dataset(base_raw))
+    updated = regression.build_features(clean_dataset(merged))
+    X_base, y_base = base['X'][features], base['y']
+    X_updated, y_updated = updated['X'][features], updated['y']
+    rows_base = pd.concat([X_base, y_base], axis=1)
+    rows_updated = pd.concat([X_updated, y_updated], axis=1)
+
+    if 'train_keys' in package:
+        train_keys = package['train_keys']
+    else:
+        trained = regression.remove_outliers({'X': X_base, 'y': y_base, 'feature_names': features},
+                                             **regression.OUTLIER_PARAMS)
+        train_keys = row_keys(pd.concat([trained['X'], trained['y']], axis=1))
+    train_rows = list(X_base.index[row_keys(rows_base).isin(train_keys)])
+    changed = sorted(set(replaced) | set(added))
+    kept = [row for row in train_rows if row not in set(replaced)]
+    # Caps and medians are recomputed on the merged dataset, so unchanged rows can clean differently
+    drifted = _drifted(rows_base, rows_updated, kept)
+    removed = sorted(set(replaced) & set(train_rows)) + drifted
+
+    Z_current = preprocess.transform(X_base.loc[train_rows])
+    y_current = y_base.loc[train_rows].to_numpy()
+    current_moments = LinearMoments.of(Z_current, y_current)
+    moments = current_moments
+    if 'linear_moments' in package:
+        moments = LinearMoments(**package['linear_moments'])
+        if not (np.array_equal(moments.n, current_moments.n)
+                and np.allclose(moments.x_sum, current_moments.x_sum, rtol=1e-9, atol=1e-9)):
+            raise ValueError(f"The model was trained on {int(moments.n[0])} rows that are not the "
+                             f"{len(train_rows)} training rows found in the dataset; pass the dataset of its "
+                             f"last training or update as --data, or run a full retrain")
+    if removed:
+        moments = moments - LinearMoments.of(preprocess.transform(X_base.loc[removed]), y_base.loc[removed])
+    refreshed = changed + drifted
+    moments = moments + LinearMoments.of(preprocess.transform(X_updated.loc[refreshed]), y_updated.loc[refreshed])
+
+    training_rows = kept + changed
+    Z_train = preprocess.transform(X_updated.loc[training_rows])
+    y_train = y_updated.loc[training_rows].to_numpy()
+    candidate, routes = _solve_members(model, moments, Z_train, y_train)
+
+    current_r2, candidate_r2 = out_of_fold_r2(
+        model,
+        current=(train_rows, Z_current, y_current, current_moments),
+        updated=(training_rows, Z_train, y_train, LinearMoments.of(Z_train, y_train)),
+        X=X_updated, y=y_updated, scored=kept, seed=seed,
+    )
+    gate = GateResult('r2_oof_unchanged', current_r2, candidate_r2, tolerance)
+    result = UpdateResult(
+        task='regression', added=_names(merged, added), replaced=_names(merged, replaced), gate=gate,
+        details={'members': routes, 'training_rows': len(y_train), 'recleaned_rows': len(drifted)},
+    )
+    if len(changed) > 1:
+        # The current model has not seen the new values: how far off it was on them
+        before = model.predict(X_updated.loc[changed])
+        result.details['r2_changed_rows_before'] = float(r2_score(y_updated.loc[changed], before))
+    _log_gate(result)
+
+    if publish and gate.passed:
+        package = dict(package)
+        package['model'] = candidate
+        package['linear_moments'] = moments.to_dict()
+        package['train_keys'] = row_keys(rows_updated.loc[training_rows]).to_numpy()
+        package['metadata'] = {**package.get('metadata', {}), 'n_samples': len(y_train),
+                               'updated_at': datetime.now().isoformat()}
+        package['updates'] = package.get('updates', []) + [_update_record(result)]
+        out_path = Path(out_dir) / "regression" / config.REGRESSION_MODEL_FILE
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_dump(package, out_path)
+        logger.info(f"💾 Updated regression model published to {out_path}")
+        result.published = True
+    result.elapsed_s = time.perf_counter() - began
+    return result
+
+
+# ============================================================
+# HELPERS
+# ============================================================
+def _log_gate(result: UpdateResult) -> None:
+    gate = result.gate
+    logger.info(
+        f"{'✅' if gate.passed else '⛔'} {result.task} gate ({gate.metric}): current {gate.current:.4f}, "
+        f"candidate {gate.candidate:.4f}, tolerance {gate.tolerance}"
+    )
+
+
+def _update_record(result: UpdateResult) -> Dict[str, Any]:
+    return {
+        'at': datetime.now().isoformat(),
+        'added': result.added,
+        'replaced': result.replaced,
+        'gate': {'metric': result.gate.metric, 'current': result.gate.current, 'candidate': result.gate.candidate},
+        **{k: v for k, v in result.details.items() if k != 'test_f1_weighted'},
+    }
+
+
+def _atomic_dump(obj: Any, path: Path) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    joblib.dump(obj, tmp)
+    tmp.replace(path)
+
+
+def _atomic_write_json(obj: Any, path: Path) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(obj, indent=2))
+    tmp.replace(path)
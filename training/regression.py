@@ -0,0 +1,345 @@
+"""
+HDI Regression Pipeline (SOIL_HACKATHON_REGRESSION.ipynb)
+"""
+import logging
+import os
+from datetime import datetime
+from itertools import product
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor, VotingRegressor
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import BayesianRidge, ElasticNet, HuberRegressor, Lasso, Ridge
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import KFold, RepeatedKFold
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import RobustScaler
+
+from config import config
+from models.feature_engineering import FeatureEngineer
+from training.cv_cache import fold_cache
+from training.data import clean_dataset, load_raw, row_keys
+from training.gram import LinearMoments
+from training.selection import InferenceBudget, enforce_budget, profile_inference
+from training.stability import analyze_stability
+from training.stages import Stage
+from training.weights import optimize_weights
+
+logger = logging.getLogger(__name__)
+
+TARGET = 'HDI_Index'
+
+# Columns derived from HDI components; present in some dataset versions
+LEAKAGE_COLUMNS = [
+    'LEI_UNDP', 'LEI_minmax', 'EI_approx', 'EI_simple', 'EI_weighted', 'II_UNDP', 'II_minmax',
+    'HDI_reconstructed_v1', 'HDI_reconstructed_v2', 'HDI_arithmetic',
+    'LEI_x_EI', 'LEI_x_II', 'EI_x_II', 'LEI_x_EI_x_II',
+    'Component_Std', 'Component_Range', 'Component_Min', 'Component_Min_sq', 'Component_Min_sqrt',
+    'HDI_proxy_sq', 'HDI_proxy_cb', 'Peace_x_HDI', 'Happiness_x_HDI', 'Happiness_x_HDI_sq',
+    'Happiness_x_HDI_sqrt', 'ComponentMin_Peace_interact', 'Happiness_Peace_interact',
+    'Stage_Low', 'Stage_Medium', 'Stage_High', 'Stage_VeryHigh',
+    'LEI_EI_ratio', 'LEI_II_ratio', 'EI_II_ratio', 'Health_Capacity_Index',
+]
+
+# ============================================================
+# BASE MODELS
+# ============================================================
+# Grids searched per base model; models absent here are used untuned
+BASE_MODEL_GRIDS = {
+    'elastic': {'alpha': [0.0005, 0.001, 0.002, 0.005], 'l1_ratio': [0.3, 0.5, 0.7, 0.9]},
+    'ridge': {'alpha': [0.05, 0.1, 0.5, 1.0, 2.0]},
+    'lasso': {'alpha': [0.0001, 0.0005, 0.001, 0.005]},
+    'huber': {'epsilon': [1.1, 1.2, 1.35, 1.5], 'alpha': [0.0001, 0.001, 0.01]},
+    'gb': {'n_estimators': [50, 75, 100], 'max_depth': [1, 2, 3], 'learning_rate': [0.01, 0.05, 0.1]},
+}
+BASE_MODELS = ['elastic', 'ridge', 'lasso', 'huber', 'bayesian', 'gb']
+
+# Iterative outlier filter (shared with incremental updates, which rerun it to find the training rows)
+OUTLIER_PARAMS = {'threshold_pct': 90, 'max_iter': 3, 'min_rows': 100}
+
+
+def make_base_model(name: str, seed: int, **params) -> Any:
+    if name == 'elastic':
+        return ElasticNet(max_iter=20000, random_state=seed, **params)
+    if name == 'ridge':
+        return Ridge(random_state=seed, **params)
+    if name == 'lasso':
+        return Lasso(max_iter=20000, random_state=seed, **params)
+    if name == 'huber':
+        return HuberRegressor(max_iter=2000, **params)
+    if name == 'bayesian':
+        return BayesianRidge(**params)
+    if name == 'gb':
+        return GradientBoostingRegressor(subsample=0.8, min_samples_leaf=8, random_state=seed, **params)
+    raise ValueError(f"Unknown base model '{name}'; choose from {BASE_MODELS}")
+
+
+def _pipeline(model: Any) -> Pipeline:
+    return Pipeline([
+        ('imputer', SimpleImputer(strategy='median')),
+        ('scaler', RobustScaler()),
+        ('model', model),
+    ])
+
+
+# ============================================================
+# STAGES
+# ============================================================
+def build_features(cleaned: pd.DataFrame) -> Dict[str, Any]:
+    """Drop leakage columns and engineer features the way the app does at serving time"""
+    df = cleaned.drop(columns=[c for c in LEAKAGE_COLUMNS if c in cleaned.columns])
+    y = df[TARGET]
+    X = FeatureEngineer.engineer_regression_features(df.drop(columns=[TARGET]))
+    X = X.select_dtypes(include=np.number).replace([np.inf, -np.inf], np.nan)
+    X = X.fillna(X.median())
+    return {'X': X, 'y': y}
+
+
+def select_features(
+    features: Dict[str, Any],
+    top_n: int,
+    redundancy_threshold: float,
+    min_corr: float
+) -> Dict[str, Any]:
+    """Most target-correlated features, skipping ones redundant with those already chosen"""
+    X, y = features['X'], features['y']
+    correlations = X.corrwith(y).abs().sort_values(ascending=False)
+    corr_matrix = X.corr().abs()
+
+    selected: List[str] = []
+    for feat in correlations.index:
+        if len(selected) >= top_n:
+            break
+        if correlations[feat] < min_corr:
+            continue
+        if all(corr_matrix.loc[feat, chosen] <= redundancy_threshold for chosen in selected):
+            selected.append(feat)
+    # Fill remaining slots by correlation alone
+    for feat in correlations.index:
+        if len(selected) >= top_n:
+            break
+        if feat not in selected:
+            selected.append(feat)
+
+    logger.info(f"📌 Selected {len(selected)} regression features")
+    return {'X': X[selected], 'y': y, 'feature_names': selected}
+
+
+def remove_outliers(selected: Dict[str, Any], threshold_pct: float, max_iter: int, min_rows: int) -> Dict[str, Any]:
+    """Iteratively drop rows whose cross-validated Huber residual is in the top tail"""
+    X = selected['X'].reset_index(drop=True)
+    y = selected['y'].reset_index(drop=True)
+    model = _pipeline(HuberRegressor(epsilon=1.35, max_iter=1000))
+
+    for iteration in range(max_iter):
+        # Score and residuals come from the same five fold fits
+        r2 = fold_cache.cross_val_score(model, X, y, cv=5, scoring='r2').mean()
+        residuals = np.abs(y - fold_cache.cross_val_predict(model, X, y, cv=5))
+        outliers = residuals > np.percentile(residuals, threshold_pct)
+        logger.info(f"🧽 Iteration {iteration + 1}: {len(y)} rows, CV R² {r2:.4f}, dropping {int(outliers.sum())}")
+        if not outliers.any():
+            break
+        X = X[~outliers].reset_index(drop=True)
+        y = y[~outliers].reset_index(drop=True)
+        if len(y) < min_rows:
+            break
+
+    logger.info(f"🧽 Outlier removal: {len(selected['y'])} → {len(y)} rows")
+    return {'X': X, 'y': y, 'feature_names': selected['feature_names']}
+
+
+def tune_base_models(data: Dict[str, Any], cv_folds: int, seed: int) -> Dict[str, Dict[str, Any]]:
+    """Exhaustive grid per base model, scored by mean CV R²"""
+    X, y = data['X'], data['y']
+    tuned = {}
+    for name in BASE_MODELS:
+        grid = BASE_MODEL_GRIDS.get(name, {})
+        best_score, best_params = -np.inf, {}
+        for values in product(*grid.values()):
+            params = dict(zip(grid, values))
+            # Same pipeline and folds as the ensemble stage, so the winner's fold fits are reused there
+            model = _pipeline(make_base_model(name, seed, **params))
+            score = fold_cache.cross_val_score(model, X, y, cv=cv_folds, scoring='r2').mean()
+            if score > best_score:
+                best_score, best_params = score, params
+        tuned[name] = best_params
+        logger.info(f"🎛️ {name}: {best_params}")
+    return tuned
+
+
+def build_ensemble(
+    data: Dict[str, Any],
+    tuned: Dict[str, Dict[str, Any]],
+    cv_folds: int,
+    cv_repeats: int,
+    min_weight: float,
+    max_weight: float,
+    restarts: int,
+    weight_method: str,
+    seed: int
+) -> Dict[str, Any]:
+    """Weighted voting ensemble of the tuned base models, fitted and cross-validated"""
+    X, y = data['X'], data['y']
+    y_values = np.asarray(y)
+    base_models = [(name, make_base_model(name, seed, **tuned[name])) for name in BASE_MODELS]
+
+    # Out-of-fold predictions on the tuning folds: served from the fits made while tuning
+    tuning_folds = list(KFold(n_splits=cv_folds).split(X))
+    predictions = np.array([fold_cache.cross_val_predict(_pipeline(model), X, y, cv=tuning_folds)
+                            for _, model in base_models])
+    solution = optimize_weights(predictions, y_values, min_weight, max_weight, weight_method, restarts, seed)
+    weights = solution.weights
+
+    # The voting pipeline's fold prediction is the weighted average of the base pipelines'
+    # fold predictions (same imputer/scaler fits), so the repeated CV check needs one fit
+    # per base model and fold, independent of the weights
+    check_folds = list(RepeatedKFold(n_splits=cv_folds, n_repeats=cv_repeats, random_state=seed).split(X))
+    fold_predictions = [fold_cache.fold_results(_pipeline(model), X, y, cv=check_folds) for _, model in base_models]
+    cv_scores = np.array([
+        r2_score(y_values[test], np.average([per_model[i].predictions for per_model in fold_predictions],
+                                            axis=0, weights=weights))
+        for i, (_, test) in enumerate(check_folds)
+    ])
+
+    final_model = Pipeline([
+        ('imputer', SimpleImputer(strategy='median')),
+        ('scaler', RobustScaler()),
+        ('voting', VotingRegressor(estimators=base_models, weights=weights.tolist())),
+    ])
+    final_model.fit(X, y)
+    logger.info(f"♻️ Fold cache: {fold_cache.stats()}")
+
+    train_pred = final_model.predict(X)
+    metrics = {
+        'train_r2': float(r2_score(y, train_pred)),
+        'train_rmse': float(np.sqrt(mean_squared_error(y, train_pred))),
+        'train_mae': float(mean_absolute_error(y, train_pred)),
+        'cv_r2_mean': float(cv_scores.mean()),
+        'cv_r2_std': float(cv_scores.std()),
+        'oof_r2': solution.r2,
+    }
+    logger.info(f"🧮 Ensemble CV R² {metrics['cv_r2_mean']:.4f} ± {metrics['cv_r2_std']:.4f}")
+    return {
+        'model': final_model,
+        'weights': weights.tolist(),
+        'weight_method': solution.method,
+        'oof_predictions': predictions,
+        'base_models': [name for name, _ in base_models],
+        'metrics': metrics,
+        'n_samples': len(y),
+    }
+
+
+def stability_analysis(
+    data: Dict[str, Any],
+    tuned: Dict[str, Dict[str, Any]],
+    ensemble: Dict[str, Any],
+    n_replicates: int,
+    scheme: str,
+    test_size: float,
+    seed: int,
+    data_dir: Optional[Path] = None
+) -> Dict[str, Any]:
+    """Refit the ensemble on repeated holdout splits or bootstrap samples (the notebook's validation step)"""
+    members = [(name, _pipeline(make_base_model(name, seed, **tuned[name]))) for name in ensemble['base_models']]
+    report = analyze_stability(members, ensemble['weights'], data['X'], data['y'], n_replicates, scheme,
+                               test_size, data_dir=data_dir, seed=seed)
+    return report.summary()
+
+
+def export(
+    data: Dict[str, Any],
+    ensemble: Dict[str, Any],
+    stability: Optional[Dict[str, Any]] = None,
+    *,
+    out_dir: Path,
+    budget: Dict[str, float]
+) -> Dict[str, Any]:
+    """Write the model package the app loads, if the ensemble fits the inference budget"""
+    metrics = dict(ensemble['metrics'])
+    if stability is not None:
+        metrics['stability'] = {k: v for k, v in stability.items() if k != 'per_replicate'}
+    package = {
+        'model': ensemble['model'],
+        'feature_names': data['feature_names'],
+        'best_weights': ensemble['weights'],
+        'base_models': ensemble['base_models'],
+        'training_metrics': metrics,
+        # Sufficient statistics of the training rows after imputing/scaling, for incremental updates
+        'linear_moments': LinearMoments.of(ensemble['model'][:-1].transform(data['X']), data['y']).to_dict(),
+        # ... and which rows those are (outlier removal drops the original labels)
+        'train_keys': row_keys(pd.concat([data['X'], data['y']], axis=1)).to_numpy(),
+        'metadata': {
+            'model_version': '1.0',
+            'created_at': datetime.now().isoformat(),
+            'n_features': len(data['feature_names']),
+            'n_samples': ensemble['n_samples'],
+        },
+    }
+    path = Path(out_dir) / "regression" / config.REGRESSION_MODEL_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Size and load time are those of the whole package; nothing is replaced unless it fits the budget
+    budget = InferenceBudget(**budget)
+    staged = path.with_name(path.name + ".tmp")
+    joblib.dump(package, staged)
+    try:
+        profile = profile_inference(ensemble['model'], data['X'], batch_rows=budget.batch_rows, path=staged)
+        enforce_budget('regression ensemble', profile, budget)
+    except Exception:
+        staged.unlink()
+        raise
+    package['metadata']['inference'] = profile.to_dict()
+    package['metadata']['budget'] = budget.to_dict()
+    joblib.dump(package, staged)
+    os.replace(staged, path)
+    logger.info(f"💾 Regression model exported to {path} (CV R² {ensemble['metrics']['cv_r2_mean']:.4f})")
+    return package['metadata']
+
+
+def build_stages(
+    raw_path: Path,
+    out_dir: Path,
+    top_n: int = 15,
+    cv_folds: int = 5,
+    cv_repeats: int = 10,
+    weight_bounds: Tuple[float, float] = (0.10, 0.50),
+    restarts: int = 20,
+    weight_method: str = 'auto',
+    stability_replicates: int = 0,
+    stability_scheme: str = 'holdout',
+    budget: Optional[InferenceBudget] = None,
+    data_dir: Optional[Path] = None,
+    seed: int = 42
+) -> List[Stage]:
+    """Stages from the raw workbook to the exported regression model (``data_dir``: shared fold data)"""
+    # Optional: the stability stage feeds its summary into the exported metrics
+    stability = [
+        Stage('regression_stability', stability_analysis,
+              inputs=('regression_outliers', 'regression_tune', 'regression_ensemble'),
+              params={'n_replicates': stability_replicates, 'scheme': stability_scheme, 'test_size': 0.2,
+                      'seed': seed, 'data_dir': data_dir}),
+    ] if stability_replicates else []
+    return [
+        Stage('load', load_raw, params={'path': Path(raw_path)}),
+        Stage('clean', clean_dataset, inputs=('load',)),
+        Stage('regression_features', build_features, inputs=('clean',)),
+        Stage('regression_select', select_features, inputs=('regression_features',),
+              params={'top_n': top_n, 'redundancy_threshold': 0.85, 'min_corr': 0.30}),
+        Stage('regression_outliers', remove_outliers, inputs=('regression_select',),
+              params=OUTLIER_PARAMS),
+        Stage('regression_tune', tune_base_models, inputs=('regression_outliers',),
+              params={'cv_folds': cv_folds, 'seed': seed}),
+        Stage('regression_ensemble', build_ensemble, inputs=('regression_outliers', 'regression_tune'),
+              params={'cv_folds': cv_folds, 'cv_repeats': cv_repeats, 'min_weight': weight_bounds[0],
+                      'max_weight': weight_bounds[1], 'restarts': restarts,
+                      'weight_method': weight_method, 'seed': seed}),
+        *stability,
+        Stage('regression_export', export,
+              inputs=('regression_outliers', 'regression_ensemble', *(stage.name for stage in stability)),
+              params={'out_dir': Path(out_dir), 'budget': (budget or InferenceBudget.from_config()).to_dict()},
+              cache=False),
+    ]
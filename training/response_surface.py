@@ -0,0 +1,180 @@
+"""
+Response-surface Tables for Sweeps and What-if Analysis
+
+The published model is tabulated over a grid of its most influential
+``config.FEATURE_RANGES`` inputs, ranked by permutation importance on
+synthetic inputs, with every other input at its base value (the form
+default, or the dataset median for inputs without a slider). Grid points
+sit on each slider's step. The table (float32 HDI values, or class
+probabilities) is written next to the model as ``response_surface.joblib``
+with its interpolation error measured against the model at random points
+inside the grid. At runtime ``ResponseSurface`` interpolates it and sends
+anything outside the tabulated subspace to the model.
+"""
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from config import config
+from models.model_loader import ModelLoader
+from models.predictor import Predictor
+from models.response_surface import ResponseSurface
+from models.surrogate import model_fingerprint
+from training.data import clean_dataset
+from training.distill import _TARGETS, sample_inputs
+from training.incremental import _atomic_dump, _atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SurfaceResult:
+    task: str
+    dims: List[str]
+    importance: Dict[str, float]  # input → mean output change when it is permuted
+    grid_shape: List[int]
+    accuracy: Dict[str, float]
+    speed: Dict[str, float]
+    published: bool = False
+    elapsed_s: float = 0.0
+    details: Dict[str, Any] = field(default_factory=dict)
+
+
+def grid_axis(name: str, points: int) -> np.ndarray:
+    """``points`` evenly spaced values across the slider range of ``name``, on its step"""
+    bounds = config.FEATURE_RANGES[name]
+    low, high, step = bounds['min'], bounds['max'], bounds['step']
+    axis = low + np.round((np.linspace(low, high, points) - low) / step) * step
+    return np.unique(np.clip(axis, low, high)).astype(np.float64)
+
+
+def model_outputs(predictor: Predictor, inputs: pd.DataFrame, chunk_rows: int = 5000) -> np.ndarray:
+    """HDI values (row), or class probabilities (row × level), through the app's Predictor"""
+    rows = []
+    for start in range(0, len(inputs), chunk_rows):
+        for result in predictor.predict_batch(inputs.iloc[start:start + chunk_rows]):
+            rows.append(list(result.probabilities.values()) if result.probabilities else result.value)
+    return np.asarray(rows, dtype=np.float64)
+
+
+def rank_inputs(predictor: Predictor, inputs: pd.DataFrame, features: List[str], seed: int) -> Dict[str, float]:
+    """Permutation importance: mean absolute output change when one input is shuffled, largest first"""
+    rng = np.random.default_rng(seed)
+    reference = model_outputs(predictor, inputs)
+    importance = {}
+    for name in features:
+        shuffled = inputs.assign(**{name: rng.permutation(inputs[name].to_numpy())})
+        change = np.abs(model_outputs(predictor, shuffled) - reference)
+        importance[name] = float(change.reshape(len(change), -1).sum(axis=1).mean())
+    return dict(sorted(importance.items(), key=lambda item: item[1], reverse=True))
+
+
+# ============================================================
+# BUILD
+# ============================================================
+def build_surface(
+    task: str,
+    raw: pd.DataFrame,
+    models_dir: Path,
+    out_dir: Path,
+    n_dims: int = 4,
+    points: int = 9,
+    n_samples: int = 2000,
+    publish: bool = True,
+    seed: int = 42
+) -> SurfaceResult:
+    """Tabulate the ``task`` model over its ``n_dims`` most influential inputs, ``points`` per input"""
+    began = time.perf_counter()
+    loader = ModelLoader(Path(models_dir))
+    loaded = loader.load_classification_model() if task == 'classification' else loader.load_regression_model()
+    predictor = Predictor(loaded, task)
+
+    dataset = clean_dataset(raw).select_dtypes(include=np.number)
+    base = dataset.drop(columns=[c for c in _TARGETS[task] if c in dataset.columns]).median()
+    features = [name for name in config.FEATURE_RANGES if name in base.index]
+    base[features] = [config.FEATURE_RANGES[name]['default'] for name in features]
+
+    importance = rank_inputs(predictor, sample_inputs(features, base, n_samples, seed), features, seed)
+    dims = list(importance)[:n_dims]
+    grids = [grid_axis(name, points) for name in dims]
+    logger.info(f"📐 {task}: tabulating {' × '.join(f'{name} ({len(g)})' for name, g in zip(dims, grids))}")
+
+    mesh = np.meshgrid(*grids, indexing='ij')
+    inputs = pd.DataFrame(np.repeat(base.to_numpy()[None, :], mesh[0].size, axis=0), columns=base.index)
+    for name, axis in zip(dims, mesh):
+        inputs[name] = axis.ravel()
+    outputs = model_outputs(predictor, inputs)
+    shape = [len(g) for g in grids]
+    values = outputs.reshape(shape + list(outputs.shape[1:])).astype(np.float32)
+
+    classes = None
+    if task == 'classification':
+        classes = np.array([int(c) for c in loaded.label_encoder.classes_])
+    surface = ResponseSurface({
+        'task': task, 'dims': dims, 'grids': grids, 'values': values,
+        'base': {name: float(value) for name, value in base.items()}, 'classes': classes,
+    })
+
+    # Interpolation error at random points inside the grid (off the grid points, where it is exact)
+    check = sample_inputs(dims, base, n_samples, seed + 1)
+    for name, grid in zip(dims, grids):
+        check[name] = check[name].clip(grid[0], grid[-1])
+    truth = model_outputs(predictor, check)
+    table = surface.interpolate(check[dims].to_numpy())
+    if task == 'classification':
+        accuracy = {'agreement': float((truth.argmax(axis=1) == table.argmax(axis=1)).mean()),
+                    'probability_mae': float(np.abs(truth - table).mean())}
+    else:
+        accuracy = {'mae': float(np.abs(truth - table).mean()), 'max_abs_error': float(np.abs(truth - table).max())}
+
+    repeated = np.repeat(check[dims].to_numpy(), 100, axis=0)
+    start = time.perf_counter()
+    surface.interpolate(repeated)
+    table_us = (time.perf_counter() - start) / len(repeated) * 1e6
+    start = time.perf_counter()
+    predictor.predict_batch(check)
+    model_us = (time.perf_counter() - start) / len(check) * 1e6
+    speed = {'table_us_per_row': round(table_us, 3), 'model_us_per_row': round(model_us, 1)}
+    logger.info(f"🧪 {task} surface: {accuracy}, {table_us:.2f} µs/row vs {model_us:.0f} µs/row for the model")
+
+    result = SurfaceResult(
+        task=task, dims=dims, importance=importance, grid_shape=shape, accuracy=accuracy, speed=speed,
+        details={'n_samples': n_samples, 'evaluations': int(np.prod(shape)), 'size_kb': round(values.nbytes / 1024, 1)},
+    )
+
+    if publish:
+        out = Path(out_dir) / task
+        out.mkdir(parents=True, exist_ok=True)
+        report = {
+            'task': task,
+            'dims': dims,
+            'grid_shape': shape,
+            'importance': importance,
+            'accuracy': accuracy,
+            'speed': speed,
+            'source': model_fingerprint(Path(models_dir) / task, task),
+            'created_at': datetime.now().isoformat(),
+            **result.details,
+        }
+        package = {
+            'task': task,
+            'dims': dims,
+            'grids': grids,
+            'values': values,
+            'base': surface.base,
+            'classes': classes,
+            'source': report['source'],
+            'report': {'accuracy': accuracy, 'speed': speed},
+        }
+        _atomic_dump(package, out / config.RESPONSE_SURFACE_FILE)
+        _atomic_write_json(report, out / "response_surface_report.json")
+        result.published = True
+        logger.info(f"💾 {task} response surface written to {out}")
+    result.elapsed_s = time.perf_counter() - began
+    return result
@@ -0,0 +1,321 @@
+"""
+Successive-halving Hyperparameter Search on One Shared Worker Pool
+"""
+import hashlib
+import logging
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from joblib.externals.loky import get_reusable_executor
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import ParameterSampler, StratifiedKFold
+from threadpoolctl import threadpool_limits
+
+from training import DEFAULT_CACHE_DIR
+from utils.thread_budget import available_cpus
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("halving", "asha", "random")
+
+# Workers are single-threaded: parallelism comes from the pool only
+_WORKER_ENV = {name: "1" for name in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")}
+_WORKER_IDLE_TIMEOUT_S = 300
+_executor = None
+
+
+# ============================================================
+# SHARED DATA
+# ============================================================
+def share_array(array: np.ndarray, data_dir: Path) -> Tuple[str, bool]:
+    """
+    Write ``array`` once as .npy named by its content
+
+    Returns:
+        (path, True if the file already existed)
+    """
+    array = np.ascontiguousarray(array)
+    digest = hashlib.sha256(f"{array.dtype}{array.shape}".encode())
+    digest.update(array.data)
+    path = Path(data_dir) / f"{digest.hexdigest()[:32]}.npy"
+    if path.exists():
+        return str(path), True
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp.npy")
+    np.save(tmp, array)
+    tmp.replace(path)
+    return str(path), False
+
+
+# Per-worker memory maps, opened once per file
+_mapped: Dict[str, np.ndarray] = {}
+
+
+def _open_shared(path: str) -> np.ndarray:
+    array = _mapped.get(path)
+    if array is None:
+        array = _mapped[path] = np.load(path, mmap_mode="r")
+    return array
+
+
+# ============================================================
+# WORKER
+# ============================================================
+def single_threaded(estimator: Any) -> Any:
+    """Set every (nested) ``n_jobs`` to 1 so a fit never starts its own pool"""
+    pinned = {name: 1 for name in estimator.get_params(deep=True) if name.endswith("n_jobs")}
+    return estimator.set_params(**pinned) if pinned else estimator
+
+
+def _evaluate(
+    estimator: Any,
+    params: Dict[str, Any],
+    resource: Optional[str],
+    fraction: float,
+    x_path: str,
+    y_path: str,
+    folds: Sequence[Tuple[np.ndarray, np.ndarray]],
+    scoring: str
+) -> List[float]:
+    """Score one candidate on every fold at the given budget (runs in a worker)"""
+    X, y = _open_shared(x_path), _open_shared(y_path)
+    scorer = get_scorer(scoring)
+    model = single_threaded(clone(estimator).set_params(**params))
+    if resource is not None:
+        full = model.get_params()[resource]
+        model.set_params(**{resource: max(1, int(round(full * fraction)))})
+
+    scores = []
+    with threadpool_limits(limits=1):
+        for train, test in folds:
+            fold_model = clone(model).fit(X[train], y[train])
+            scores.append(float(scorer(fold_model, X[test], y[test])))
+    return scores
+
+
+def _get_executor(workers: int) -> Tuple[Any, bool]:
+    """The process-wide pool; True if it had to be (re)started"""
+    global _executor
+    executor = get_reusable_executor(max_workers=workers, timeout=_WORKER_IDLE_TIMEOUT_S, env=_WORKER_ENV)
+    cold = executor is not _executor
+    _executor = executor
+    return executor, cold
+
+
+def shutdown_pool() -> None:
+    """Stop the worker pool (the next search starts cold)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, kill_workers=True)
+        _executor = None
+
+
+# ============================================================
+# SEARCH
+# ============================================================
+@dataclass
+class SearchResult:
+    best_params: Dict[str, Any]
+    best_score: float
+    best_estimator: Any
+    trials: List[Dict[str, Any]] = field(default_factory=list)
+    rung_fractions: List[float] = field(default_factory=list)
+    fits: int = 0
+    wall_s: float = 0.0
+    cold_pool: bool = False
+    cold_data: bool = False
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "best_score": self.best_score,
+            "candidates": len(self.trials),
+            "rungs": self.rung_fractions,
+            "fits": self.fits,
+            "wall_s": round(self.wall_s, 3),
+            "cold_pool": self.cold_pool,
+            "cold_data": self.cold_data,
+        }
+
+
+class HalvingSearch:
+    """
+    Randomized search with successive-halving early stopping
+
+    Candidates are first scored on a small budget (a fraction of the trees
+    for ensembles, of the training rows otherwise); only the best
+    ``1 / eta`` of each rung move on to ``eta`` times the budget.
+
+    - ``halving``: synchronous rungs, deterministic for a given seed.
+    - ``asha``: asynchronous promotion (ASHA); a candidate is promoted as
+      soon as it ranks in the top ``1 / eta`` of the results so far, so
+      workers never wait for a rung to finish.
+    - ``random``: one rung at full budget (plain randomized search).
+
+    All fits run on one process pool sized to the available CPUs with every
+    nested ``n_jobs`` forced to 1. The training data is written once to a
+    content-addressed .npy file that every worker memory-maps instead of
+    receiving its own pickled copy.
+    """
+
+    def __init__(
+        self,
+        estimator: Any,
+        param_distributions: Dict[str, Any],
+        n_candidates: int = 50,
+        strategy: str = "halving",
+        eta: int = 3,
+        min_fraction: float = 1 / 9,
+        cv: int = 5,
+        scoring: str = "accuracy",
+        resource: str = "auto",
+        workers: Optional[int] = None,
+        data_dir: Optional[Path] = None,
+        seed: int = 42
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}'; choose from {STRATEGIES}")
+        self.estimator = estimator
+        self.param_distributions = param_distributions
+        self.n_candidates = n_candidates
+        self.strategy = strategy
+        self.eta = eta
+        self.min_fraction = min_fraction
+        self.cv = cv
+        self.scoring = scoring
+        self.resource = resource
+        self.workers = workers or available_cpus()
+        self.data_dir = Path(data_dir) if data_dir else DEFAULT_CACHE_DIR / "search_data"
+        self.seed = seed
+
+    def _resource_param(self) -> Optional[str]:
+        """Estimator parameter scaled by the budget, or None to subsample rows"""
+        if self.resource == "n_samples":
+            return None
+        if self.resource != "auto":
+            return self.resource
+        names = [name for name in self.estimator.get_params(deep=True)
+                 if name == "n_estimators" or name.endswith("__n_estimators")]
+        return names[0] if names else None
+
+    def _rung_fractions(self, n_candidates: int) -> List[float]:
+        if self.strategy == "random" or n_candidates < self.eta:
+            return [1.0]
+        by_candidates = int(math.log(n_candidates, self.eta) + 1e-9)
+        by_budget = int(math.log(1 / self.min_fraction, self.eta) + 1e-9)
+        n_rungs = 1 + min(by_candidates, by_budget)
+        return [float(self.eta) ** (rung - (n_rungs - 1)) for rung in range(n_rungs)]
+
+    def _subsample(self, folds, y: np.ndarray, fraction: float):
+        """Stratified subset of each training fold (row budget)"""
+        if fraction >= 1:
+            return folds
+        subsets = []
+        for index, (train, test) in enumerate(folds):
+            rng = np.random.RandomState(self.seed + index)
+            keep = [rng.choice(rows, max(1, math.ceil(fraction * len(rows))), replace=False)
+                    for rows in (train[y[train] == label] for label in np.unique(y[train]))]
+            subsets.append((np.sort(np.concatenate(keep)), test))
+        return subsets
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> SearchResult:
+        began = time.perf_counter()
+        X, y = np.asarray(X, dtype=np.float64), np.asarray(y)
+        candidates = list(ParameterSampler(self.param_distributions, self.n_candidates, random_state=self.seed))
+        fractions = self._rung_fractions(len(candidates))
+        resource = self._resource_param()
+
+        x_path, x_cached = share_array(X, self.data_dir)
+        y_path, y_cached = share_array(y, self.data_dir)
+        folds = list(StratifiedKFold(self.cv, shuffle=True, random_state=self.seed).split(X, y))
+        rung_folds = [folds if resource else self._subsample(folds, y, f) for f in fractions]
+        executor, cold_pool = _get_executor(self.workers)
+
+        scores: List[Dict[int, float]] = [{} for _ in fractions]  # rung -> candidate -> mean score
+        fits = 0
+
+        def submit(candidate: int, rung: int):
+            return executor.submit(
+                _evaluate, self.estimator, candidates[candidate], resource, fractions[rung],
+                x_path, y_path, rung_folds[rung], self.scoring,
+            )
+
+        if self.strategy == "asha":
+            fits = self._run_async(submit, len(candidates), scores)
+        else:
+            survivors = list(range(len(candidates)))
+            for rung in range(len(fractions)):
+                futures = {submit(c, rung): c for c in survivors}
+                for future, candidate in futures.items():
+                    scores[rung][candidate] = float(np.mean(future.result()))
+                fits += len(survivors) * self.cv
+                if rung < len(fractions) - 1:
+                    ranked = sorted(survivors, key=lambda c: (-scores[rung][c], c))
+                    survivors = ranked[:max(1, len(survivors) // self.eta)]
+
+        top_rung = max(r for r in range(len(fractions)) if scores[r])
+        best = max(scores[top_rung], key=lambda c: (scores[top_rung][c], -c))
+        best_estimator = clone(self.estimator).set_params(**candidates[best]).fit(X, y)
+
+        trials = [
+            {"params": candidates[c], "scores": {fractions[r]: scores[r][c] for r in range(len(fractions))
+                                                 if c in scores[r]}}
+            for c in range(len(candidates))
+        ]
+        result = SearchResult(
+            best_params=candidates[best],
+            best_score=scores[top_rung][best],
+            best_estimator=best_estimator,
+            trials=trials,
+            rung_fractions=fractions,
+            fits=fits,
+            wall_s=time.perf_counter() - began,
+            cold_pool=cold_pool,
+            cold_data=not (x_cached and y_cached),
+        )
+        logger.info(
+            f"🔎 {self.strategy} search: {len(candidates)} candidates, {fits} fits on {self.workers} workers "
+            f"in {result.wall_s:.1f}s ({'cold' if cold_pool else 'warm'} pool), best {result.best_score:.4f}"
+        )
+        return result
+
+    def _run_async(self, submit, n_candidates: int, scores: List[Dict[int, float]]) -> int:
+        """ASHA: keep every worker busy, promoting whenever a rung allows it"""
+        top_rung = len(scores) - 1
+        promoted = [set() for _ in scores]
+        next_candidate = 0
+        running = {}
+        fits = 0
+
+        def next_job() -> Optional[Tuple[int, int]]:
+            nonlocal next_candidate
+            for rung in reversed(range(top_rung)):
+                done = scores[rung]
+                ranked = sorted(done, key=lambda c: (-done[c], c))[:len(done) // self.eta]
+                for candidate in ranked:
+                    if candidate not in promoted[rung]:
+                        promoted[rung].add(candidate)
+                        return candidate, rung + 1
+            if next_candidate < n_candidates:
+                next_candidate += 1
+                return next_candidate - 1, 0
+            return None
+
+        while True:
+            while len(running) < 2 * self.workers:
+                job = next_job()
+                if job is None:
+                    break
+                running[submit(*job)] = job
+            if not running:
+                return fits
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                candidate, rung = running.pop(future)
+                scores[rung][candidate] = float(np.mean(future.result()))
+                fits += self.cv
@@ -0,0 +1,172 @@
+"""
+Inference Cost of Candidate Models (latency, artifact size, load time) and Export Budgets
+"""
+import copy
+import logging
+import statistics
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
+from threadpoolctl import threadpool_limits
+
+from config import config
+from training.search import single_threaded
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetExceededError(RuntimeError):
+    """A model was refused at export because it exceeds the inference budget"""
+
+
+@dataclass
+class InferenceProfile:
+    """Measured serving cost of one fitted model (single core, as the app's inference workers run it)"""
+    single_p50_ms: float
+    single_p95_ms: float
+    batch_rows: int
+    batch_ms: float
+    size_mb: float
+    load_ms: float
+    memory_mb: float
+
+    def to_dict(self) -> Dict[str, float]:
+        return {name: round(value, 3) for name, value in asdict(self).items()}
+
+
+@dataclass
+class InferenceBudget:
+    """Largest acceptable serving cost; a limit of 0 is no limit"""
+    max_single_ms: float = 0.0
+    max_batch_ms: float = 0.0
+    batch_rows: int = 1000
+    max_size_mb: float = 0.0
+    max_load_ms: float = 0.0
+    max_memory_mb: float = 0.0
+
+    @classmethod
+    def from_config(cls) -> "InferenceBudget":
+        return cls(
+            max_single_ms=config.MODEL_MAX_SINGLE_MS,
+            max_batch_ms=config.MODEL_MAX_BATCH_MS,
+            batch_rows=config.MODEL_BUDGET_BATCH_ROWS,
+            max_size_mb=config.MODEL_MAX_SIZE_MB,
+            max_load_ms=config.MODEL_MAX_LOAD_MS,
+            max_memory_mb=config.MODEL_MAX_MEMORY_MB,
+        )
+
+    def to_dict(self) -> Dict[str, float]:
+        return asdict(self)
+
+    def violations(self, profile: InferenceProfile) -> List[str]:
+        """Human-readable list of the limits ``profile`` exceeds"""
+        checks = (
+            ("single-row p95", profile.single_p95_ms, self.max_single_ms, "ms"),
+            (f"batch of {profile.batch_rows}", profile.batch_ms, self.max_batch_ms, "ms"),
+            ("artifact size", profile.size_mb, self.max_size_mb, "MB"),
+            ("load time", profile.load_ms, self.max_load_ms, "ms"),
+            ("load memory", profile.memory_mb, self.max_memory_mb, "MB"),
+        )
+        return [f"{label} {value:.3g} {unit} > {limit:g} {unit}"
+                for label, value, limit, unit in checks if limit and value > limit]
+
+
+# ============================================================
+# MEASUREMENT
+# ============================================================
+def _predictor(model: Any):
+    """The call the app makes: class probabilities for classifiers, predict otherwise"""
+    return model.predict_proba if hasattr(model, "predict_proba") else model.predict
+
+
+def _percentile_ms(timings: List[float], q: float) -> float:
+    return float(np.percentile(timings, q) * 1000)
+
+
+def profile_inference(
+    model: Any,
+    X: Any,
+    batch_rows: int = 1000,
+    repeats: int = 50,
+    load_repeats: int = 3,
+    path: Optional[Path] = None
+) -> InferenceProfile:
+    """
+    Measure single-row and batch latency, artifact size, load time and load memory
+
+    Args:
+        model: Fitted model, timed on a copy pinned to one thread
+        X: Representative rows (array or DataFrame, as the model was
+            fitted); single-row calls cycle through them and the batch
+            repeats them to ``batch_rows`` rows
+        repeats: Timed single-row calls (after one warm-up call)
+        path: Artifact to size and load; the model is dumped to a
+            temporary file when omitted
+    """
+    # Rows are taken the way the model was fitted (DataFrames keep their feature names)
+    take = (lambda rows: X.iloc[rows]) if hasattr(X, "iloc") else (lambda rows: np.asarray(X)[rows])
+    singles = [take([i % len(X)]) for i in range(repeats)]
+    batch = take(np.resize(np.arange(len(X)), batch_rows))
+    pinned = copy.deepcopy(model)
+    if hasattr(pinned, "get_params"):
+        single_threaded(pinned)
+    predict = _predictor(pinned)
+
+    with threadpool_limits(limits=1):
+        predict(singles[0])
+        single = []
+        for row in singles:
+            began = time.perf_counter()
+            predict(row)
+            single.append(time.perf_counter() - began)
+
+        batch_timings = []
+        for _ in range(3):
+            began = time.perf_counter()
+            predict(batch)
+            batch_timings.append(time.perf_counter() - began)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        if path is None:
+            path = Path(scratch) / "model.joblib"
+            joblib.dump(model, path)
+        size_mb = Path(path).stat().st_size / 1e6
+
+        load_timings = []
+        for _ in range(load_repeats):
+            began = time.perf_counter()
+            joblib.load(path)
+            load_timings.append(time.perf_counter() - began)
+
+        tracemalloc.start()
+        try:
+            joblib.load(path)
+            memory_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+
+    return InferenceProfile(
+        single_p50_ms=_percentile_ms(single, 50),
+        single_p95_ms=_percentile_ms(single, 95),
+        batch_rows=batch_rows,
+        batch_ms=statistics.median(batch_timings) * 1000,
+        size_mb=size_mb,
+        load_ms=statistics.median(load_timings) * 1000,
+        memory_mb=memory_mb,
+    )
+
+
+def enforce_budget(name: str, profile: InferenceProfile, budget: InferenceBudget) -> None:
+    """Raise ``BudgetExceededError`` if ``profile`` exceeds ``budget``"""
+    violations = budget.violations(profile)
+    if violations:
+        raise BudgetExceededError(f"{name} exceeds the inference budget: {'; '.join(violations)}")
+    logger.info(f"⏱️ {name}: {profile.single_p50_ms:.2f} ms/row (p95 {profile.single_p95_ms:.2f}), "
+                f"{profile.batch_ms:.1f} ms per {profile.batch_rows} rows, {profile.size_mb:.2f} MB, "
+                f"loads in {profile.load_ms:.0f} ms, within budget")
@@ -0,0 +1,294 @@
+"""
+Training Stages with Content-addressed Output Caching
+"""
+import hashlib
+import inspect
+import json
+import logging
+import shutil
+import sys
+import time
+import types
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import joblib
+
+from training import ROOT
+
+logger = logging.getLogger(__name__)
+
+# Output pickles are only valid for the library versions that wrote them
+_ENVIRONMENT_PACKAGES = ("numpy", "pandas", "scipy", "sklearn", "joblib")
+
+
+# ============================================================
+# FINGERPRINTS
+# ============================================================
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_project_object(obj: Any) -> bool:
+    """Functions and classes defined in this repository (not in a library)"""
+    try:
+        source_file = Path(inspect.getsourcefile(obj)).resolve()
+    except (TypeError, OSError):
+        return False
+    if "site-packages" in source_file.parts or "dist-packages" in source_file.parts:
+        return False
+    return source_file.is_relative_to(ROOT)
+
+
+def _referenced_names(code: types.CodeType) -> Iterable[str]:
+    yield from code.co_names
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _referenced_names(const)
+
+
+def _constant_token(value: Any, functions: List[Any]) -> Any:
+    """
+    Process-independent form of a module constant
+
+    Functions inside containers (e.g. a dict of scorers) are named rather
+    than repr'd, whose memory address changes every run; project functions
+    are also collected so their source is hashed. Sets are sorted.
+    """
+    if isinstance(value, dict):
+        return [(repr(k), _constant_token(v, functions)) for k, v in value.items()]
+    if isinstance(value, (list, tuple)):
+        return [_constant_token(v, functions) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(repr(_constant_token(v, functions)) for v in value)
+    if isinstance(value, (types.FunctionType, type)):
+        if _is_project_object(value):
+            functions.append(value)
+        return f"{value.__module__}.{value.__qualname__}"
+    return value
+
+
+def code_fingerprint(func: Callable) -> str:
+    """
+    Hash a stage function together with the project code and constants it uses
+
+    Follows global names referenced by the function (and, recursively, by
+    project functions and classes it calls) so that editing a helper or a
+    parameter grid invalidates exactly the stages that depend on it.
+    Library code is covered by the environment versions instead.
+    """
+    digest = hashlib.sha256()
+    seen = set()
+    pending = [func]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        digest.update(f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', '')}".encode())
+        digest.update(inspect.getsource(obj).encode())
+
+        if isinstance(obj, type):
+            methods = (getattr(member, "__func__", member) for member in vars(obj).values())
+            codes = [method.__code__ for method in methods if isinstance(method, types.FunctionType)]
+            namespace = vars(sys.modules[obj.__module__])
+        else:
+            codes = [obj.__code__]
+            namespace = obj.__globals__
+
+        for code in codes:
+            for name in sorted(set(_referenced_names(code))):
+                value = namespace.get(name)
+                if isinstance(value, (types.FunctionType, type)) and _is_project_object(value):
+                    pending.append(value)
+                elif isinstance(value, (str, int, float, bool, tuple, list, dict, set, frozenset)):
+                    digest.update(f"{name}={_constant_token(value, pending)!r}".encode())
+                elif value is not None and _is_project_object(type(value)):
+                    # Module-level instances (e.g. shared caches): their class is the code
+                    pending.append(type(value))
+    return digest.hexdigest()
+
+
+def environment_fingerprint() -> Dict[str, str]:
+    versions = {"python": sys.version.split()[0]}
+    for package in _ENVIRONMENT_PACKAGES:
+        module = sys.modules.get(package) or __import__(package)
+        versions[package] = getattr(module, "__version__", "?")
+    return versions
+
+
+def _param_token(value: Any) -> Any:
+    # Files are identified by content, not by path or mtime
+    if isinstance(value, Path):
+        return {"file_sha256": file_digest(value)} if value.is_file() else str(value)
+    if isinstance(value, dict):
+        return {str(k): _param_token(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_param_token(v) for v in value]
+    return value
+
+
+# ============================================================
+# STAGES
+# ============================================================
+@dataclass
+class Stage:
+    """
+    One step of a training pipeline
+
+    ``func`` receives the outputs of ``inputs`` (upstream stage names) as
+    positional arguments and ``params`` as keyword arguments. Stages with
+    side effects (exports) set ``cache=False`` so they always run.
+    """
+    name: str
+    func: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    params: Dict[str, Any] = field(default_factory=dict)
+    cache: bool = True
+
+    def key(self, input_keys: List[str], environment: Dict[str, str]) -> str:
+        payload = {
+            "stage": self.name,
+            "code": code_fingerprint(self.func),
+            "params": _param_token(self.params),
+            "inputs": input_keys,
+            "environment": environment,
+        }
+        blob = json.dumps(payload, sort_keys=True, default=repr).encode()
+        return hashlib.sha256(blob).hexdigest()
+
+
+class StageCache:
+    """Stage outputs on disk, one joblib file per (stage, key)"""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, stage: str, key: str) -> Path:
+        return self.cache_dir / stage / f"{key}.joblib"
+
+    def has(self, stage: str, key: str) -> bool:
+        return self._path(stage, key).exists()
+
+    def load(self, stage: str, key: str) -> Any:
+        return joblib.load(self._path(stage, key))
+
+    def store(self, stage: str, key: str, value: Any, elapsed_s: float) -> None:
+        path = self._path(stage, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so an interrupted run never leaves a truncated entry
+        tmp = path.with_suffix(".tmp")
+        joblib.dump(value, tmp)
+        tmp.replace(path)
+        path.with_suffix(".json").write_text(json.dumps({
+            "stage": stage,
+            "elapsed_s": round(elapsed_s, 3),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }, indent=2))
+
+    def clear(self, stage: Optional[str] = None) -> None:
+        target = self.cache_dir / stage if stage else self.cache_dir
+        if target.exists():
+            shutil.rmtree(target)
+
+
+@dataclass
+class StageReport:
+    name: str
+    key: str
+    status: str  # "cached", "ran", "skipped"; for status(): "cached", "stale", "always"
+    elapsed_s: float = 0.0
+
+
+class StagePipeline:
+    """
+    Run stages in dependency order, reusing cached outputs
+
+    A stage's cache key covers its code, parameters, the library versions
+    and the keys of its inputs, so a change reruns that stage and everything
+    downstream of it while upstream stages are served from the cache.
+    Upstream outputs are only loaded when a stage that needs them runs.
+    """
+
+    def __init__(self, stages: List[Stage], cache: StageCache):
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate stage names: {names}")
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache = cache
+
+    def keys(self) -> Dict[str, str]:
+        environment = environment_fingerprint()
+        keys: Dict[str, str] = {}
+        for name, stage in self.stages.items():
+            missing = [i for i in stage.inputs if i not in keys]
+            if missing:
+                raise ValueError(f"Stage '{name}' depends on {missing}, which must come earlier")
+            keys[name] = stage.key([keys[i] for i in stage.inputs], environment)
+        return keys
+
+    def status(self) -> List[StageReport]:
+        reports = []
+        for name, key in self.keys().items():
+            if not self.stages[name].cache:
+                status = "always"
+            else:
+                status = "cached" if self.cache.has(name, key) else "stale"
+            reports.append(StageReport(name, key, status))
+        return reports
+
+    def run(self, force: Iterable[str] = (), targets: Iterable[str] = ()) -> Tuple[Dict[str, Any], List[StageReport]]:
+        """
+        Materialize ``targets`` (default: stages nothing else consumes)
+
+        Args:
+            force: Stage names to recompute even when cached
+            targets: Stage names whose outputs are wanted
+
+        Returns:
+            (outputs by stage name, one report per stage in pipeline order)
+        """
+        force = set(force)
+        unknown = force - set(self.stages)
+        if unknown:
+            raise ValueError(f"Unknown stages: {sorted(unknown)}")
+        keys = self.keys()
+        consumed = {i for stage in self.stages.values() for i in stage.inputs}
+        targets = list(targets) or [name for name in self.stages if name not in consumed]
+
+        outputs: Dict[str, Any] = {}
+        reports: Dict[str, StageReport] = {}
+
+        def materialize(name: str) -> Any:
+            if name in outputs:
+                return outputs[name]
+            stage, key = self.stages[name], keys[name]
+            if stage.cache and name not in force and self.cache.has(name, key):
+                try:
+                    outputs[name] = self.cache.load(name, key)
+                    reports[name] = StageReport(name, key, "cached")
+                    logger.info(f"♻️ {name}: cached ({key[:12]})")
+                    return outputs[name]
+                except Exception as e:
+                    logger.warning(f"⚠️ {name}: unreadable cache entry, recomputing ({e})")
+
+            args = [materialize(i) for i in stage.inputs]
+            logger.info(f"▶️ {name}: running")
+            began = time.perf_counter()
+            outputs[name] = stage.func(*args, **stage.params)
+            elapsed = time.perf_counter() - began
+            if stage.cache:
+                self.cache.store(name, key, outputs[name], elapsed)
+            reports[name] = StageReport(name, key, "ran", elapsed)
+            logger.info(f"✅ {name}: {elapsed:.2f}s")
+            return outputs[name]
+
+        for target in targets:
+            materialize(target)
+        ordered = [reports.get(name, StageReport(name, keys[name], "skipped")) for name in self.stages]
+        return outputs, ordered
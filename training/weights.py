@@ -0,0 +1,224 @@
+"""
+Ensemble Weight Optimization from Out-of-fold Predictions
+"""
+import itertools
+import logging
+import time
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("auto", "closed_form", "batched", "slsqp")
+
+# Exhaustive active-set enumeration costs 3**m small solves
+_CLOSED_FORM_MAX_MODELS = 10
+_FEASIBILITY_TOL = 1e-9
+
+
+@dataclass
+class WeightSolution:
+    weights: np.ndarray
+    r2: float
+    method: str
+    elapsed_s: float
+    restarts: int = 1
+
+
+def _r2(sse: np.ndarray, y: np.ndarray) -> np.ndarray:
+    return 1 - sse / np.sum((y - y.mean()) ** 2)
+
+
+def _gram(predictions: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Sufficient statistics of ||w @ P - y||²: (P Pᵀ, P y, y·y)"""
+    return predictions @ predictions.T, predictions @ y, float(y @ y)
+
+
+def _sse(weights: np.ndarray, gram: np.ndarray, cross: np.ndarray, yy: float) -> np.ndarray:
+    """Squared error for each row of ``weights`` without touching the samples"""
+    return np.einsum("ri,ij,rj->r", weights, gram, weights) - 2 * weights @ cross + yy
+
+
+# ============================================================
+# SOLVERS
+# ============================================================
+def project_capped_simplex(points: np.ndarray, low: float, high: float) -> np.ndarray:
+    """
+    Euclidean projection of each row onto {w : Σw = 1, low ≤ w ≤ high}
+
+    The projection is clip(v - τ, low, high) for the shift τ that restores
+    the sum. That sum is piecewise linear in τ with breakpoints at v - low
+    and v - high, so τ is interpolated exactly between the two breakpoints
+    that bracket 1, for all rows at once.
+    """
+    rows = np.arange(len(points))[:, None]
+    breaks = np.sort(np.concatenate([points - low, points - high], axis=1), axis=1)
+    sums = np.clip(points[:, None, :] - breaks[:, :, None], low, high).sum(axis=2)  # decreasing in τ
+    index = np.clip((sums >= 1).sum(axis=1, keepdims=True) - 1, 0, breaks.shape[1] - 2)
+    t0, t1 = breaks[rows, index], breaks[rows, index + 1]
+    s0, s1 = sums[rows, index], sums[rows, index + 1]
+    slope = np.where(s0 > s1, s0 - s1, 1.0)
+    tau = t0 + (s0 - 1) * (t1 - t0) / slope
+    return np.clip(points - tau, low, high)
+
+
+def solve_batched(
+    predictions: np.ndarray,
+    y: np.ndarray,
+    low: float,
+    high: float,
+    restarts: int = 20,
+    iterations: int = 500,
+    tolerance: float = 1e-9,
+    seed: int = 42
+) -> np.ndarray:
+    """
+    Accelerated projected gradient from ``restarts`` starting points at once
+
+    Works on the m×m Gram matrix, so each iteration costs O(restarts·m²)
+    regardless of the number of samples. Returns the best row.
+    """
+    gram, cross, yy = _gram(predictions, y)
+    n_models = len(gram)
+    step = 1 / (2 * np.linalg.eigvalsh(gram)[-1])
+
+    rng = np.random.RandomState(seed)
+    starts = np.vstack([np.full(n_models, 1 / n_models), rng.dirichlet(np.full(n_models, 2.0), restarts - 1)])
+    weights = project_capped_simplex(starts, low, high)
+    momentum, t = weights.copy(), 1.0
+    for _ in range(iterations):
+        gradient = 2 * (momentum @ gram - cross)
+        updated = project_capped_simplex(momentum - step * gradient, low, high)
+        t_next = (1 + np.sqrt(1 + 4 * t * t)) / 2
+        momentum = updated + (t - 1) / t_next * (updated - weights)
+        converged = np.abs(updated - weights).max() < tolerance
+        weights, t = updated, t_next
+        if converged:
+            break
+    return weights[np.argmin(_sse(weights, gram, cross, yy))]
+
+
+def solve_closed_form(predictions: np.ndarray, y: np.ndarray, low: float, high: float) -> np.ndarray:
+    """
+    Exact box- and sum-constrained least squares by active-set enumeration
+
+    Every assignment of each weight to {free, at low, at high} gives one
+    linear KKT system; all 3**m systems are solved in one batched call and
+    the feasible solution with the smallest error is the global optimum of
+    this convex problem.
+    """
+    gram, cross, yy = _gram(predictions, y)
+    n_models = len(gram)
+    states = np.array(list(itertools.product((0, 1, 2), repeat=n_models)))  # 0 free, 1 low, 2 high
+    free = states == 0
+
+    # Rows i < m: stationarity (2Qw + λ1 = 2Pᵀy) for free weights, w_i = bound otherwise;
+    # last row: Σw = 1
+    size = n_models + 1
+    systems = np.zeros((len(states), size, size))
+    rhs = np.zeros((len(states), size))
+    systems[:, :n_models, :n_models] = np.where(free[:, :, None], 2 * gram[None], 0)
+    systems[:, :n_models, n_models] = free
+    fixed_rows = np.nonzero(~free)
+    systems[fixed_rows[0], fixed_rows[1], fixed_rows[1]] = 1
+    rhs[:, :n_models] = np.where(free, 2 * cross[None], np.where(states == 1, low, high))
+    systems[:, n_models, :n_models] = 1
+    rhs[:, n_models] = 1
+
+    solutions = np.einsum("kij,kj->ki", np.linalg.pinv(systems), rhs)[:, :n_models]
+    feasible = (
+        (solutions >= low - _FEASIBILITY_TOL).all(axis=1)
+        & (solutions <= high + _FEASIBILITY_TOL).all(axis=1)
+        & (np.abs(solutions.sum(axis=1) - 1) <= 1e-6)
+    )
+    if not feasible.any():
+        raise ValueError("No feasible weights found")
+    candidates = np.clip(solutions[feasible], low, high)
+    return candidates[np.argmin(_sse(candidates, gram, cross, yy))]
+
+
+def solve_slsqp(
+    predictions: np.ndarray,
+    y: np.ndarray,
+    low: float,
+    high: float,
+    restarts: int = 20,
+    seed: int = 42
+) -> np.ndarray:
+    """The notebook's multi-start SLSQP on −R² (kept as a reference)"""
+    from scipy.optimize import minimize
+
+    n_models = len(predictions)
+    total = np.sum((y - y.mean()) ** 2)
+
+    def objective(weights):
+        weights = np.abs(weights)
+        weights = weights / (weights.sum() + 1e-10)
+        return np.sum((y - weights @ predictions) ** 2) / total - 1
+
+    rng = np.random.RandomState(seed)
+    best, best_weights = np.inf, np.full(n_models, 1 / n_models)
+    for start in range(restarts):
+        if start == 0:
+            initial = np.full(n_models, 1 / n_models)
+        else:
+            initial = np.maximum(rng.dirichlet(np.ones(n_models) * 2), low)
+            initial = initial / initial.sum()
+        result = minimize(
+            objective, initial, method="SLSQP", bounds=[(low, high)] * n_models,
+            constraints=[{"type": "eq", "fun": lambda w: np.sum(w) - 1}], options={"maxiter": 500},
+        )
+        weights = np.maximum(np.abs(result.x), low)
+        weights = weights / weights.sum()
+        if objective(weights) < best:
+            best, best_weights = objective(weights), weights
+    return best_weights
+
+
+# ============================================================
+# ENTRY POINT
+# ============================================================
+def optimize_weights(
+    predictions: np.ndarray,
+    y: np.ndarray,
+    min_weight: float = 0.10,
+    max_weight: float = 0.50,
+    method: str = "auto",
+    restarts: int = 20,
+    seed: int = 42
+) -> WeightSolution:
+    """
+    Blend weights maximizing R² of ``weights @ predictions``
+
+    Args:
+        predictions: Out-of-fold predictions, one row per ensemble member
+        y: Targets aligned with the prediction columns
+        min_weight, max_weight: Bounds on every weight (weights sum to 1)
+        method: ``closed_form`` (exact), ``batched`` (vectorized multi-start
+            projected gradient), ``slsqp`` (notebook reference) or ``auto``
+            (closed form up to 10 members, batched beyond)
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}'; choose from {METHODS}")
+    predictions = np.asarray(predictions, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n_models = len(predictions)
+    if not n_models * min_weight <= 1 <= n_models * max_weight:
+        raise ValueError(f"Weights in [{min_weight}, {max_weight}] cannot sum to 1 for {n_models} models")
+    if method == "auto":
+        method = "closed_form" if n_models <= _CLOSED_FORM_MAX_MODELS else "batched"
+
+    began = time.perf_counter()
+    if method == "closed_form":
+        weights, used_restarts = solve_closed_form(predictions, y, min_weight, max_weight), 1
+    elif method == "batched":
+        weights, used_restarts = solve_batched(predictions, y, min_weight, max_weight, restarts, seed=seed), restarts
+    else:
+        weights, used_restarts = solve_slsqp(predictions, y, min_weight, max_weight, restarts, seed), restarts
+    elapsed = time.perf_counter() - began
+
+    r2 = float(_r2(np.sum((y - weights @ predictions) ** 2), y))
+    logger.info(f"⚖️ Ensemble weights ({method}, {elapsed * 1000:.1f} ms): R² {r2:.4f}")
+    return WeightSolution(weights, r2, method, elapsed, used_restarts)